@@ -6,12 +6,35 @@ from datetime import timedelta
 from django.contrib import messages
 from django.shortcuts import redirect
 
+class LicenciaVigenteFilter(admin.SimpleListFilter):
+    """Filtra por la fecha de vencimiento en lugar del campo esta_activa almacenado"""
+    title = 'vigente'
+    parameter_name = 'vigente'
+
+    def lookups(self, request, model_admin):
+        return [('1', 'Sí'), ('0', 'No')]
+
+    def queryset(self, request, queryset):
+        if self.value() == '1':
+            return queryset.vigentes()
+        if self.value() == '0':
+            return queryset.exclude(pk__in=Licencia.objects.vigentes().values('pk'))
+        return queryset
+
 @admin.register(Licencia)
 class LicenciaAdmin(admin.ModelAdmin):
-    list_display = ['negocio', 'fecha_vencimiento', 'esta_activa', 'dias_restantes']
-    list_filter = ['esta_activa']
+    list_display = ['negocio', 'fecha_vencimiento', 'vigente', 'dias_restantes']
+    list_filter = [LicenciaVigenteFilter]
     search_fields = ['negocio__nombre']
     readonly_fields = ['fecha_inicio']
+
+    def get_queryset(self, request):
+        # El estado se calcula en la consulta: listar nunca escribe
+        return super().get_queryset(request).con_estado().select_related('negocio')
+
+    @admin.display(boolean=True, ordering='fecha_vencimiento')
+    def vigente(self, obj):
+        return obj.esta_vigente
     
     def response_change(self, request, obj):
         if "_extender_un_mes" in request.POST:
@@ -0,0 +1,236 @@
+import json
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.test import APIClient
+from ...models import Categoria, NegocioUser, Producto
+from ...utils.catalogo_sintetico import PREFIJO_SLUG, generar_catalogo
+
+PALABRA_BUSQUEDA = 'camisa'
+LINEAS_PEDIDO_GRANDE = 50
+
+# Consultas máximas por escenario: crear un pedido no debe crecer con sus líneas
+LIMITES_CONSULTAS = {
+    'pedido_crear': 20,
+    'pedido_50_lineas': 20,
+}
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[indice]
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide los endpoints principales (marketplace, búsqueda, tienda, detalles de '
+        'categoría, creación de pedidos y bandeja de pedidos) sobre catálogos sintéticos '
+        'de varios tamaños, en una base de datos de pruebas, y guarda el resultado en JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', default='2,10,40',
+                            help='Número de negocios de cada catálogo, separados por comas')
+        parser.add_argument('--categorias', type=int, default=4)
+        parser.add_argument('--subcategorias', type=int, default=3)
+        parser.add_argument('--productos', type=int, default=10, help='Por subcategoría')
+        parser.add_argument('--pedidos', type=int, default=20, help='Por negocio')
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--repeticiones', type=int, default=5)
+        parser.add_argument('--con-cache', action='store_true',
+                            help='Mide con la caché caliente en lugar de vaciarla antes de cada petición')
+        parser.add_argument('--salida', help='Fichero JSON (por defecto benchmarks/<fecha>-<commit>.json)')
+        parser.add_argument('--comparar', help='JSON de una ejecución anterior con el que comparar')
+
+    def handle(self, *args, **options):
+        try:
+            tamanos = [int(t) for t in options['tamanos'].split(',') if t.strip()]
+        except ValueError:
+            raise CommandError('--tamanos debe ser una lista de enteros separados por comas')
+        anterior = None
+        if options['comparar']:
+            with open(options['comparar'], encoding='utf-8') as f:
+                anterior = json.load(f)
+
+        setup_test_environment()
+        nombre_original = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            resultados = {}
+            for tamano in tamanos:
+                call_command('flush', interactive=False, verbosity=0)
+                cache.clear()
+                inicio = time.perf_counter()
+                totales = generar_catalogo(
+                    negocios=tamano,
+                    categorias=options['categorias'],
+                    subcategorias=options['subcategorias'],
+                    productos=options['productos'],
+                    pedidos=options['pedidos'],
+                    semilla=options['semilla'],
+                )
+                self.stdout.write(
+                    f"Catálogo de {tamano} negocios ({totales['productos']} productos, "
+                    f"{totales['pedidos']} pedidos) generado en {time.perf_counter() - inicio:.1f} s"
+                )
+                resultados[str(tamano)] = {
+                    'catalogo': totales,
+                    'escenarios': self.medir(options['repeticiones'], options['con_cache']),
+                }
+        finally:
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+            teardown_test_environment()
+
+        informe = {
+            'commit': _commit_actual(),
+            'fecha': timezone.now().isoformat(),
+            'motor': connection.vendor,
+            'parametros': {
+                clave: options[clave] for clave in (
+                    'categorias', 'subcategorias', 'productos', 'pedidos',
+                    'semilla', 'repeticiones', 'con_cache'
+                )
+            },
+            'resultados': resultados,
+        }
+        salida = options['salida']
+        if not salida:
+            sufijo = (informe['commit'] or 'sin-commit')[:10]
+            salida = Path(settings.BASE_DIR) / 'benchmarks' / f"{timezone.now():%Y%m%d-%H%M%S}-{sufijo}.json"
+        salida = Path(salida)
+        salida.parent.mkdir(parents=True, exist_ok=True)
+        salida.write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding='utf-8')
+
+        self.imprimir(resultados, anterior)
+        self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {salida}'))
+        fallos = self.comprobar_limites(resultados)
+        if fallos:
+            raise CommandError('Límites de consultas superados:\n' + '\n'.join(fallos))
+
+    def escenarios(self):
+        """Peticiones a medir: (nombre, método, url, datos, usuario)"""
+        primer_negocio = NegocioUser.objects.select_related('negocio', 'user').filter(
+            negocio__slug__startswith=PREFIJO_SLUG
+        ).order_by('negocio__slug').first()
+        negocio = primer_negocio.negocio
+        categoria = Categoria.objects.filter(negocio=negocio).order_by('id').first()
+        productos = list(
+            Producto.objects.filter(negocio=negocio, activo=True).order_by('id').values_list('id', flat=True)[:LINEAS_PEDIDO_GRANDE]
+        )
+        if len(productos) < LINEAS_PEDIDO_GRANDE:
+            raise CommandError(
+                f'El catálogo necesita al menos {LINEAS_PEDIDO_GRANDE} productos activos por negocio '
+                '(aumente --categorias, --subcategorias o --productos)'
+            )
+        cliente, _ = User.objects.get_or_create(
+            username='benchmark_cliente', defaults={'email': 'benchmark_cliente@ejemplo.com'}
+        )
+        pedido = {
+            'nombre_cliente': 'Cliente benchmark',
+            'email_cliente': cliente.email,
+            'telefono_cliente': '50000000',
+            'direccion_entrega': 'Calle 1 #1',
+            'productos': [{'producto_id': producto_id, 'cantidad': 1} for producto_id in productos[:3]],
+        }
+        pedido_grande = dict(
+            pedido,
+            productos=[{'producto_id': producto_id, 'cantidad': 1} for producto_id in productos]
+        )
+        return [
+            ('marketplace_lista', 'get', '/api/marketplace/productos/', None, None),
+            ('marketplace_busqueda', 'get', f'/api/marketplace/productos/?search={PALABRA_BUSQUEDA}', None, None),
+            ('tienda_detalle', 'get', f'/api/tienda/{negocio.slug}/', None, None),
+            ('categoria_detalles', 'get', f'/api/tienda/{negocio.slug}/categorias/{categoria.id}/detalles/', None, None),
+            ('pedido_crear', 'post', '/api/pedidos/', pedido, cliente),
+            ('pedido_50_lineas', 'post', '/api/pedidos/', pedido_grande, cliente),
+            ('pedidos_admin_lista', 'get', '/api/mi-negocio/pedidos-admin/', None, primer_negocio.user),
+        ]
+
+    def medir(self, repeticiones, con_cache):
+        resultados = {}
+        for nombre, metodo, url, datos, usuario in self.escenarios():
+            # Un error del servidor se registra como HTTP 500 en lugar de abortar la medición
+            cliente = APIClient(raise_request_exception=False)
+            if usuario:
+                cliente.force_authenticate(usuario)
+            peticion = getattr(cliente, metodo)
+            if con_cache:
+                peticion(url, datos, format='json')
+
+            tiempos, consultas, estados = [], [], set()
+            tamano = 0
+            for _ in range(repeticiones):
+                if not con_cache:
+                    cache.clear()
+                with CaptureQueriesContext(connection) as capturadas:
+                    inicio = time.perf_counter()
+                    respuesta = peticion(url, datos, format='json')
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+                consultas.append(len(capturadas.captured_queries))
+                estados.add(respuesta.status_code)
+                tamano = len(respuesta.content)
+
+            resultados[nombre] = {
+                'url': url,
+                'estados': sorted(estados),
+                'consultas': max(consultas),
+                'bytes': tamano,
+                'mediana_ms': round(statistics.median(tiempos), 2),
+                'p95_ms': round(_percentil(tiempos, 95), 2),
+                'min_ms': round(min(tiempos), 2),
+                'max_ms': round(max(tiempos), 2),
+                'limite_consultas': LIMITES_CONSULTAS.get(nombre),
+            }
+        return resultados
+
+    def comprobar_limites(self, resultados):
+        """Escenarios que superaron su límite de consultas o no respondieron 2xx"""
+        fallos = []
+        for tamano, datos in resultados.items():
+            for nombre, m in datos['escenarios'].items():
+                if nombre not in LIMITES_CONSULTAS:
+                    continue
+                if m['consultas'] > m['limite_consultas']:
+                    fallos.append(f"{nombre} ({tamano} negocios): {m['consultas']} consultas, límite {m['limite_consultas']}")
+                if any(estado >= 300 for estado in m['estados']):
+                    fallos.append(f"{nombre} ({tamano} negocios): HTTP {m['estados']}")
+        return fallos
+
+    def imprimir(self, resultados, anterior):
+        previos = (anterior or {}).get('resultados', {})
+        cabecera = f"{'Tamaño':>7} {'Escenario':<22} {'HTTP':>9} {'consultas':>10} {'mediana ms':>11} {'p95 ms':>9}"
+        if anterior:
+            cabecera += f" {'vs ' + (anterior.get('commit') or '?')[:7]:>12}"
+        self.stdout.write(cabecera)
+        self.stdout.write('-' * len(cabecera))
+        for tamano, datos in resultados.items():
+            for nombre, m in datos['escenarios'].items():
+                fila = (
+                    f"{tamano:>7} {nombre:<22} {','.join(map(str, m['estados'])):>9} "
+                    f"{m['consultas']:>10} {m['mediana_ms']:>11} {m['p95_ms']:>9}"
+                )
+                previo = previos.get(tamano, {}).get('escenarios', {}).get(nombre)
+                if previo and previo['mediana_ms']:
+                    fila += f" {m['mediana_ms'] / previo['mediana_ms']:>11.2f}x"
+                    if m['consultas'] != previo['consultas']:
+                        fila += f" ({previo['consultas']} -> {m['consultas']} consultas)"
+                self.stdout.write(fila)
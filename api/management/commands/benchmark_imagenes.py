@@ -0,0 +1,120 @@
+import json
+import statistics
+import time
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image, ImageFilter
+from ...utils import imagenes
+
+TAMANOS_POR_DEFECTO = '800x600,1920x1080,4000x3000'
+
+
+def imagen_sintetica(ancho, alto):
+    """Foto sintética JPEG con ruido, degradados y detalle fino, parecida a una foto de producto"""
+    ruido = Image.effect_noise((max(1, ancho // 4), max(1, alto // 4)), 60).resize((ancho, alto))
+    detalle = Image.effect_mandelbrot((ancho, alto), (-2.0, -1.2, 0.8, 1.2), 80)
+    degradado = Image.linear_gradient('L').resize((ancho, alto))
+    img = Image.merge('RGB', [ruido, degradado, detalle]).filter(ImageFilter.GaussianBlur(2))
+    salida = BytesIO()
+    img.save(salida, 'JPEG', quality=92)
+    return salida.getvalue()
+
+
+def compresion_anterior(contenido, max_bytes):
+    """Bucle original de Producto.save: reducir un 10% y volver a codificar hasta que quepa"""
+    img = Image.open(BytesIO(contenido))
+    formato = imagenes.FORMATOS_EQUIVALENTES.get(img.format, img.format)
+    codificaciones = 0
+    while True:
+        salida = BytesIO()
+        img.save(salida, format=formato, quality=85)
+        codificaciones += 1
+        # El original fallaba al llegar a 0 píxeles si el tamaño no se alcanzaba
+        if salida.getbuffer().nbytes <= max_bytes or min(img.size) < 2:
+            return salida.getvalue(), codificaciones
+        img = img.resize((int(img.width * 0.9), int(img.height * 0.9)))
+
+
+def compresion_actual(contenido, max_bytes):
+    # Se cuentan las llamadas a _codificar sin cambiar su comportamiento
+    with mock.patch.object(imagenes, '_codificar', wraps=imagenes._codificar) as codificar:
+        datos = imagenes.comprimir_imagen(contenido, max_bytes)
+    return datos, codificar.call_count
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara la compresión de imágenes de producto (comprimir_imagen) con el bucle '
+        'anterior de reducir un 10% por iteración: tiempo, codificaciones y tamaño final, '
+        'sobre imágenes sintéticas o archivos propios. Falla si la compresión actual supera '
+        '1 + ITERACIONES codificaciones o el tamaño máximo'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', default=TAMANOS_POR_DEFECTO,
+                            help='Imágenes sintéticas ANCHOxALTO separadas por comas')
+        parser.add_argument('--archivo', action='append', default=[],
+                            help='Imagen real a medir (se puede repetir)')
+        parser.add_argument('--repeticiones', type=int, default=3)
+        parser.add_argument('--max-bytes', type=int, default=imagenes.MAX_BYTES_PRODUCTO)
+        parser.add_argument('--salida', help='Guarda los resultados en este fichero JSON')
+
+    def muestras(self, options):
+        for ruta in options['archivo']:
+            try:
+                yield Path(ruta).name, Path(ruta).read_bytes()
+            except OSError as e:
+                raise CommandError(str(e))
+        for tamano in filter(None, options['tamanos'].split(',')):
+            try:
+                ancho, alto = (int(valor) for valor in tamano.lower().split('x'))
+            except ValueError:
+                raise CommandError(f'Tamaño no válido: {tamano} (use ANCHOxALTO)')
+            yield tamano, imagen_sintetica(ancho, alto)
+
+    def medir(self, funcion, contenido, max_bytes, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            datos, codificaciones = funcion(contenido, max_bytes)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return {
+            'mediana_ms': round(statistics.median(tiempos), 1),
+            'codificaciones': codificaciones,
+            'bytes': len(datos),
+            'dimensiones': list(Image.open(BytesIO(datos)).size),
+        }
+
+    def handle(self, *args, **options):
+        max_bytes = options['max_bytes']
+        limite = 1 + imagenes.ITERACIONES
+        resultados, fallos = {}, []
+
+        self.stdout.write(
+            f"{'Imagen':<18} {'KB':>6} {'anterior ms':>12} {'cod.':>5} {'KB':>5} "
+            f"{'actual ms':>10} {'cod.':>5} {'KB':>5} {'dimensiones':>12}"
+        )
+        for nombre, contenido in self.muestras(options):
+            anterior = self.medir(compresion_anterior, contenido, max_bytes, options['repeticiones'])
+            actual = self.medir(compresion_actual, contenido, max_bytes, options['repeticiones'])
+            resultados[nombre] = {'bytes_original': len(contenido), 'anterior': anterior, 'actual': actual}
+            self.stdout.write(
+                f"{nombre:<18} {len(contenido) // 1024:>6} {anterior['mediana_ms']:>12} "
+                f"{anterior['codificaciones']:>5} {anterior['bytes'] // 1024:>5} {actual['mediana_ms']:>10} "
+                f"{actual['codificaciones']:>5} {actual['bytes'] // 1024:>5} "
+                f"{'x'.join(map(str, actual['dimensiones'])):>12}"
+            )
+            if actual['codificaciones'] > limite:
+                fallos.append(f"{nombre}: {actual['codificaciones']} codificaciones (límite {limite})")
+            if actual['bytes'] > max_bytes:
+                fallos.append(f"{nombre}: {actual['bytes']} bytes (máximo {max_bytes})")
+
+        if options['salida']:
+            Path(options['salida']).write_text(
+                json.dumps({'max_bytes': max_bytes, 'resultados': resultados}, indent=2), encoding='utf-8'
+            )
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['salida']}"))
+        if fallos:
+            raise CommandError('La compresión actual no cumple sus límites:\n' + '\n'.join(fallos))
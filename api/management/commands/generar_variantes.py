@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from ...models import InfoNegocio, Categoria, Subcategoria, Producto
+from ...utils.tareas import PREFIJO_POR_DEFECTO, encolar_variantes, procesar_tareas
+
+# Campos de imagen con variantes responsive por modelo
+CAMPOS_IMAGEN = (
+    (Producto, 'imagen'),
+    (Categoria, 'imagen'),
+    (Subcategoria, 'imagen'),
+    (InfoNegocio, 'logo'),
+    (InfoNegocio, 'img_portada'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Encola la generación de variantes responsive para las imágenes existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--forzar', action='store_true',
+                            help='Regenera también las imágenes que ya tienen variantes')
+        parser.add_argument('--ejecutar', action='store_true',
+                            help='Procesa la cola en este proceso en lugar de esperar al worker')
+
+    def handle(self, *args, **options):
+        total = 0
+        for modelo, campo in CAMPOS_IMAGEN:
+            consulta = modelo.objects.exclude(**{f'{campo}__isnull': True}).exclude(
+                **{campo: ''}
+            ).exclude(**{f'{campo}__startswith': PREFIJO_POR_DEFECTO})
+            if not options['forzar']:
+                consulta = consulta.filter(**{f'{campo}_srcset': {}})
+
+            cantidad = 0
+            for instancia in consulta.only('pk', campo).iterator():
+                encolar_variantes(instancia, campo)
+                cantidad += 1
+            self.stdout.write(f'{modelo.__name__}.{campo}: {cantidad} imágenes encoladas')
+            total += cantidad
+
+        if options['ejecutar']:
+            while procesar_tareas():
+                pass
+        self.stdout.write(self.style.SUCCESS(f'{total} imágenes encoladas'))
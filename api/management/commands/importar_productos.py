@@ -0,0 +1,58 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from ...models import InfoNegocio
+from ...utils.importacion import (
+    ErrorImportacion, FORMATOS, ImportadorProductos, LOTE_IMPORTACION, detectar_formato, leer_filas
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa productos a un negocio desde un CSV (con cabecera) o JSON Lines. Columnas: '
+        'nombre, precio, categoria, subcategoria y opcionalmente descripcion, stock, descuento '
+        'y activo. Los productos con el mismo nombre se actualizan'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo')
+        parser.add_argument('--negocio', required=True, help='Slug o id del negocio')
+        parser.add_argument('--formato', choices=FORMATOS,
+                            help='Por defecto se deduce de la extensión')
+        parser.add_argument('--simulacion', action='store_true',
+                            help='Valida y cuenta los cambios sin guardar nada')
+        parser.add_argument('--lote', type=int, default=LOTE_IMPORTACION)
+        parser.add_argument('--json', action='store_true', help='Resultado completo en JSON')
+
+    def handle(self, *args, **options):
+        filtro = Q(slug=options['negocio'])
+        if options['negocio'].isdigit():
+            filtro |= Q(pk=int(options['negocio']))
+        negocio = InfoNegocio.objects.filter(filtro).first()
+        if negocio is None:
+            raise CommandError(f"No existe el negocio {options['negocio']}")
+
+        try:
+            formato = options['formato'] or detectar_formato(options['archivo'])
+            importador = ImportadorProductos(negocio, simulacion=options['simulacion'], lote=options['lote'])
+            with open(options['archivo'], 'rb') as archivo:
+                resultado = importador.importar(leer_filas(archivo, formato))
+        except (ErrorImportacion, OSError) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(resultado, indent=2, ensure_ascii=False, default=str))
+        else:
+            self.imprimir(resultado)
+        if 'error' in resultado:
+            raise CommandError(f"{resultado['error']} (se conserva lo importado hasta ese punto)")
+
+    def imprimir(self, resultado):
+        for error in resultado['errores']:
+            self.stderr.write(f"Fila {error['fila']}: {json.dumps(error['errores'], ensure_ascii=False, default=str)}")
+        prefijo = 'Simulación: ' if resultado['simulacion'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefijo}{resultado['filas']} filas, {resultado['creados']} creados, "
+            f"{resultado['actualizados']} actualizados, {resultado['categorias_creadas']} categorías y "
+            f"{resultado['subcategorias_creadas']} subcategorías nuevas, {resultado['total_errores']} errores"
+        ))
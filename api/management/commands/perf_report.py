@@ -0,0 +1,54 @@
+import json
+from django.core.management.base import BaseCommand
+from django.test import Client
+from ...utils.metricas import combinar, instantanea, instantaneas_compartidas, reiniciar, resumen
+
+
+class Command(BaseCommand):
+    help = (
+        'Informe de rendimiento por vista. Sin --url lee las métricas publicadas por '
+        'los procesos web (requiere una caché compartida, CACHE_BACKEND=file); con --url '
+        'ejecuta esas peticiones en este proceso y mide cada una'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', default=[],
+                            help='URL a medir (se puede repetir)')
+        parser.add_argument('--repeticiones', type=int, default=10)
+        parser.add_argument('--orden', default='total_ms',
+                            choices=['consultas', 'db_ms', 'vista_ms', 'render_ms', 'total_ms'])
+        parser.add_argument('--json', action='store_true', help='Salida en JSON')
+
+    def handle(self, *args, **options):
+        if options['url']:
+            reiniciar()
+            cliente = Client()
+            for url in options['url']:
+                for _ in range(options['repeticiones']):
+                    respuesta = cliente.get(url)
+                    if respuesta.status_code >= 400:
+                        self.stderr.write(f'{url}: HTTP {respuesta.status_code}')
+                        break
+            datos = instantanea()
+        else:
+            datos = combinar(instantaneas_compartidas())
+
+        filas = resumen(datos)
+        if options['json']:
+            self.stdout.write(json.dumps(filas, indent=2))
+            return
+        if not filas:
+            self.stdout.write('No hay métricas registradas')
+            return
+
+        orden = options['orden']
+        filas = sorted(filas.items(), key=lambda item: item[1][orden]['media'] * item[1][orden]['n'], reverse=True)
+        cabecera = f"{'Vista':<50} {'n':>6} {'consultas':>10} {'BD ms':>9} {'vista ms':>9} {'render ms':>10} {'total ms':>9} {'p95 ms':>8} {'max ms':>9}"
+        self.stdout.write(cabecera)
+        self.stdout.write('-' * len(cabecera))
+        for vista, m in filas:
+            self.stdout.write(
+                f"{vista[:50]:<50} {m['total_ms']['n']:>6} {m['consultas']['media']:>10} "
+                f"{m['db_ms']['media']:>9} {m['vista_ms']['media']:>9} {m['render_ms']['media']:>10} {m['total_ms']['media']:>9} "
+                f"{m['total_ms']['p95']:>8} {m['total_ms']['max']:>9}"
+            )
@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from ...utils.tareas import procesar_tareas
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta las tareas en segundo plano (procesado de imágenes y borrado de archivos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--una-vez', action='store_true',
+                            help='Procesa las tareas pendientes y termina')
+        parser.add_argument('--lote', type=int, default=20,
+                            help='Tareas reservadas por iteración')
+        parser.add_argument('--espera', type=float, default=2,
+                            help='Segundos de espera cuando no hay tareas')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Worker de tareas iniciado')
+        try:
+            while True:
+                ejecutadas = procesar_tareas(options['lote'])
+                if ejecutadas:
+                    self.stdout.write(f'{ejecutadas} tareas ejecutadas')
+                elif options['una_vez']:
+                    break
+                else:
+                    time.sleep(options['espera'])
+        except KeyboardInterrupt:
+            self.stdout.write('Worker detenido')
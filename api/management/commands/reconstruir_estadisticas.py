@@ -0,0 +1,33 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from ...utils.estadisticas import reconstruir_estadisticas
+
+
+def _fecha(valor):
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f'Fecha no válida: {valor} (use AAAA-MM-DD)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula los acumulados diarios de ventas por negocio y por producto a partir '
+        'de los pedidos. Sin fechas recalcula todo el histórico'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=_fecha, help='Primer día (AAAA-MM-DD)')
+        parser.add_argument('--hasta', type=_fecha, help='Último día, inclusive (AAAA-MM-DD)')
+        parser.add_argument('--negocio', type=int, action='append',
+                            help='Id del negocio (se puede repetir)')
+
+    def handle(self, *args, **options):
+        if options['desde'] and options['hasta'] and options['desde'] > options['hasta']:
+            raise CommandError('--desde no puede ser posterior a --hasta')
+        filas = reconstruir_estadisticas(
+            desde=options['desde'],
+            hasta=options['hasta'],
+            negocios=options['negocio'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'{filas} filas de estadísticas recalculadas'))
@@ -0,0 +1,22 @@
+import signal
+import sys
+import time
+from django.core.management.base import BaseCommand
+from ...signals.licencia_signals import start_scheduler_if_needed, detener_scheduler
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta el scheduler de trabajos periódicos (licencias y reservas) en un proceso dedicado'
+
+    def handle(self, *args, **options):
+        # Al detener el servicio (SIGTERM) se cede el liderazgo en lugar de esperar a que expire
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+        start_scheduler_if_needed(forzar=True)
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            detener_scheduler()
+            self.stdout.write('Scheduler detenido')
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...utils.catalogo_sintetico import generar_catalogo, limpiar_catalogo, CONTRASENA, PREFIJO_USUARIO
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera un catálogo sintético determinista (negocios × categorías × subcategorías '
+        '× productos, más pedidos) para pruebas de carga y benchmarks'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--negocios', type=int, default=5)
+        parser.add_argument('--categorias', type=int, default=4, help='Por negocio')
+        parser.add_argument('--subcategorias', type=int, default=3, help='Por categoría')
+        parser.add_argument('--productos', type=int, default=10, help='Por subcategoría')
+        parser.add_argument('--pedidos', type=int, default=20, help='Por negocio')
+        parser.add_argument('--lineas', type=int, default=3, help='Máximo de productos por pedido')
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--limpiar', action='store_true',
+                            help='Elimina antes el catálogo sintético existente')
+        parser.add_argument('--solo-limpiar', action='store_true',
+                            help='Elimina el catálogo sintético y no genera uno nuevo')
+
+    def handle(self, *args, **options):
+        if options['limpiar'] or options['solo_limpiar']:
+            eliminados = limpiar_catalogo()
+            self.stdout.write(f'{eliminados} objetos sintéticos eliminados')
+            if options['solo_limpiar']:
+                return
+
+        try:
+            totales = generar_catalogo(
+                negocios=options['negocios'],
+                categorias=options['categorias'],
+                subcategorias=options['subcategorias'],
+                productos=options['productos'],
+                pedidos=options['pedidos'],
+                lineas=options['lineas'],
+                semilla=options['semilla'],
+            )
+        except ValueError as e:
+            raise CommandError(f'{e}; use --limpiar para regenerarlo')
+
+        for nombre, cantidad in totales.items():
+            self.stdout.write(f'{nombre}: {cantidad}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Catálogo generado. Usuarios dueños: {PREFIJO_USUARIO}00000... con contraseña "{CONTRASENA}"'
+        ))
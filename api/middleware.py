@@ -0,0 +1,78 @@
+import logging
+from django.conf import settings
+from django.db import connection
+from .utils.metricas import finalizar_medicion, iniciar_medicion, medicion_actual, registrar_peticion
+
+logger = logging.getLogger(__name__)
+
+# Sentencias SQL incluidas en el log de una petición lenta
+MAX_SQL_LOG = 50
+
+def nombre_vista(view_func, request):
+    """Nombre legible de la vista resuelta: Clase.accion para ViewSets y APIViews"""
+    clase = getattr(view_func, 'cls', None)
+    if clase is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    acciones = getattr(view_func, 'actions', None)
+    metodo = request.method.lower()
+    if acciones:
+        return f'{clase.__name__}.{acciones.get(metodo, metodo)}'
+    return f'{clase.__name__}.{metodo}'
+
+class MetricasMiddleware:
+    """
+    Mide por vista resuelta el número de consultas, el tiempo en base de datos,
+    el tiempo en la vista fuera de la BD (donde se serializa), el tiempo de
+    renderizado y el tiempo total, y los agrega en histogramas (ver
+    utils/metricas.py). La vista se delimita con process_view y
+    process_template_response: las Response de DRF se renderizan después de
+    este último. Las peticiones más lentas que METRICAS_UMBRAL_LENTO_MS se
+    registran en el log con su SQL.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICAS_ACTIVAS:
+            return self.get_response(request)
+
+        medicion = iniciar_medicion()
+        try:
+            with connection.execute_wrapper(medicion.registrar_consulta):
+                response = self.get_response(request)
+        finally:
+            finalizar_medicion()
+        vista_s, render_s, total_s = medicion.tiempos()
+        total_ms = total_s * 1000
+
+        vista = getattr(request, '_vista_metricas', None)
+        if vista:
+            registrar_peticion(vista, {
+                'consultas': medicion.consultas,
+                'db_ms': medicion.db * 1000,
+                'vista_ms': vista_s * 1000,
+                'render_ms': render_s * 1000,
+                'total_ms': total_ms,
+            })
+            if total_ms >= settings.METRICAS_UMBRAL_LENTO_MS:
+                sql = '\n'.join(f'  [{ms} ms] {sentencia}' for ms, sentencia in medicion.sql[:MAX_SQL_LOG])
+                logger.warning(
+                    f"Petición lenta {request.method} {request.get_full_path()} ({vista}): "
+                    f"{total_ms:.0f} ms, {medicion.consultas} consultas, {medicion.db * 1000:.0f} ms en BD, "
+                    f"{vista_s * 1000:.0f} ms en la vista, {render_s * 1000:.0f} ms renderizando\n{sql}"
+                )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._vista_metricas = nombre_vista(view_func, request)
+        medicion = medicion_actual()
+        if medicion is not None:
+            medicion.empezar_vista()
+
+    def process_template_response(self, request, response):
+        # La vista ya devolvió su respuesta; lo que queda es renderizarla
+        medicion = medicion_actual()
+        if medicion is not None:
+            medicion.terminar_vista()
+        return response
@@ -0,0 +1,91 @@
+# Generated by Django 4.2 on 2026-10-18 10:56
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Copia del tokenizador de api.utils.busqueda tal como estaba al crear la
+# migración: si ese módulo cambia, esta migración debe seguir igual.
+STOPWORDS = {
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'lo', 'los',
+    'o', 'para', 'por', 'sin', 'su', 'sus', 'un', 'una', 'unos', 'unas', 'y'
+}
+PESO_NOMBRE = 3
+PESO_DESCRIPCION = 1
+TOKEN_MAX_LENGTH = 50
+
+
+def normalizar_texto(texto):
+    texto = unicodedata.normalize('NFKD', texto or '').lower()
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+def _raiz(palabra):
+    if len(palabra) > 4 and palabra.endswith('es'):
+        return palabra[:-2]
+    if len(palabra) > 3 and palabra.endswith('s'):
+        return palabra[:-1]
+    return palabra
+
+
+def tokenizar(texto):
+    tokens = []
+    for palabra in re.split(r'[^a-z0-9]+', normalizar_texto(texto)):
+        if len(palabra) < 2 or palabra in STOPWORDS:
+            continue
+        tokens.append(_raiz(palabra)[:TOKEN_MAX_LENGTH])
+    return tokens
+
+
+def tokens_producto(nombre, descripcion):
+    pesos = {}
+    for token in tokenizar(nombre):
+        pesos[token] = pesos.get(token, 0) + PESO_NOMBRE
+    for token in tokenizar(descripcion):
+        pesos[token] = pesos.get(token, 0) + PESO_DESCRIPCION
+    return pesos
+
+
+def indexar_productos_existentes(apps, schema_editor):
+    Producto = apps.get_model('api', 'Producto')
+    ProductoToken = apps.get_model('api', 'ProductoToken')
+    for producto in Producto.objects.only('id', 'nombre', 'descripcion').iterator():
+        ProductoToken.objects.bulk_create([
+            ProductoToken(producto_id=producto.id, token=token, peso=peso)
+            for token, peso in tokens_producto(producto.nombre, producto.descripcion).items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_licencia_primera_licencia_pagada'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductoToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=50)),
+                ('peso', models.PositiveSmallIntegerField(default=1)),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='api.producto')),
+            ],
+            options={
+                'verbose_name': 'Token de búsqueda',
+                'verbose_name_plural': 'Tokens de búsqueda',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='productotoken',
+            index=models.Index(fields=['token', 'producto'], name='api_token_producto_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='productotoken',
+            unique_together={('producto', 'token')},
+        ),
+        migrations.RunPython(indexar_productos_existentes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-18 11:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def rellenar_negocio_productos(apps, schema_editor):
+    Producto = apps.get_model('api', 'Producto')
+    Subcategoria = apps.get_model('api', 'Subcategoria')
+    Producto.objects.update(
+        negocio_id=Subquery(
+            Subcategoria.objects.filter(
+                pk=OuterRef('subcategoria_id')
+            ).values('categoria__negocio_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_productotoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='producto',
+            name='negocio',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='productos', to='api.infonegocio'),
+        ),
+        migrations.RunPython(rellenar_negocio_productos, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='producto',
+            name='negocio',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='productos', to='api.infonegocio'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['negocio', 'activo', '-id'], name='api_prod_neg_activo_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['negocio', 'nombre'], name='api_prod_neg_nombre_idx'),
+        ),
+    ]
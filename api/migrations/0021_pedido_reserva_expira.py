@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_producto_negocio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pedido',
+            name='reserva_expira',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['estado', 'reserva_expira'], name='api_pedido_reserva_idx'),
+        ),
+    ]
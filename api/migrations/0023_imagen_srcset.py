@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_tarea'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categoria',
+            name='imagen_srcset',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='infonegocio',
+            name='img_portada_srcset',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='infonegocio',
+            name='logo_srcset',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='producto',
+            name='imagen_srcset',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='subcategoria',
+            name='imagen_srcset',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_imagen_srcset'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='licencia',
+            index=models.Index(fields=['esta_activa', 'fecha_vencimiento'], name='api_licencia_venc_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_licencia_vencimiento_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiderScheduler',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50, unique=True)),
+                ('propietario', models.CharField(max_length=255)),
+                ('expira', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Líder del scheduler',
+                'verbose_name_plural': 'Líderes del scheduler',
+            },
+        ),
+    ]
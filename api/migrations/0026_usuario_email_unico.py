@@ -0,0 +1,56 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def crear_indices_email(apps, schema_editor):
+    """
+    Índice de búsqueda sobre auth_user.email y unicidad de los emails no
+    vacíos. auth.User no es un modelo de esta app, así que se crean con SQL
+    según el motor; los usuarios sin email (superusuarios) no cuentan.
+    """
+    User = apps.get_model('auth', 'User')
+    duplicados = list(
+        User.objects.exclude(email='').values('email').annotate(
+            total=Count('id')
+        ).filter(total__gt=1).values_list('email', flat=True)[:20]
+    )
+    if duplicados:
+        raise RuntimeError(
+            'Hay emails repetidos en auth_user; corríjalos antes de migrar: '
+            + ', '.join(duplicados)
+        )
+
+    connection = schema_editor.connection
+    schema_editor.execute('CREATE INDEX api_user_email_idx ON auth_user (email)')
+    if connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute(
+            "CREATE UNIQUE INDEX api_user_email_uniq ON auth_user (email) WHERE email <> ''"
+        )
+    elif connection.vendor == 'mysql' and not connection.mysql_is_mariadb:
+        # MySQL no tiene índices parciales: NULLIF deja fuera los emails vacíos
+        schema_editor.execute(
+            "CREATE UNIQUE INDEX api_user_email_uniq ON auth_user ((NULLIF(email, '')))"
+        )
+
+
+def eliminar_indices_email(apps, schema_editor):
+    connection = schema_editor.connection
+    for indice in ('api_user_email_uniq', 'api_user_email_idx'):
+        if connection.vendor == 'mysql':
+            if indice == 'api_user_email_uniq' and connection.mysql_is_mariadb:
+                continue
+            schema_editor.execute(f'DROP INDEX {indice} ON auth_user')
+        elif connection.vendor in ('postgresql', 'sqlite'):
+            schema_editor.execute(f'DROP INDEX IF EXISTS {indice}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_liderscheduler'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices_email, eliminar_indices_email),
+    ]
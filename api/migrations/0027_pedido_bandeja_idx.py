@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0026_usuario_email_unico'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['negocio', 'estado', '-fecha_pedido'], name='api_pedido_neg_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['negocio', '-fecha_pedido'], name='api_pedido_neg_fecha_idx'),
+        ),
+    ]
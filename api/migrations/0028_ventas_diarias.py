@@ -0,0 +1,47 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0027_pedido_bandeja_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VentaDiariaNegocio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('confirmado', 'Confirmado'), ('en_proceso', 'En Proceso'), ('entregado', 'Entregado'), ('cancelado', 'Cancelado')], max_length=20)),
+                ('pedidos', models.IntegerField(default=0)),
+                ('unidades', models.IntegerField(default=0)),
+                ('ingresos', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('negocio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ventas_diarias', to='api.infonegocio')),
+            ],
+            options={
+                'verbose_name': 'Venta diaria por negocio',
+                'verbose_name_plural': 'Ventas diarias por negocio',
+                'unique_together': {('negocio', 'fecha', 'estado')},
+            },
+        ),
+        migrations.CreateModel(
+            name='VentaDiariaProducto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('pedidos', models.IntegerField(default=0)),
+                ('unidades', models.IntegerField(default=0)),
+                ('ingresos', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('negocio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ventas_diarias_productos', to='api.infonegocio')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ventas_diarias', to='api.producto')),
+            ],
+            options={
+                'verbose_name': 'Venta diaria por producto',
+                'verbose_name_plural': 'Ventas diarias por producto',
+                'indexes': [models.Index(fields=['negocio', 'fecha'], name='api_venta_prod_neg_fecha_idx')],
+                'unique_together': {('producto', 'fecha')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def asignar_usuarios(apps, schema_editor):
+    """Enlaza los pedidos existentes con el usuario cuyo email coincide"""
+    User = apps.get_model('auth', 'User')
+    Pedido = apps.get_model('api', 'Pedido')
+    usuarios = dict(User.objects.exclude(email='').values_list('email', 'id'))
+    emails = Pedido.objects.filter(user__isnull=True).values_list(
+        'email_cliente', flat=True
+    ).distinct().order_by()
+    for email in list(emails):
+        if email in usuarios:
+            Pedido.objects.filter(user__isnull=True, email_cliente=email).update(
+                user_id=usuarios[email]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0028_ventas_diarias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pedido',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pedidos', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['user', '-fecha_pedido'], name='api_pedido_user_fecha_idx'),
+        ),
+        migrations.RunPython(asignar_usuarios, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def copiar_productos(apps, schema_editor):
+    """Rellena la copia del producto en las líneas existentes con sus datos actuales"""
+    Producto = apps.get_model('api', 'Producto')
+    PedidoProducto = apps.get_model('api', 'PedidoProducto')
+    producto = Producto.objects.filter(pk=OuterRef('producto_id'))
+    PedidoProducto.objects.update(
+        producto_nombre=Subquery(producto.values('nombre')[:1]),
+        # Productos sin imagen: la copia queda vacía en lugar de NULL
+        producto_imagen=Coalesce(
+            Subquery(producto.values('imagen')[:1]), Value(''), output_field=CharField()
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0029_pedido_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pedidoproducto',
+            name='producto_nombre',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='pedidoproducto',
+            name='producto_imagen',
+            field=models.ImageField(blank=True, editable=False, max_length=500, upload_to=''),
+        ),
+        migrations.AddIndex(
+            model_name='pedidoproducto',
+            index=models.Index(fields=['producto_imagen'], name='api_item_imagen_idx'),
+        ),
+        migrations.RunPython(copiar_productos, migrations.RunPython.noop),
+    ]
@@ -3,3 +3,7 @@ from .categoria_models import *
 from .producto_models import *
 from .pedido_models import *
 from .licencia_models import *
+from .busqueda_models import *
+from .tarea_models import *
+from .scheduler_models import *
+from .estadisticas_models import *
@@ -0,0 +1,23 @@
+from django.db import models
+from .producto_models import Producto
+
+class ProductoToken(models.Model):
+    """Índice invertido para la búsqueda de productos del marketplace"""
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.CASCADE,
+        related_name='tokens'
+    )
+    token = models.CharField(max_length=50)
+    peso = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        verbose_name = 'Token de búsqueda'
+        verbose_name_plural = 'Tokens de búsqueda'
+        unique_together = ['producto', 'token']
+        indexes = [
+            models.Index(fields=['token', 'producto'], name='api_token_producto_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} ({self.producto_id})"
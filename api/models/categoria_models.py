@@ -1,11 +1,12 @@
 from django.db import models
-import os
 from .negocio_models import InfoNegocio
+from ..utils.tareas import eliminar_archivo_en_segundo_plano, encolar_variantes
 
 class Categoria(models.Model):
     negocio = models.ForeignKey(InfoNegocio, on_delete=models.CASCADE)
     nombre = models.CharField(max_length=100)
     imagen = models.ImageField(upload_to='categorias/', blank=True, null=True)
+    imagen_srcset = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -19,19 +20,31 @@ class Categoria(models.Model):
         return f"{self.negocio.nombre} - {self.nombre}"
 
     def save(self, *args, **kwargs):
+        negocio_anterior = None
         try:
             old_instance = Categoria.objects.get(pk=self.pk)
-            if old_instance.imagen and self.imagen != old_instance.imagen:
-                if os.path.isfile(old_instance.imagen.path):
-                    os.remove(old_instance.imagen.path)
+            negocio_anterior = old_instance.negocio_id
+            if self.imagen == old_instance.imagen:
+                self.imagen_srcset = old_instance.imagen_srcset
+            else:
+                eliminar_archivo_en_segundo_plano(old_instance.imagen, old_instance.imagen_srcset)
+                self.imagen_srcset = {}
         except Categoria.DoesNotExist:
             pass
+        imagen_nueva = bool(self.imagen) and not self.imagen._committed
         super().save(*args, **kwargs)
+        if imagen_nueva:
+            encolar_variantes(self, 'imagen')
+
+        # Mantener sincronizado el negocio desnormalizado de los productos
+        if negocio_anterior is not None and negocio_anterior != self.negocio_id:
+            from .producto_models import Producto
+            Producto.objects.filter(
+                subcategoria__categoria=self
+            ).update(negocio_id=self.negocio_id)
 
     def delete(self, *args, **kwargs):
-        if self.imagen:
-            if os.path.isfile(self.imagen.path):
-                os.remove(self.imagen.path)
+        eliminar_archivo_en_segundo_plano(self.imagen, self.imagen_srcset)
         super().delete(*args, **kwargs)
 
 class Subcategoria(models.Model):
@@ -42,6 +55,7 @@ class Subcategoria(models.Model):
         related_name='subcategorias'
     )
     imagen = models.ImageField(upload_to='subcategorias/', blank=True, null=True)
+    imagen_srcset = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -55,17 +69,29 @@ class Subcategoria(models.Model):
         return f"{self.categoria.nombre} - {self.nombre}"
 
     def save(self, *args, **kwargs):
+        categoria_anterior = None
         try:
             old_instance = Subcategoria.objects.get(pk=self.pk)
-            if old_instance.imagen and self.imagen != old_instance.imagen:
-                if os.path.isfile(old_instance.imagen.path):
-                    os.remove(old_instance.imagen.path)
+            categoria_anterior = old_instance.categoria_id
+            if self.imagen == old_instance.imagen:
+                self.imagen_srcset = old_instance.imagen_srcset
+            else:
+                eliminar_archivo_en_segundo_plano(old_instance.imagen, old_instance.imagen_srcset)
+                self.imagen_srcset = {}
         except Subcategoria.DoesNotExist:
             pass
+        imagen_nueva = bool(self.imagen) and not self.imagen._committed
         super().save(*args, **kwargs)
+        if imagen_nueva:
+            encolar_variantes(self, 'imagen')
+
+        # Si la subcategoría cambió de categoría, sus productos pueden cambiar de negocio
+        if categoria_anterior is not None and categoria_anterior != self.categoria_id:
+            from .producto_models import Producto
+            Producto.objects.filter(subcategoria=self).update(
+                negocio_id=self.categoria.negocio_id
+            )
 
     def delete(self, *args, **kwargs):
-        if self.imagen:
-            if os.path.isfile(self.imagen.path):
-                os.remove(self.imagen.path)
+        eliminar_archivo_en_segundo_plano(self.imagen, self.imagen_srcset)
         super().delete(*args, **kwargs) 
\ No newline at end of file
@@ -0,0 +1,57 @@
+from django.db import models
+from .negocio_models import InfoNegocio
+from .producto_models import Producto
+from .pedido_models import Pedido
+
+class VentaDiariaNegocio(models.Model):
+    """
+    Acumulado diario de los pedidos de un negocio por estado. Lo mantiene
+    utils.estadisticas al crear pedidos y al cambiar su estado.
+    """
+    negocio = models.ForeignKey(
+        InfoNegocio,
+        on_delete=models.CASCADE,
+        related_name='ventas_diarias'
+    )
+    fecha = models.DateField()
+    estado = models.CharField(max_length=20, choices=Pedido.ESTADO_CHOICES)
+    pedidos = models.IntegerField(default=0)
+    unidades = models.IntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = 'Venta diaria por negocio'
+        verbose_name_plural = 'Ventas diarias por negocio'
+        # El índice único (negocio, fecha, estado) sirve también para los rangos de fechas
+        unique_together = ['negocio', 'fecha', 'estado']
+
+    def __str__(self):
+        return f"{self.negocio_id} {self.fecha} {self.estado}: {self.pedidos}"
+
+class VentaDiariaProducto(models.Model):
+    """Acumulado diario de las ventas no canceladas de cada producto"""
+    negocio = models.ForeignKey(
+        InfoNegocio,
+        on_delete=models.CASCADE,
+        related_name='ventas_diarias_productos'
+    )
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.CASCADE,
+        related_name='ventas_diarias'
+    )
+    fecha = models.DateField()
+    pedidos = models.IntegerField(default=0)
+    unidades = models.IntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = 'Venta diaria por producto'
+        verbose_name_plural = 'Ventas diarias por producto'
+        unique_together = ['producto', 'fecha']
+        indexes = [
+            models.Index(fields=['negocio', 'fecha'], name='api_venta_prod_neg_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.producto_id} {self.fecha}: {self.unidades}"
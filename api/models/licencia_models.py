@@ -1,8 +1,23 @@
 from django.db import models
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Now
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from decimal import Decimal
 
+class LicenciaQuerySet(models.QuerySet):
+    def con_estado(self):
+        """Anota `activa_ahora`: la licencia está vigente según la fecha de la base de datos"""
+        return self.annotate(
+            activa_ahora=ExpressionWrapper(
+                Q(fecha_vencimiento__gt=Now()),
+                output_field=BooleanField()
+            )
+        )
+
+    def vigentes(self):
+        return self.filter(fecha_vencimiento__gt=Now())
+
 class Licencia(models.Model):
     negocio = models.OneToOneField(
         'InfoNegocio',
@@ -17,23 +32,32 @@ class Licencia(models.Model):
         help_text="Indica si el usuario ya pagó su primera licencia"
     )
 
+    objects = LicenciaQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Licencia'
         verbose_name_plural = 'Licencias'
+        indexes = [
+            models.Index(fields=['esta_activa', 'fecha_vencimiento'], name='api_licencia_venc_idx'),
+        ]
 
     def __str__(self):
         return f"Licencia de {self.negocio.nombre}"
 
+    @property
+    def esta_vigente(self):
+        """
+        Estado real de la licencia, calculado a partir de la fecha de vencimiento.
+        `esta_activa` solo se sincroniza periódicamente desde el scheduler.
+        """
+        activa_ahora = getattr(self, 'activa_ahora', None)
+        if activa_ahora is not None:
+            return bool(activa_ahora)
+        return self.fecha_vencimiento > timezone.now()
+
     def verificar_estado(self):
-        """Verifica y actualiza el estado de la licencia basado en la fecha de vencimiento"""
-        ahora = timezone.now()
-        if self.fecha_vencimiento < ahora and self.esta_activa:
-            self.esta_activa = False
-            self.save()
-        elif self.fecha_vencimiento > ahora and not self.esta_activa:
-            self.esta_activa = True
-            self.save()
-        return self.esta_activa
+        """Devuelve el estado de la licencia según la fecha de vencimiento, sin escribir"""
+        return self.esta_vigente
 
     def save(self, *args, **kwargs):
         is_new = not self.pk
@@ -66,7 +90,7 @@ class Licencia(models.Model):
     @property
     def dias_restantes(self):
         """Calcula los días restantes de la licencia"""
-        if not self.esta_activa:
+        if not self.esta_vigente:
             return 0
         
         ahora = timezone.now()
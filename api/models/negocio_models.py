@@ -2,8 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils.text import slugify
 from colorfield.fields import ColorField
-import os
 from ..utils.ubicaciones_cuba import PROVINCIAS, get_municipios
+from ..utils.tareas import eliminar_archivo_en_segundo_plano, encolar_variantes
 from django.core.exceptions import ValidationError
 
 class InfoNegocio(models.Model):
@@ -15,6 +15,8 @@ class InfoNegocio(models.Model):
     email = models.EmailField(blank=True, null=True)
     logo = models.ImageField(upload_to='negocios/logos/', blank=True, null=True, default='default/default_logo.jpg')
     img_portada = models.ImageField(upload_to='negocios/img_portada/', blank=True, null=True, default='default/default_portada.jpg')
+    logo_srcset = models.JSONField(default=dict, blank=True, editable=False)
+    img_portada_srcset = models.JSONField(default=dict, blank=True, editable=False)
     activo = models.BooleanField(default=True)
     hace_domicilio = models.BooleanField(default=False)
     acepta_transferencia = models.BooleanField(default=False)
@@ -95,12 +97,13 @@ class InfoNegocio(models.Model):
     def save(self, *args, **kwargs):
         try:
             old_instance = InfoNegocio.objects.get(pk=self.pk)
-            if old_instance.logo and self.logo != old_instance.logo:
-                if os.path.isfile(old_instance.logo.path):
-                    os.remove(old_instance.logo.path)
-            if old_instance.img_portada and self.img_portada != old_instance.img_portada:
-                if os.path.isfile(old_instance.img_portada.path):
-                    os.remove(old_instance.img_portada.path)
+            for campo in ('logo', 'img_portada'):
+                anterior = getattr(old_instance, campo)
+                if getattr(self, campo) == anterior:
+                    setattr(self, f'{campo}_srcset', getattr(old_instance, f'{campo}_srcset'))
+                else:
+                    eliminar_archivo_en_segundo_plano(anterior, getattr(old_instance, f'{campo}_srcset'))
+                    setattr(self, f'{campo}_srcset', {})
         except InfoNegocio.DoesNotExist:
             pass
 
@@ -111,13 +114,18 @@ class InfoNegocio(models.Model):
             
         if not self.slug:
             self.slug = slugify(self.nombre)
+
+        nuevas = [
+            campo for campo in ('logo', 'img_portada')
+            if getattr(self, campo) and not getattr(self, campo)._committed
+        ]
         super().save(*args, **kwargs)
+        for campo in nuevas:
+            encolar_variantes(self, campo)
 
     def delete(self, *args, **kwargs):
-        if self.logo and os.path.isfile(self.logo.path):
-            os.remove(self.logo.path)
-        if self.img_portada and os.path.isfile(self.img_portada.path):
-            os.remove(self.img_portada.path)
+        eliminar_archivo_en_segundo_plano(self.logo, self.logo_srcset)
+        eliminar_archivo_en_segundo_plano(self.img_portada, self.img_portada_srcset)
         super().delete(*args, **kwargs)
 
 class NegocioUser(models.Model):
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from decimal import Decimal
 from .producto_models import Producto
@@ -25,6 +26,15 @@ class Pedido(models.Model):
     telefono_cliente = models.CharField(max_length=20)
     direccion_entrega = models.TextField()
     
+    # Cliente autenticado que hizo el pedido (historial del cliente)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='pedidos'
+    )
+
     # Información del pedido
     negocio = models.ForeignKey(
         InfoNegocio,
@@ -55,15 +65,31 @@ class Pedido(models.Model):
         default=0
     )
     updated_at = models.DateTimeField(auto_now=True)
+    # Mientras el pedido está pendiente el stock queda reservado hasta esta fecha
+    reserva_expira = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['-fecha_pedido']
         verbose_name = 'Pedido'
         verbose_name_plural = 'Pedidos'
+        indexes = [
+            models.Index(fields=['estado', 'reserva_expira'], name='api_pedido_reserva_idx'),
+            # Bandeja de pedidos del comerciante, con y sin filtro de estado
+            models.Index(fields=['negocio', 'estado', '-fecha_pedido'], name='api_pedido_neg_estado_idx'),
+            models.Index(fields=['negocio', '-fecha_pedido'], name='api_pedido_neg_fecha_idx'),
+            models.Index(fields=['user', '-fecha_pedido'], name='api_pedido_user_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"Pedido #{self.id} - {self.nombre_cliente}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Estado guardado en la BD, para detectar cambios en las estadísticas de ventas
+        instancia._estado_guardado = dict(zip(field_names, values)).get('estado')
+        return instancia
+
     def clean(self):
         """Validar que el pedido tenga al menos un producto"""
         super().clean()
@@ -105,6 +131,9 @@ class PedidoProducto(models.Model):
         on_delete=models.PROTECT,
         related_name='items_pedido'
     )
+    # Copia del producto en el momento de la compra: el historial no vuelve a Producto
+    producto_nombre = models.CharField(max_length=200, blank=True, editable=False)
+    producto_imagen = models.ImageField(max_length=500, blank=True, editable=False)
     cantidad = models.PositiveIntegerField(default=1)
     precio_unitario = models.DecimalField(
         max_digits=10,
@@ -119,9 +148,19 @@ class PedidoProducto(models.Model):
     class Meta:
         verbose_name = 'Item de Pedido'
         verbose_name_plural = 'Items de Pedido'
+        indexes = [
+            # El borrado de imágenes de productos conserva las que usa el historial
+            models.Index(fields=['producto_imagen'], name='api_item_imagen_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.cantidad}x {self.producto.nombre} en Pedido #{self.pedido.id}"
+        return f"{self.cantidad}x {self.producto_nombre} en Pedido #{self.pedido_id}"
+
+    def copiar_producto(self, producto):
+        """Guarda el nombre y la imagen actuales del producto en la línea"""
+        self.producto_nombre = producto.nombre
+        self.producto_imagen = producto.imagen.name if producto.imagen else ''
+
 
     def clean(self):
         """Validar cantidad y precio"""
@@ -137,6 +176,9 @@ class PedidoProducto(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
+        if not self.producto_nombre:
+            self.copiar_producto(self.producto)
+
         # Guardar el precio actual del producto
         if not self.precio_unitario:
             self.precio_unitario = self.producto.precio_con_descuento
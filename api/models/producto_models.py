@@ -1,11 +1,28 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
-from PIL import Image
-from io import BytesIO
-from django.core.files.base import ContentFile
-import os
 from .categoria_models import Subcategoria
+from .negocio_models import InfoNegocio
+from ..utils.tareas import encolar, eliminar_archivo_en_segundo_plano
+from ..utils.busqueda import reindexar_productos
+
+# Campos de los que salen los tokens de búsqueda
+CAMPOS_INDEXADOS = {'nombre', 'descripcion'}
+
+class ProductoQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        update() no pasa por save() ni dispara post_save: si toca campos
+        indexados se reconstruyen aquí los tokens. bulk_update también
+        termina en este método.
+        """
+        if CAMPOS_INDEXADOS.isdisjoint(kwargs):
+            return super().update(**kwargs)
+        # Los ids se leen antes: la propia actualización puede sacarlos del filtro
+        ids = list(self.values_list('pk', flat=True))
+        filas = super().update(**kwargs)
+        reindexar_productos(ids)
+        return filas
 
 class Producto(models.Model):
     nombre = models.CharField(max_length=200)
@@ -25,7 +42,7 @@ class Producto(models.Model):
     )
     
     def producto_imagen_path(instance, filename):
-        return f'productos/{instance.subcategoria.categoria.negocio.slug}/{filename}'
+        return f'productos/{instance.negocio.slug}/{filename}'
     
     imagen = models.ImageField(
         upload_to=producto_imagen_path,
@@ -34,27 +51,48 @@ class Producto(models.Model):
         default='default/default_producto.jfif',
         max_length=500
     )
+    # Variantes responsive {formato: {ancho: nombre}} generadas por el worker
+    imagen_srcset = models.JSONField(default=dict, blank=True, editable=False)
     subcategoria = models.ForeignKey(
         Subcategoria,
         on_delete=models.CASCADE,
         related_name='productos'
     )
+    # Copia de subcategoria.categoria.negocio para no recorrer el join de 3 niveles.
+    # Se mantiene sincronizado en save() y al mover subcategorías o categorías.
+    negocio = models.ForeignKey(
+        InfoNegocio,
+        on_delete=models.CASCADE,
+        related_name='productos',
+        editable=False
+    )
     activo = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductoQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Producto'
         verbose_name_plural = 'Productos'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['negocio', 'activo', '-id'], name='api_prod_neg_activo_id_idx'),
+            models.Index(fields=['negocio', 'nombre'], name='api_prod_neg_nombre_idx'),
+        ]
+
+    def _sincronizar_negocio(self):
+        if self.subcategoria_id:
+            self.negocio_id = self.subcategoria.categoria.negocio_id
 
     def clean(self):
         super().clean()
-        if self.nombre and self.subcategoria_id:
-            negocio = self.subcategoria.categoria.negocio
+        # Un formulario nuevo (p. ej. el admin) aún no trae negocio: se deduce de la subcategoría
+        self._sincronizar_negocio()
+        if self.nombre and self.negocio_id:
             productos_existentes = Producto.objects.filter(
                 nombre__iexact=self.nombre,
-                subcategoria__categoria__negocio=negocio
+                negocio_id=self.negocio_id
             )
             if self.pk:
                 productos_existentes = productos_existentes.exclude(pk=self.pk)
@@ -65,32 +103,24 @@ class Producto(models.Model):
                 })
 
     def save(self, *args, **kwargs):
+        self._sincronizar_negocio()
         self.full_clean()
         
         try:
             old_instance = Producto.objects.get(pk=self.pk)
-            if old_instance.imagen and self.imagen != old_instance.imagen:
-                if os.path.isfile(old_instance.imagen.path):
-                    os.remove(old_instance.imagen.path)
+            if self.imagen == old_instance.imagen:
+                self.imagen_srcset = old_instance.imagen_srcset
+            else:
+                eliminar_archivo_en_segundo_plano(old_instance.imagen, old_instance.imagen_srcset)
+                self.imagen_srcset = {}
         except Producto.DoesNotExist:
             pass
 
-        if self.imagen:
-            img = Image.open(self.imagen)
-            img_format = img.format
-            
-            while True:
-                img_io = BytesIO()
-                img.save(img_io, format=img_format, quality=85)
-                img_size = img_io.getbuffer().nbytes
-                
-                if img_size <= 20 * 1024:  # 20 KB
-                    break
-                img = img.resize((int(img.width * 0.9), int(img.height * 0.9)))
-
-            self.imagen.save(self.imagen.name, ContentFile(img_io.getvalue()), save=False)
-
+        # La imagen recién subida se guarda tal cual y el worker la comprime después
+        imagen_nueva = bool(self.imagen) and not self.imagen._committed
         super().save(*args, **kwargs)
+        if imagen_nueva:
+            encolar('procesar_imagen_producto', producto_id=self.pk, nombre=self.imagen.name)
 
     def __str__(self):
         return self.nombre
@@ -103,7 +133,5 @@ class Producto(models.Model):
         return self.precio
 
     def delete(self, *args, **kwargs):
-        if self.imagen:
-            if os.path.isfile(self.imagen.path):
-                os.remove(self.imagen.path)
+        eliminar_archivo_en_segundo_plano(self.imagen, self.imagen_srcset)
         super().delete(*args, **kwargs) 
\ No newline at end of file
@@ -0,0 +1,18 @@
+from django.db import models
+
+class LiderScheduler(models.Model):
+    """
+    Concesión (lease) que decide qué proceso ejecuta los trabajos periódicos.
+    El propietario la renueva antes de que expire; si deja de hacerlo, otro
+    proceso la toma.
+    """
+    nombre = models.CharField(max_length=50, unique=True)
+    propietario = models.CharField(max_length=255)
+    expira = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Líder del scheduler'
+        verbose_name_plural = 'Líderes del scheduler'
+
+    def __str__(self):
+        return f"{self.nombre}: {self.propietario}"
@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils import timezone
+
+class Tarea(models.Model):
+    """Trabajo en segundo plano ejecutado por `manage.py procesar_tareas`"""
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('en_proceso', 'En Proceso'),
+        ('completada', 'Completada'),
+        ('fallida', 'Fallida')
+    ]
+
+    tipo = models.CharField(max_length=50)
+    datos = models.JSONField(default=dict)
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADO_CHOICES,
+        default='pendiente'
+    )
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=3)
+    ejecutar_despues = models.DateTimeField(default=timezone.now)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Tarea'
+        verbose_name_plural = 'Tareas'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['estado', 'ejecutar_despues'], name='api_tarea_pendiente_idx'),
+        ]
+
+    def __str__(self):
+        return f"Tarea #{self.id} {self.tipo} ({self.estado})"
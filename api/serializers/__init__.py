@@ -6,4 +6,5 @@ from .subcategoria_serializers import *
 from .producto_serializers import *
 from .user_auth_serializers import *
 from .pedido_serializers import *
-from .licencia_serializers import *
\ No newline at end of file
+from .licencia_serializers import *
+from .srcset_serializers import *
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from ..models import Categoria
 from .subcategoria_serializers import SubcategoriaSerializer
+from .srcset_serializers import SrcsetField
 
 class CategoriaAdminSerializer(serializers.ModelSerializer):
     subcategorias = SubcategoriaSerializer(many=True, read_only=True)
     negocio = serializers.PrimaryKeyRelatedField(read_only=True)
+    imagen_srcset = SrcsetField()
     
     class Meta:
         model = Categoria
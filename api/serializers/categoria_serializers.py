@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from ..models import Categoria
 from .subcategoria_serializers import SubcategoriaDetalleSerializer
+from .srcset_serializers import SrcsetField
 
 class CategoriaSerializer(serializers.ModelSerializer):
+    imagen_srcset = SrcsetField()
+
     class Meta:
         model = Categoria
         exclude = ('negocio',)
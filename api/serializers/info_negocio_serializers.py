@@ -3,22 +3,24 @@ from rest_framework import serializers
 from ..models import InfoNegocio
 from .tienda_tema_serializers import TiendaTemaSerializer
 from .categoria_serializers import CategoriaSerializer
-from django.db.models import Count, Sum
+from .srcset_serializers import SrcsetField
 
 class InfoNegocioSerializer(serializers.ModelSerializer):
     tema = TiendaTemaSerializer(read_only=True)
     cantidad_productos = serializers.SerializerMethodField()
+    logo_srcset = SrcsetField()
+    img_portada_srcset = SrcsetField()
 
     class Meta:
         model = InfoNegocio
         fields = '__all__'
 
     def get_cantidad_productos(self, obj):
-        return obj.categoria_set.annotate(
-            productos_count=Count('subcategorias__productos', distinct=True)
-        ).aggregate(
-            total=Sum('productos_count')
-        )['total'] or 0
+        # Si el queryset ya viene anotado (listado de tiendas) no consultamos de nuevo
+        cantidad = getattr(obj, 'cantidad_productos', None)
+        if cantidad is not None:
+            return cantidad
+        return obj.productos.count()
 
 class NegocioDetalleSerializer(InfoNegocioSerializer):
     categorias = CategoriaSerializer(many=True, read_only=True, source='categoria_set')
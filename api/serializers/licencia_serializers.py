@@ -4,6 +4,7 @@ from ..models import Licencia
 
 class LicenciaSerializer(serializers.ModelSerializer):
     dias_restantes = serializers.IntegerField(read_only=True)
+    esta_activa = serializers.BooleanField(source='esta_vigente', read_only=True)
     
     class Meta:
         model = Licencia
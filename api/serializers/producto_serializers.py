@@ -1,9 +1,12 @@
+from decimal import Decimal
 from rest_framework import serializers
 from ..models import Subcategoria, Producto, InfoNegocio
 from .info_negocio_serializers import TiendaTemaSerializer
+from .srcset_serializers import SrcsetField
 
 class NegocioReducidoSerializer(serializers.ModelSerializer):
     tema = TiendaTemaSerializer(read_only=True)
+    logo_srcset = SrcsetField()
     
     class Meta:
         model = InfoNegocio
@@ -12,6 +15,7 @@ class NegocioReducidoSerializer(serializers.ModelSerializer):
             'nombre',
             'slug',
             'logo',
+            'logo_srcset',
             'tema',
             'provincia',
             'municipio'
@@ -19,6 +23,7 @@ class NegocioReducidoSerializer(serializers.ModelSerializer):
 
 class ProductoSerializer(serializers.ModelSerializer):
     negocio = serializers.SerializerMethodField()
+    imagen_srcset = SrcsetField()
 
     class Meta:
         model = Producto
@@ -29,6 +34,7 @@ class ProductoSerializer(serializers.ModelSerializer):
             'precio',
             'stock',
             'imagen',
+            'imagen_srcset',
             'descuento',
             'activo',
             'subcategoria',
@@ -40,10 +46,56 @@ class ProductoSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'precio_con_descuento', 'created_at', 'updated_at', 'negocio']
 
     def get_negocio(self, obj):
-        negocio = obj.subcategoria.categoria.negocio
-        return NegocioReducidoSerializer(negocio).data
+        # Memo por respuesta: el mismo negocio se repite en muchos productos,
+        # así que se serializa una sola vez y se comparte entre las filas
+        negocios = self.context.setdefault('negocios_reducidos', {})
+        if obj.negocio_id not in negocios:
+            negocios[obj.negocio_id] = NegocioReducidoSerializer(obj.negocio).data
+        return negocios[obj.negocio_id]
 
     def validate_subcategoria(self, value):
         if not value:
             raise serializers.ValidationError("La subcategoría es requerida")
-        return value
\ No newline at end of file
+        return value
+
+class ProductoTarjetaSerializer(serializers.ModelSerializer):
+    """Representación ligera para tarjetas de listado: sin descripción ni negocio"""
+    imagen_srcset = SrcsetField()
+
+    # Columnas que necesita la tarjeta, para cargarlas con only()
+    CAMPOS_CONSULTA = (
+        'id', 'nombre', 'precio', 'descuento', 'stock', 'imagen',
+        'imagen_srcset', 'subcategoria_id'
+    )
+
+    class Meta:
+        model = Producto
+        fields = [
+            'id',
+            'nombre',
+            'precio',
+            'descuento',
+            'precio_con_descuento',
+            'stock',
+            'imagen',
+            'imagen_srcset',
+            'subcategoria'
+        ]
+        read_only_fields = fields
+
+
+class ProductoImportacionSerializer(serializers.Serializer):
+    """Valida una fila de la importación masiva; categoría y subcategoría van por nombre"""
+    nombre = serializers.CharField(max_length=200)
+    descripcion = serializers.CharField(allow_blank=True, default='')
+    precio = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'))
+    stock = serializers.IntegerField(min_value=0, default=0)
+    descuento = serializers.IntegerField(min_value=0, max_value=99, default=0)
+    activo = serializers.BooleanField(default=True)
+    categoria = serializers.CharField(max_length=100)
+    subcategoria = serializers.CharField(max_length=100)
+
+    def to_internal_value(self, data):
+        # En CSV las celdas vacías llegan como '': se tratan como ausentes
+        data = {clave: valor for clave, valor in data.items() if clave and valor not in ('', None)}
+        return super().to_internal_value(data)
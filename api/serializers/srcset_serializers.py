@@ -0,0 +1,24 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from drf_spectacular.utils import extend_schema_field
+
+@extend_schema_field({'type': 'object', 'additionalProperties': {'type': 'string'}})
+class SrcsetField(serializers.ReadOnlyField):
+    """
+    Expone las variantes de una imagen como {formato: "url 160w, url 320w"},
+    listo para usar en el atributo srcset de <img> o <source>.
+    Vacío mientras el worker no haya generado las variantes.
+    """
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        srcset = {}
+        for formato, anchos in (value or {}).items():
+            urls = []
+            for ancho, nombre in sorted(anchos.items(), key=lambda item: int(item[0])):
+                url = default_storage.url(nombre)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls.append(f'{url} {ancho}w')
+            srcset[formato] = ', '.join(urls)
+        return srcset
@@ -1,8 +1,19 @@
 from rest_framework import serializers
 from ..models import Subcategoria
 from .producto_serializers import ProductoSerializer
+from .srcset_serializers import SrcsetField
 
 class SubcategoriaSerializer(serializers.ModelSerializer):
+    imagen_srcset = SrcsetField()
+
+    class Meta:
+        model = Subcategoria
+        fields = '__all__'
+
+class SubcategoriaConteoSerializer(SubcategoriaSerializer):
+    """Subcategoría con el número de productos activos anotado en la consulta"""
+    total_productos = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Subcategoria
         fields = '__all__'
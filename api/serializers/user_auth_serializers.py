@@ -11,6 +11,15 @@ class UserAuthSerializer(serializers.ModelSerializer):
             'email': {'required': True}
         }
 
+    def validate_email(self, value):
+        # El email identifica al usuario en el login: debe ser único
+        usuarios = User.objects.filter(email=value)
+        if self.instance:
+            usuarios = usuarios.exclude(pk=self.instance.pk)
+        if usuarios.exists():
+            raise serializers.ValidationError('Ya existe un usuario con este email')
+        return value
+
     def create(self, validated_data):
         user = User.objects.create_user(
             username=validated_data['username'],
@@ -1 +1,5 @@
-from .licencia_signals import *  
\ No newline at end of file
+from .licencia_signals import *  
+from .busqueda_signals import *
+from .cache_signals import *
+from .auth_signals import *
+from .estadisticas_signals import *
\ No newline at end of file
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from ..utils.autenticacion import invalidar_token
+
+@receiver(post_delete, sender=Token)
+def invalidar_token_eliminado(sender, instance, **kwargs):
+    # logout y change_password eliminan el token
+    invalidar_token(instance.key)
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from ..models import Producto
+from ..utils.busqueda import indexar_producto
+import logging
+
+logger = logging.getLogger(__name__)
+
+@receiver(post_save, sender=Producto)
+def actualizar_indice_busqueda(sender, instance, **kwargs):
+    try:
+        indexar_producto(instance)
+    except Exception as e:
+        logger.error(f"Error al indexar producto {instance.pk}: {str(e)}")
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from ..models import InfoNegocio, TiendaTema, Categoria, Subcategoria, Producto
+from ..utils.cache import invalidar_catalogo
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _slug_negocio(negocio_id):
+    return InfoNegocio.objects.filter(pk=negocio_id).values_list('slug', flat=True).first()
+
+@receiver([post_save, post_delete], sender=InfoNegocio)
+def invalidar_cache_negocio(sender, instance, **kwargs):
+    invalidar_catalogo(instance.slug)
+
+@receiver([post_save, post_delete], sender=TiendaTema)
+@receiver([post_save, post_delete], sender=Categoria)
+@receiver([post_save, post_delete], sender=Producto)
+def invalidar_cache_por_negocio(sender, instance, **kwargs):
+    try:
+        invalidar_catalogo(_slug_negocio(instance.negocio_id))
+    except Exception as e:
+        logger.error(f"Error al invalidar caché del catálogo: {str(e)}")
+
+@receiver([post_save, post_delete], sender=Subcategoria)
+def invalidar_cache_subcategoria(sender, instance, **kwargs):
+    try:
+        slug = Categoria.objects.filter(
+            pk=instance.categoria_id
+        ).values_list('negocio__slug', flat=True).first()
+        invalidar_catalogo(slug)
+    except Exception as e:
+        logger.error(f"Error al invalidar caché del catálogo: {str(e)}")
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from ..models import Pedido
+from ..utils.estadisticas import registrar_borrado, registrar_cambio_estado
+import logging
+
+logger = logging.getLogger(__name__)
+
+@receiver(post_save, sender=Pedido)
+def actualizar_estadisticas_pedido(sender, instance, created, **kwargs):
+    # Los pedidos nuevos se suman en crear_pedido, cuando ya tienen sus líneas
+    anterior = getattr(instance, '_estado_guardado', None)
+    instance._estado_guardado = instance.estado
+    if created or anterior is None or anterior == instance.estado:
+        return
+    try:
+        registrar_cambio_estado(instance, anterior)
+    except Exception as e:
+        # Los acumulados se pueden recalcular con `manage.py reconstruir_estadisticas`
+        logger.error(f"Error al actualizar las estadísticas del pedido {instance.pk}: {str(e)}")
+
+@receiver(pre_delete, sender=Pedido)
+def guardar_lineas_pedido_borrado(sender, instance, **kwargs):
+    # Las líneas se borran en cascada antes que el pedido: se leen ahora
+    instance._lineas_borradas = list(
+        instance.items.only('producto_id', 'cantidad', 'subtotal')
+    )
+
+@receiver(post_delete, sender=Pedido)
+def descontar_estadisticas_pedido(sender, instance, **kwargs):
+    try:
+        registrar_borrado(instance, getattr(instance, '_lineas_borradas', []))
+    except Exception as e:
+        logger.error(f"Error al descontar las estadísticas del pedido {instance.pk}: {str(e)}")
@@ -2,10 +2,16 @@ from django.db.models.signals import post_save, post_migrate
 from django.dispatch import receiver
 from django.utils import timezone
 from django.core.cache import cache
+from django.db import close_old_connections
 from ..models import Licencia, InfoNegocio
+from ..utils.reservas import liberar_reservas_vencidas
+from ..utils.licencias import contar_licencias, crear_licencias_faltantes, expirar_licencias, proximo_vencimiento
+from ..utils.liderazgo import DURACION, PROPIETARIO, es_lider, liberar_liderazgo, renovar_liderazgo
 from apscheduler.schedulers.background import BackgroundScheduler
 from django.conf import settings
 from datetime import timedelta
+from functools import wraps
+import atexit
 import logging
 import sys
 import os
@@ -15,57 +21,149 @@ logger = logging.getLogger(__name__)
 
 scheduler = None
 
+# Aunque no haya vencimientos próximos se revisa de vez en cuando, por si
+# se crean o editan licencias con una fecha anterior a la programada
+INTERVALO_MAXIMO = timedelta(hours=1)
+
 def verificar_sistema_licencias():
-    """Función que ejecuta todas las verificaciones del sistema de licencias"""
+    """
+    Expira las licencias vencidas y crea las que faltan. Devuelve la fecha en
+    la que conviene volver a ejecutarla: el próximo vencimiento, acotado por
+    INTERVALO_MAXIMO.
+    """
+    ahora = timezone.now()
+    siguiente = ahora + INTERVALO_MAXIMO
     try:
         fecha_actual = timezone.localtime().strftime("%d/%m/%Y %H:%M:%S")
         print(colored(f"\nEjecutando verificación de licencias: {fecha_actual}", 'cyan', attrs=['bold']))
 
-        # Verificar licencias
-        licencias = Licencia.objects.all()
-        licencias_activas = [l for l in licencias if l.esta_activa]
-        licencias_vencidas = [l for l in licencias if not l.esta_activa]
-        
-        # Mostrar conteo de licencias
-        print(colored(f"✓ Licencias activas ({len(licencias_activas)})", 'green', attrs=['bold']))
-        print(colored(f"✗ Licencias vencidas ({len(licencias_vencidas)})", 'red', attrs=['bold']))
+        expiradas = expirar_licencias()
+        if expiradas:
+            print(colored(f"✗ Licencias expiradas ahora ({expiradas})", 'red', attrs=['bold']))
 
         # Crear licencias faltantes
-        negocios_sin_licencia = InfoNegocio.objects.filter(licencia__isnull=True)
-        if negocios_sin_licencia:
-            print(colored(f"+ Creando licencias ({len(negocios_sin_licencia)}):", 'yellow', attrs=['bold']))
-            for negocio in negocios_sin_licencia:
-                fecha_vencimiento = timezone.now() + timedelta(days=30)
-                Licencia.objects.create(
-                    negocio=negocio,
-                    fecha_vencimiento=fecha_vencimiento
-                )
-                print(colored(f"  • {negocio.nombre}", 'yellow'))
+        creadas = crear_licencias_faltantes()
+        if creadas:
+            print(colored(f"+ Creando licencias ({len(creadas)}):", 'yellow', attrs=['bold']))
+            for nombre in creadas:
+                print(colored(f"  • {nombre}", 'yellow'))
+
+        # Mostrar conteo de licencias
+        conteo = contar_licencias()
+        print(colored(f"✓ Licencias activas ({conteo['activas']})", 'green', attrs=['bold']))
+        print(colored(f"✗ Licencias vencidas ({conteo['vencidas']})", 'red', attrs=['bold']))
+
+        proximo = proximo_vencimiento()
+        if proximo is not None:
+            siguiente = max(min(siguiente, proximo + timedelta(seconds=1)), ahora + timedelta(seconds=1))
 
         print()  # Línea en blanco al final
-        logger.info(f"Verificación: {len(licencias_activas)} activas, {len(licencias_vencidas)} vencidas")
+        logger.info(f"Verificación: {conteo['activas']} activas, {conteo['vencidas']} vencidas")
 
     except Exception as e:
         error_msg = f"Error en verificación: {str(e)}"
         print(colored(error_msg, 'red', attrs=['bold']))
         logger.error(error_msg)
+    return siguiente
+
+def programar_verificacion_licencias(run_date=None):
+    """(Re)programa la verificación de licencias como un trabajo de una sola ejecución"""
+    if scheduler:
+        scheduler.add_job(
+            trabajo_programado(ejecutar_verificacion_licencias),
+            'date',
+            run_date=run_date or timezone.now(),
+            id='verificar_sistema_licencias_job',
+            replace_existing=True
+        )
+
+def ejecutar_verificacion_licencias():
+    """Ejecuta la verificación y se reprograma para el siguiente vencimiento"""
+    # Si otro proceso es el líder, este trabajo se reprograma al recuperar el liderazgo
+    if es_lider():
+        programar_verificacion_licencias(verificar_sistema_licencias())
+
+def trabajo_programado(funcion):
+    """
+    Envuelve un trabajo de APScheduler: su hilo no pasa por el ciclo de
+    petición de Django, así que las conexiones caducadas o rotas se cierran
+    aquí, antes y después de cada ejecución.
+    """
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        close_old_connections()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return envoltura
+
+def solo_lider(funcion):
+    """Envuelve un trabajo periódico para que solo lo ejecute el proceso líder"""
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if es_lider():
+            return funcion(*args, **kwargs)
+    return envoltura
+
+def mantener_liderazgo():
+    """
+    Renueva la concesión; al ganar el liderazgo se lanza la verificación de
+    licencias. Si la renovación falla o la concesión pasó a otro proceso, los
+    trabajos envueltos con `solo_lider` dejan de ejecutarse aquí.
+    """
+    era_lider = es_lider()
+    try:
+        if renovar_liderazgo():
+            print(colored(f"✓ Liderazgo del scheduler: {PROPIETARIO}", 'green', attrs=['bold']))
+            programar_verificacion_licencias()
+    except Exception as e:
+        logger.error(f"Error al renovar el liderazgo del scheduler: {str(e)}")
+    finally:
+        if era_lider and not es_lider():
+            logger.warning(f"El proceso {PROPIETARIO} ha perdido el liderazgo del scheduler")
+
+def detener_scheduler():
+    """Detiene el scheduler y cede el liderazgo"""
+    global scheduler
+    if scheduler and getattr(scheduler, 'running', False):
+        scheduler.shutdown(wait=False)
+    scheduler = None
+    try:
+        liberar_liderazgo()
+    except Exception as e:
+        logger.error(f"Error al liberar el liderazgo del scheduler: {str(e)}")
 
-def start_scheduler_if_needed():
-    """Función para iniciar el scheduler si no está corriendo"""
+def start_scheduler_if_needed(forzar=False):
+    """
+    Inicia el scheduler si no está corriendo. Todos los procesos que lo
+    arrancan compiten por una concesión en base de datos y solo el líder
+    ejecuta los trabajos. Con SCHEDULER_AUTOSTART=False los procesos web no lo
+    arrancan y se usa `manage.py run_scheduler`.
+    """
     global scheduler
     if not scheduler or not getattr(scheduler, 'running', False):
-        if os.environ.get('RUN_MAIN') or not os.environ.get('DJANGO_SETTINGS_MODULE'):
+        automatico = settings.SCHEDULER_AUTOSTART and (
+            os.environ.get('RUN_MAIN') or not os.environ.get('DJANGO_SETTINGS_MODULE')
+        )
+        if forzar or automatico:
             print(colored("Iniciando scheduler de licencias...", 'cyan', attrs=['bold']))
-            verificar_sistema_licencias()
             scheduler = BackgroundScheduler()
             scheduler.add_job(
-                verificar_sistema_licencias,
+                trabajo_programado(mantener_liderazgo),
                 'interval',
-                minutes=1,
-                id='verificar_sistema_licencias_job',
+                seconds=DURACION.total_seconds() / 3,
+                id='mantener_liderazgo_job',
                 next_run_time=timezone.now()
             )
+            scheduler.add_job(
+                trabajo_programado(solo_lider(liberar_reservas_vencidas)),
+                'interval',
+                minutes=5,
+                id='liberar_reservas_vencidas_job'
+            )
             scheduler.start()
+            atexit.register(detener_scheduler)
             print(colored("✓ Scheduler iniciado", 'green', attrs=['bold']))
             return True
     return False
@@ -96,7 +194,3 @@ def configurar_sistema_licencias(sender, **kwargs):
     except Exception as e:
         print(colored(f"✗ Error de configuración: {str(e)}", 'red', attrs=['bold']))
         logger.error(f"Error config: {str(e)}")
-
-# Inicialización
-print(colored("Iniciando sistema de licencias...", 'cyan', attrs=['bold']))
-start_scheduler_if_needed()
\ No newline at end of file
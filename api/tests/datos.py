@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from ..models import Categoria, InfoNegocio, NegocioUser, Producto, Subcategoria
+
+DATOS_PEDIDO = {
+    'nombre_cliente': 'Cliente de prueba',
+    'email_cliente': 'cliente@ejemplo.com',
+    'telefono_cliente': '50000000',
+    'direccion_entrega': 'Calle 1 #1',
+}
+
+def crear_negocio(nombre='Tienda', productos=0, stock=10, dueno=None):
+    """Negocio con una categoría, una subcategoría y `productos` productos"""
+    negocio = InfoNegocio.objects.create(nombre=nombre, provincia='La Habana', municipio='Playa')
+    subcategoria = Subcategoria.objects.create(
+        categoria=Categoria.objects.create(negocio=negocio, nombre='Categoría'),
+        nombre='Subcategoría'
+    )
+    for i in range(productos):
+        Producto.objects.create(
+            nombre=f'{nombre} producto {i}',
+            descripcion='Descripción',
+            precio=10,
+            stock=stock,
+            subcategoria=subcategoria
+        )
+    if dueno:
+        NegocioUser.objects.create(user=dueno, negocio=negocio)
+    return negocio
+
+def crear_usuario(username='usuario', email=None, password='contrasena'):
+    return User.objects.create_user(username=username, email=email or f'{username}@ejemplo.com', password=password)
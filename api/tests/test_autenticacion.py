@@ -0,0 +1,81 @@
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from ..utils.autenticacion import CachedTokenAuthentication
+from .datos import crear_negocio, crear_usuario
+
+URL = '/api/auth/login/'
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginTest(TestCase):
+
+    def setUp(self):
+        self.usuario = crear_usuario('dueno', email='dueno@ejemplo.com')
+        Token.objects.create(user=self.usuario)
+        self.negocio = crear_negocio(dueno=self.usuario)
+
+    def test_una_consulta_por_email_y_por_username(self):
+        for identificador in ('dueno@ejemplo.com', 'dueno'):
+            with self.subTest(identificador=identificador), self.assertNumQueries(1):
+                usuario = authenticate(None, username=identificador, password='contrasena')
+            self.assertEqual(usuario, self.usuario)
+
+    def test_login_completo_en_una_consulta(self):
+        for identificador in ('dueno@ejemplo.com', 'dueno'):
+            with self.subTest(identificador=identificador), self.assertNumQueries(1):
+                respuesta = self.client.post(URL, {'username': identificador, 'password': 'contrasena'})
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertEqual(respuesta.json()['negocio']['slug'], self.negocio.slug)
+
+    def test_email_repetido_no_elige_una_cuenta(self):
+        # En MariaDB la migración 0026 no puede crear el índice único de email
+        if connection.vendor in ('sqlite', 'postgresql'):
+            with connection.cursor() as cursor:
+                cursor.execute('DROP INDEX api_user_email_uniq')
+        elif not connection.mysql_is_mariadb:
+            self.skipTest('El índice único de email impide repetirlo')
+        crear_usuario('otro', email='dueno@ejemplo.com')
+
+        with self.assertLogs('api.utils.autenticacion', 'ERROR'):
+            self.assertIsNone(authenticate(None, username='dueno@ejemplo.com', password='contrasena'))
+        with self.assertLogs('api.utils.autenticacion', 'ERROR'):
+            respuesta = self.client.post(URL, {'username': 'dueno@ejemplo.com', 'password': 'contrasena'})
+        self.assertEqual(respuesta.status_code, 409)
+        # Por username sigue funcionando
+        self.assertEqual(authenticate(None, username='dueno', password='contrasena'), self.usuario)
+
+class TokenCacheadoTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.usuario = crear_usuario('dueno', email='dueno@ejemplo.com')
+        self.token = Token.objects.create(user=self.usuario)
+        self.autenticacion = CachedTokenAuthentication()
+        self.autenticacion.authenticate_credentials(self.token.key)
+
+    def test_el_usuario_no_es_una_copia_cacheada(self):
+        # Cambio sin señales: el usuario se relee igualmente
+        User.objects.filter(pk=self.usuario.pk).update(email='nuevo@ejemplo.com')
+
+        with self.assertNumQueries(1):
+            usuario, token = self.autenticacion.authenticate_credentials(self.token.key)
+
+        self.assertEqual(usuario.email, 'nuevo@ejemplo.com')
+        self.assertEqual(token.key, self.token.key)
+
+    def test_usuario_desactivado(self):
+        User.objects.filter(pk=self.usuario.pk).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.autenticacion.authenticate_credentials(self.token.key)
+
+    def test_token_eliminado(self):
+        key = self.token.key
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.autenticacion.authenticate_credentials(key)
@@ -0,0 +1,44 @@
+from django.test import TestCase
+from ..models import Producto, VentaDiariaNegocio, VentaDiariaProducto
+from ..utils.estadisticas import reconstruir_estadisticas
+from ..utils.pedidos import crear_pedido
+from .datos import DATOS_PEDIDO, crear_negocio
+
+def acumulados():
+    """Acumulados distintos de cero, comparables con los de una reconstrucción"""
+    return (
+        sorted(VentaDiariaNegocio.objects.exclude(pedidos=0).values_list(
+            'negocio_id', 'fecha', 'estado', 'pedidos', 'unidades', 'ingresos'
+        )),
+        sorted(VentaDiariaProducto.objects.exclude(pedidos=0).values_list(
+            'producto_id', 'fecha', 'pedidos', 'unidades', 'ingresos'
+        )),
+    )
+
+class BorradoPedidoTest(TestCase):
+
+    def setUp(self):
+        self.negocio = crear_negocio(productos=2)
+        self.productos = list(Producto.objects.filter(negocio=self.negocio))
+        self.pedidos = [
+            crear_pedido(dict(DATOS_PEDIDO), [
+                {'producto_id': producto.id, 'cantidad': 2} for producto in self.productos
+            ])
+            for _ in range(2)
+        ]
+
+    def test_borrar_un_pedido_lo_descuenta(self):
+        self.pedidos[0].delete()
+        incrementales = acumulados()
+
+        reconstruir_estadisticas()
+        self.assertEqual(incrementales, acumulados())
+        self.assertEqual(VentaDiariaNegocio.objects.get(pedidos__gt=0).pedidos, 1)
+
+    def test_borrar_un_pedido_no_contado_no_deja_negativos(self):
+        VentaDiariaNegocio.objects.all().delete()
+        VentaDiariaProducto.objects.all().delete()
+        self.pedidos[0].delete()
+
+        self.assertFalse(VentaDiariaNegocio.objects.exists())
+        self.assertFalse(VentaDiariaProducto.objects.exists())
@@ -0,0 +1,55 @@
+import io
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+from ..models import Producto
+from ..utils.cache import clave_version
+from ..utils.importacion import ImportadorProductos, leer_filas
+from .datos import crear_negocio, crear_usuario
+
+URL = '/api/mi-negocio/productos/importar/'
+
+def csv_productos(filas, inicio=0):
+    lineas = ['nombre,precio,categoria,subcategoria']
+    lineas += [f'Importado {i},{i % 9 + 1},Categoría,Subcategoría' for i in range(inicio, inicio + filas)]
+    return ('\n'.join(lineas) + '\n').encode()
+
+class ImportacionTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.dueno = crear_usuario('dueno')
+        self.negocio = crear_negocio(dueno=self.dueno)
+        self.api = APIClient()
+        self.api.force_authenticate(self.dueno)
+
+    def test_error_de_lectura_a_mitad_conserva_lo_importado(self):
+        # Más de un bloque de lectura válido y después un byte que no es UTF-8
+        contenido = csv_productos(1000) + 'Café,1,Categoría,Subcategoría\n'.encode('latin-1')
+        version = cache.get(clave_version(self.negocio.slug))
+
+        resultado = ImportadorProductos(self.negocio, lote=100).importar(leer_filas(io.BytesIO(contenido), 'csv'))
+
+        self.assertIn('UTF-8', resultado['error'])
+        self.assertGreater(resultado['creados'], 0)
+        self.assertEqual(Producto.objects.filter(negocio=self.negocio).count(), resultado['creados'])
+        self.assertNotEqual(cache.get(clave_version(self.negocio.slug)), version)
+
+    def test_formato_no_valido(self):
+        respuesta = self.api.post(URL, {
+            'archivo': SimpleUploadedFile('productos.csv', csv_productos(2)),
+            'formato': 'xml',
+        }, format='multipart')
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertFalse(Producto.objects.exists())
+
+    def test_importa_y_actualiza(self):
+        respuesta = self.api.post(URL, {'archivo': SimpleUploadedFile('productos.csv', csv_productos(3))}, format='multipart')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()['creados'], 3)
+
+        respuesta = self.api.post(URL, {'archivo': SimpleUploadedFile('productos.csv', csv_productos(3, 1))}, format='multipart')
+        self.assertEqual((respuesta.json()['creados'], respuesta.json()['actualizados']), (1, 2))
+        self.assertEqual(Producto.objects.filter(negocio=self.negocio).count(), 4)
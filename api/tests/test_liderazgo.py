@@ -0,0 +1,46 @@
+from datetime import timedelta
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+from ..models import LiderScheduler
+from ..signals.licencia_signals import mantener_liderazgo, trabajo_programado
+from ..utils import liderazgo
+
+class LiderazgoTest(TestCase):
+
+    def setUp(self):
+        liderazgo._lider = False
+        liderazgo._expira = None
+        self.addCleanup(setattr, liderazgo, '_lider', False)
+
+    def test_deja_de_ser_lider_si_la_renovacion_falla(self):
+        mantener_liderazgo()
+        self.assertTrue(liderazgo.es_lider())
+
+        with mock.patch.object(LiderScheduler.objects, 'filter', side_effect=DatabaseError('sin conexión')), \
+                self.assertLogs('api.signals.licencia_signals', 'ERROR'):
+            mantener_liderazgo()
+
+        self.assertFalse(liderazgo.es_lider())
+
+    def test_deja_de_ser_lider_si_otro_proceso_tomo_la_concesion(self):
+        mantener_liderazgo()
+        LiderScheduler.objects.update(propietario='otro', expira=timezone.now() + timedelta(minutes=1))
+
+        mantener_liderazgo()
+
+        self.assertFalse(liderazgo.es_lider())
+
+    def test_el_liderazgo_caduca_con_la_concesion(self):
+        mantener_liderazgo()
+        liderazgo._expira = timezone.now() - timedelta(seconds=1)
+
+        self.assertFalse(liderazgo.es_lider())
+
+    def test_los_trabajos_cierran_las_conexiones_caducadas(self):
+        trabajo = mock.Mock(return_value='hecho')
+        with mock.patch('api.signals.licencia_signals.close_old_connections') as cerrar:
+            self.assertEqual(trabajo_programado(trabajo)(), 'hecho')
+
+        self.assertEqual(cerrar.call_count, 2)
@@ -0,0 +1,46 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+from ..utils import metricas
+from .datos import crear_negocio
+
+@override_settings(METRICAS_ACTIVAS=True)
+class MetricasTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        metricas.reiniciar()
+        self.addCleanup(metricas.reiniciar)
+
+    def test_mide_la_vista_sin_parchear_drf(self):
+        crear_negocio(productos=2)
+        self.client.get('/api/marketplace/negocios/')
+
+        datos = metricas.instantanea()['InfoNegocioViewSet.list']
+        self.assertEqual(datos['total_ms']['n'], 1)
+        self.assertEqual(datos['render_ms']['n'], 1)
+        self.assertLessEqual(datos['vista_ms']['suma'] + datos['render_ms']['suma'], datos['total_ms']['suma'])
+        self.assertFalse(hasattr(serializers.Serializer.data.fget, '_medido'))
+
+    def publicar_como(self, pid, ranura):
+        """Publica como si fuera otro proceso, con su propia ranura"""
+        with mock.patch.object(metricas.os, 'getpid', return_value=pid), \
+                mock.patch.object(metricas, '_ranura', ranura):
+            metricas.publicar_instantanea()
+            return metricas._ranura
+
+    def test_cada_proceso_publica_en_su_ranura(self):
+        ranuras = [self.publicar_como(pid, None) for pid in (101, 102, 103)]
+        self.assertEqual(len(set(ranuras)), 3)
+        self.assertEqual(len(metricas.instantaneas_compartidas()), 3)
+
+        # Una ranura caducada (proceso muerto) deja de contar y se puede reutilizar
+        cache.delete(metricas._clave_ranura(ranuras[0]))
+        self.assertEqual(len(metricas.instantaneas_compartidas()), 2)
+        self.assertEqual(self.publicar_como(104, None), ranuras[0])
+
+        # Si otro proceso ocupó su ranura caducada, el dueño anterior busca otra
+        self.assertNotEqual(self.publicar_como(101, ranuras[0]), ranuras[0])
+        self.assertEqual(len(metricas.instantaneas_compartidas()), 4)
+        self.assertEqual(len(metricas.instantaneas_compartidas(excluir_pid=101)), 3)
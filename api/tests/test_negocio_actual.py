@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APIClient
+from ..models import InfoNegocio
+from ..utils.negocio_actual import obtener_negocio_actual
+from .datos import crear_negocio, crear_usuario
+
+URL = '/api/mi-negocio/negocio/my_business/'
+
+class NegocioActualTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.dueno = crear_usuario('dueno')
+        self.negocio = crear_negocio(dueno=self.dueno)
+        self.api = APIClient()
+        self.api.force_authenticate(self.dueno)
+
+    def test_no_escribe_sobre_una_copia_vieja(self):
+        self.assertEqual(self.api.get(URL).status_code, 200)
+        # Cambio sin señales, como los que hace el worker de imágenes
+        InfoNegocio.objects.filter(pk=self.negocio.pk).update(telefono='55555555')
+
+        respuesta = self.api.patch(URL, {'descripcion': 'Nueva descripción'}, format='json')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.negocio.refresh_from_db()
+        self.assertEqual(self.negocio.telefono, '55555555')
+        self.assertEqual(self.negocio.descripcion, 'Nueva descripción')
+
+    def test_usuario_sin_negocio(self):
+        api = APIClient()
+        api.force_authenticate(crear_usuario('cliente'))
+        self.assertEqual(api.get(URL).status_code, 404)
+        self.assertEqual(api.get(URL).status_code, 404)
+
+    def test_una_consulta_por_peticion(self):
+        request = RequestFactory().get(URL)
+        request.user = self.dueno
+
+        with self.assertNumQueries(1):
+            self.assertEqual(obtener_negocio_actual(request), self.negocio)
+            self.assertEqual(obtener_negocio_actual(request), self.negocio)
+            # La licencia viene en la misma consulta
+            obtener_negocio_actual(request).licencia
@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from django.test import TestCase
+from ..models import TiendaTema
+from .datos import crear_negocio
+
+URL = '/api/marketplace/negocios/'
+
+class ListaNegociosTest(TestCase):
+    """El listado de tiendas no hace consultas por tienda (tema, productos, ubicación)"""
+
+    def crear_negocios(self, cantidad, inicio=0):
+        for i in range(inicio, inicio + cantidad):
+            TiendaTema.objects.create(negocio=crear_negocio(f'Tienda {i}', productos=2))
+
+    def consultas_lista(self):
+        cache.clear()
+        with self.assertNumQueries(2):
+            respuesta = self.client.get(URL, {'page_size': 50})
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.json()
+
+    def test_consultas_fijas(self):
+        self.crear_negocios(2)
+        self.assertEqual(self.consultas_lista()['count'], 2)
+
+        self.crear_negocios(20, inicio=2)
+        datos = self.consultas_lista()
+
+        self.assertEqual(datos['count'], 22)
+        negocio = datos['results'][0]
+        self.assertEqual(negocio['cantidad_productos'], 2)
+        self.assertEqual(negocio['ubicacion'], {'provincia': 'La Habana', 'municipio': 'Playa'})
+        self.assertIsNotNone(negocio['tema'])
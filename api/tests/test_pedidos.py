@@ -0,0 +1,30 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from ..models import Producto
+from ..utils.pedidos import crear_pedido
+from .datos import DATOS_PEDIDO, crear_negocio
+
+LINEAS = 50
+
+class CrearPedidoConsultasTest(TestCase):
+    """Crear un pedido usa un número fijo de consultas, tenga las líneas que tenga"""
+
+    def setUp(self):
+        negocio = crear_negocio(productos=LINEAS, stock=100)
+        self.productos = list(Producto.objects.filter(negocio=negocio).values_list('id', flat=True))
+
+    def consultas(self, productos):
+        with CaptureQueriesContext(connection) as capturadas:
+            crear_pedido(dict(DATOS_PEDIDO), [{'producto_id': producto_id, 'cantidad': 1} for producto_id in productos])
+        return len(capturadas.captured_queries)
+
+    def test_no_crece_con_las_lineas(self):
+        # El primero crea las filas de acumulados del día: unas pocas consultas más, fijas
+        primero = self.consultas(self.productos)
+        una_linea = self.consultas(self.productos[:1])
+        cincuenta = self.consultas(self.productos)
+
+        self.assertEqual(cincuenta, una_linea)
+        self.assertLessEqual(primero, una_linea + 5)
+        self.assertLessEqual(cincuenta, 15)
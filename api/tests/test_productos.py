@@ -0,0 +1,75 @@
+from django import forms
+from django.test import TestCase
+from ..models import Producto, ProductoToken, Subcategoria
+from ..utils.busqueda import buscar_productos
+from .datos import crear_negocio
+
+class ProductoForm(forms.ModelForm):
+    class Meta:
+        model = Producto
+        fields = ['nombre', 'descripcion', 'precio', 'stock', 'descuento', 'subcategoria', 'activo']
+
+class NombreDuplicadoTest(TestCase):
+
+    def setUp(self):
+        self.negocio = crear_negocio(productos=1)
+        self.subcategoria = Subcategoria.objects.get(categoria__negocio=self.negocio)
+        self.existente = Producto.objects.get(negocio=self.negocio)
+
+    def datos(self, nombre):
+        return {
+            'nombre': nombre, 'descripcion': 'Descripción', 'precio': '5', 'stock': 1,
+            'descuento': 0, 'subcategoria': self.subcategoria.pk, 'activo': True,
+        }
+
+    def test_formulario_nuevo_detecta_el_duplicado(self):
+        # negocio no es editable: el formulario no lo trae y clean() lo deduce
+        form = ProductoForm(data=self.datos(self.existente.nombre.upper()))
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('nombre', form.errors)
+
+    def test_formulario_nuevo_valido(self):
+        form = ProductoForm(data=self.datos('Otro producto'))
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.save().negocio, self.negocio)
+
+    def test_mismo_nombre_en_otro_negocio(self):
+        otro = crear_negocio('Otra tienda', productos=0)
+        subcategoria = Subcategoria.objects.get(categoria__negocio=otro)
+        form = ProductoForm(data=dict(self.datos(self.existente.nombre), subcategoria=subcategoria.pk))
+
+        self.assertTrue(form.is_valid(), form.errors)
+
+class IndiceBusquedaTest(TestCase):
+    """Los caminos que no pasan por save() también mantienen los tokens"""
+
+    def setUp(self):
+        self.negocio = crear_negocio(productos=2)
+        self.productos = Producto.objects.filter(negocio=self.negocio)
+
+    def buscar(self, texto):
+        return set(buscar_productos(self.productos, texto).values_list('pk', flat=True))
+
+    def test_update_reindexa(self):
+        primero = self.productos.first()
+        # El filtro deja de cumplirse tras la actualización: los ids se leen antes
+        Producto.objects.filter(nombre=primero.nombre).update(nombre='Guayabera de lino')
+
+        self.assertEqual(self.buscar('guayaberas'), {primero.pk})
+        self.assertFalse(ProductoToken.objects.filter(producto=primero, token='tienda').exists())
+
+    def test_bulk_update_reindexa(self):
+        productos = list(self.productos)
+        for producto in productos:
+            producto.descripcion = 'Mermelada casera'
+        Producto.objects.bulk_update(productos, ['descripcion'])
+
+        self.assertEqual(self.buscar('mermelada'), {producto.pk for producto in productos})
+
+    def test_update_sin_campos_indexados_no_toca_tokens(self):
+        antes = list(ProductoToken.objects.order_by('pk').values_list('pk', flat=True))
+        self.productos.update(stock=0)
+
+        self.assertEqual(list(ProductoToken.objects.order_by('pk').values_list('pk', flat=True)), antes)
@@ -0,0 +1,159 @@
+import threading
+import time
+from unittest import mock
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from ..models import Pedido, Producto
+from ..utils.pedidos import crear_pedido
+from ..utils.reservas import cancelar_pedido
+from .datos import DATOS_PEDIDO, crear_negocio, crear_usuario
+
+HILOS = 20
+ESPERA_MAXIMA = 30  # segundos reintentando un bloqueo antes de rendirse
+
+def en_paralelo(funcion, hilos=HILOS):
+    """
+    Lanza `funcion` en varios hilos a la vez y devuelve lo que devolvió cada
+    uno (o la excepción). Los errores de bloqueo se reintentan: SQLite no
+    admite escrituras simultáneas y las rechaza en lugar de esperar.
+    """
+    barrera = threading.Barrier(hilos)
+    resultados = []
+
+    def ejecutar():
+        try:
+            barrera.wait()
+            limite = time.monotonic() + ESPERA_MAXIMA
+            while True:
+                try:
+                    resultados.append(funcion())
+                    break
+                except OperationalError as e:
+                    if time.monotonic() > limite:
+                        resultados.append(e)
+                        break
+                    time.sleep(0.01)
+        except Exception as e:
+            resultados.append(e)
+        finally:
+            connection.close()
+
+    lanzados = [threading.Thread(target=ejecutar) for _ in range(hilos)]
+    for hilo in lanzados:
+        hilo.start()
+    for hilo in lanzados:
+        hilo.join()
+    return resultados
+
+class ReservaConcurrenteTest(TransactionTestCase):
+    """Pedidos y cancelaciones simultáneos sobre el mismo producto"""
+
+    def setUp(self):
+        self.negocio = crear_negocio(productos=1, stock=5)
+        self.producto = Producto.objects.get(negocio=self.negocio)
+
+    def test_no_se_vende_mas_stock_del_disponible(self):
+        resultados = en_paralelo(lambda: crear_pedido(
+            dict(DATOS_PEDIDO), [{'producto_id': self.producto.id, 'cantidad': 1}]
+        ))
+        # Un hilo puede fallar tras confirmar (y su reintento ver el stock agotado):
+        # lo que cuenta es lo que quedó en la base de datos
+        fallos = [r for r in resultados if not isinstance(r, Pedido)]
+
+        self.producto.refresh_from_db()
+        self.assertTrue(all(isinstance(f, ValidationError) for f in fallos), fallos)
+        self.assertEqual(self.producto.stock, 0)
+        self.assertEqual(Pedido.objects.count(), 5)
+
+    def test_cancelaciones_simultaneas_devuelven_el_stock_una_vez(self):
+        pedido = crear_pedido(dict(DATOS_PEDIDO), [{'producto_id': self.producto.id, 'cantidad': 3}])
+        en_paralelo(lambda: cancelar_pedido(pedido), hilos=10)
+
+        self.producto.refresh_from_db()
+        pedido.refresh_from_db()
+        self.assertEqual(pedido.estado, 'cancelado')
+        self.assertEqual(self.producto.stock, 5)
+
+class EstadoPedidoTest(TestCase):
+
+    def setUp(self):
+        self.dueno = crear_usuario('dueno')
+        self.negocio = crear_negocio(productos=1, stock=5, dueno=self.dueno)
+        self.producto = Producto.objects.get(negocio=self.negocio)
+        self.cliente = crear_usuario('cliente')
+        self.pedido = crear_pedido(
+            dict(DATOS_PEDIDO, email_cliente=self.cliente.email, user=self.cliente),
+            [{'producto_id': self.producto.id, 'cantidad': 2}]
+        )
+
+    def actualizar_estado(self, estado):
+        api = APIClient()
+        api.force_authenticate(self.dueno)
+        return api.patch(
+            f'/api/mi-negocio/pedidos-admin/{self.pedido.id}/actualizar_estado/',
+            {'estado': estado},
+            format='json'
+        )
+
+    def test_un_pedido_cancelado_no_se_reabre(self):
+        self.assertEqual(self.actualizar_estado('cancelado').status_code, 200)
+        for estado in ('pendiente', 'confirmado', 'entregado'):
+            respuesta = self.actualizar_estado(estado)
+            self.assertEqual(respuesta.status_code, 400)
+            self.assertIn('error', respuesta.json())
+
+        self.pedido.refresh_from_db()
+        self.producto.refresh_from_db()
+        self.assertEqual(self.pedido.estado, 'cancelado')
+        self.assertEqual(self.producto.stock, 5)
+
+    def test_cancelar_solo_pedidos_pendientes(self):
+        self.assertEqual(self.actualizar_estado('confirmado').status_code, 200)
+        api = APIClient()
+        api.force_authenticate(self.cliente)
+        respuesta = api.post(f'/api/pedidos/{self.pedido.id}/cancelar/')
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.producto.refresh_from_db()
+        self.assertEqual(self.producto.stock, 3)
+
+    def test_no_se_crea_un_pedido_cancelado(self):
+        api = APIClient()
+        api.force_authenticate(self.dueno)
+        respuesta = api.post('/api/mi-negocio/pedidos-admin/', dict(
+            DATOS_PEDIDO, estado='cancelado', productos=[{'producto_id': self.producto.id, 'cantidad': 1}]
+        ), format='json')
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.producto.refresh_from_db()
+        self.assertEqual(self.producto.stock, 3)
+        self.assertEqual(Pedido.objects.count(), 1)
+
+    def test_el_estado_no_cambia_por_put_patch_ni_delete(self):
+        api = APIClient()
+        api.force_authenticate(self.dueno)
+        url = f'/api/mi-negocio/pedidos-admin/{self.pedido.id}/'
+
+        self.assertEqual(api.patch(url, {'estado': 'cancelado'}, format='json').status_code, 405)
+        self.assertEqual(api.put(url, {'estado': 'cancelado'}, format='json').status_code, 405)
+        self.assertEqual(api.delete(url).status_code, 405)
+        self.assertEqual(api.get(url).status_code, 200)
+        self.pedido.refresh_from_db()
+        self.producto.refresh_from_db()
+        self.assertEqual(self.pedido.estado, 'pendiente')
+        self.assertEqual(self.producto.stock, 3)
+
+    def test_un_fallo_al_invalidar_la_cache_no_rompe_el_pedido(self):
+        api = APIClient()
+        api.force_authenticate(self.cliente)
+        with mock.patch('api.utils.reservas.invalidar_catalogo', side_effect=ConnectionError('cache caída')), \
+                self.assertLogs('api.utils.reservas', 'ERROR'), \
+                self.captureOnCommitCallbacks(execute=True):
+            respuesta = api.post('/api/pedidos/', dict(
+                DATOS_PEDIDO, productos=[{'producto_id': self.producto.id, 'cantidad': 1}]
+            ), format='json')
+
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(Pedido.objects.count(), 2)
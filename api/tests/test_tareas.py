@@ -0,0 +1,28 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from ..models.tarea_models import Tarea
+from ..utils.tareas import recuperar_tareas_atascadas
+
+@override_settings(TAREA_TIMEOUT_MINUTOS=30)
+class TareasAtascadasTest(TestCase):
+
+    def crear_tarea(self, minutos, intentos=0):
+        tarea = Tarea.objects.create(tipo='eliminar_archivo', datos={'nombre': 'x'}, estado='en_proceso', intentos=intentos)
+        # updated_at es auto_now: se fija con update()
+        Tarea.objects.filter(pk=tarea.pk).update(updated_at=timezone.now() - timedelta(minutes=minutos))
+        return tarea
+
+    def test_recupera_solo_las_abandonadas(self):
+        abandonada = self.crear_tarea(minutos=45)
+        en_curso = self.crear_tarea(minutos=5)
+        agotada = self.crear_tarea(minutos=45, intentos=2)
+
+        with self.assertLogs('api.utils.tareas', 'WARNING'):
+            self.assertEqual(recuperar_tareas_atascadas(), 2)
+
+        estados = dict(Tarea.objects.values_list('pk', 'estado'))
+        self.assertEqual(estados[abandonada.pk], 'pendiente')
+        self.assertEqual(estados[en_curso.pk], 'en_proceso')
+        self.assertEqual(estados[agotada.pk], 'fallida')
+        self.assertEqual(Tarea.objects.get(pk=abandonada.pk).intentos, 1)
@@ -8,6 +8,8 @@ from .admin_urls import *
 from .admin_urls.admin_negocio import *
 from .admin_urls.admin_categorias import *
 from .admin_urls.admin_productos import *
+from ..views.admin_views.cache_admin import estadisticas_cache
+from ..views.admin_views.metricas_admin import metricas
 
 # Vista home simple
 @api_view(['GET'])
@@ -48,4 +50,6 @@ urlpatterns = [
 
     # URLs de administración
     path('mi-negocio/', include(admin_urls)),
+    path('cache/estadisticas/', estadisticas_cache, name='cache-estadisticas'),
+    path('metrics/', metricas, name='metricas'),
 ] 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from ...views.admin_views.negocio_admin import AdminNegocioViewSet
+from ...views.admin_views.estadisticas_admin import EstadisticasNegocioView
 
 router = DefaultRouter()
 router.register('negocio', AdminNegocioViewSet, basename='admin-negocio')
@@ -8,4 +9,5 @@ router.register('negocio', AdminNegocioViewSet, basename='admin-negocio')
 urlpatterns = [
     path('', include(router.urls)),
     path('resumen/', AdminNegocioViewSet.as_view({'get': 'get_resumen'}), name='admin-resumen'),
+    path('estadisticas/', EstadisticasNegocioView.as_view(), name='admin-estadisticas'),
 ] 
\ No newline at end of file
@@ -0,0 +1,101 @@
+import hashlib
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db.models import OuterRef, Subquery
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from ..models import NegocioUser
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _clave_token(key):
+    # No se guarda el token en claro en la clave de caché
+    return f'auth_token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+def invalidar_token(key):
+    cache.delete(_clave_token(key))
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication que guarda token -> id de usuario en la caché durante
+    TOKEN_CACHE_TIMEOUT segundos. El usuario se carga en cada petición por
+    clave primaria: request.user nunca es una copia vieja que una vista pueda
+    volver a guardar. La señal de Token invalida la entrada al cerrar sesión
+    o rotar el token; con la caché locmem la invalidación es local al proceso
+    y en el resto de workers la entrada caduca como mucho tras el timeout.
+    """
+
+    def authenticate_credentials(self, key):
+        clave = _clave_token(key)
+        user_id = cache.get(clave)
+        if user_id is not None:
+            user = User.objects.filter(pk=user_id, is_active=True).first()
+            if user is not None:
+                return (user, Token(key=key, user=user))
+        # Valida el token y que el usuario esté activo
+        user, token = super().authenticate_credentials(key)
+        cache.set(clave, user.pk, settings.TOKEN_CACHE_TIMEOUT)
+        return (user, token)
+
+def _negocio_usuario(campo):
+    return Subquery(
+        NegocioUser.objects.filter(user=OuterRef('pk')).order_by('id').values(campo)[:1]
+    )
+
+class EmailOrUsernameBackend(ModelBackend):
+    """
+    Autentica por email (si el identificador contiene @) o por username con
+    una sola consulta indexada, que además trae el token y el resumen del
+    negocio para que el login no necesite más lecturas. Donde la migración
+    0026 no pudo crear el índice único de email (MariaDB) un email puede
+    repetirse: en ese caso se rechaza el login en lugar de elegir una cuenta.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        campo = 'email' if '@' in username else 'username'
+        usuarios = list(User.objects.select_related('auth_token').annotate(
+            login_negocio_id=_negocio_usuario('negocio_id'),
+            login_negocio_nombre=_negocio_usuario('negocio__nombre'),
+            login_negocio_slug=_negocio_usuario('negocio__slug')
+        ).filter(**{campo: username}).order_by('id')[:2])
+
+        if len(usuarios) > 1:
+            # PermissionDenied detiene authenticate() sin probar otros backends
+            logger.error(f"Login rechazado: hay varias cuentas con el email {username}")
+            raise PermissionDenied('Hay varias cuentas con ese email')
+        user = usuarios[0] if usuarios else None
+        if user is None:
+            # Igualar el tiempo de respuesta con el de un usuario existente
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+def resumen_negocio_login(user):
+    """Resumen del negocio del usuario, reutilizando lo que trajo el backend de login"""
+    if hasattr(user, 'login_negocio_id'):
+        if user.login_negocio_id is None:
+            return None
+        return {
+            'id': user.login_negocio_id,
+            'nombre': user.login_negocio_nombre,
+            'slug': user.login_negocio_slug
+        }
+    negocio_user = NegocioUser.objects.select_related('negocio').filter(user=user).first()
+    if not negocio_user:
+        return None
+    return {
+        'id': negocio_user.negocio.id,
+        'nombre': negocio_user.negocio.nombre,
+        'slug': negocio_user.negocio.slug
+    }
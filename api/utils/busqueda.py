@@ -0,0 +1,101 @@
+import re
+import unicodedata
+from django.db.models import Q, Sum
+
+# Palabras vacías del español que no aportan a la búsqueda
+STOPWORDS = {
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'lo', 'los',
+    'o', 'para', 'por', 'sin', 'su', 'sus', 'un', 'una', 'unos', 'unas', 'y'
+}
+
+# Peso de cada campo en la relevancia
+PESO_NOMBRE = 3
+PESO_DESCRIPCION = 1
+
+TOKEN_MAX_LENGTH = 50
+
+# Productos por consulta al reindexar en bloque
+LOTE_INDEXACION = 500
+
+def normalizar_texto(texto):
+    """Pasa a minúsculas y elimina tildes y diéresis (café -> cafe)"""
+    texto = unicodedata.normalize('NFKD', texto or '').lower()
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+def _raiz(palabra):
+    """Reduce plurales simples para que 'zapatos' y 'zapato' coincidan"""
+    if len(palabra) > 4 and palabra.endswith('es'):
+        return palabra[:-2]
+    if len(palabra) > 3 and palabra.endswith('s'):
+        return palabra[:-1]
+    return palabra
+
+def tokenizar(texto):
+    """Devuelve la lista de tokens normalizados de un texto"""
+    tokens = []
+    for palabra in re.split(r'[^a-z0-9]+', normalizar_texto(texto)):
+        if len(palabra) < 2 or palabra in STOPWORDS:
+            continue
+        tokens.append(_raiz(palabra)[:TOKEN_MAX_LENGTH])
+    return tokens
+
+def tokens_producto(nombre, descripcion):
+    """Calcula el peso de cada token de un producto a partir de nombre y descripción"""
+    pesos = {}
+    for token in tokenizar(nombre):
+        pesos[token] = pesos.get(token, 0) + PESO_NOMBRE
+    for token in tokenizar(descripcion):
+        pesos[token] = pesos.get(token, 0) + PESO_DESCRIPCION
+    return pesos
+
+def indexar_producto(producto):
+    """Reconstruye los tokens de búsqueda de un producto"""
+    from ..models import ProductoToken
+
+    ProductoToken.objects.filter(producto=producto).delete()
+    ProductoToken.objects.bulk_create([
+        ProductoToken(producto=producto, token=token, peso=peso)
+        for token, peso in tokens_producto(producto.nombre, producto.descripcion).items()
+    ])
+
+def reindexar_productos(ids):
+    """
+    Reconstruye los tokens de varios productos por lotes. Es el camino para
+    todo lo que no pasa por save() (update(), bulk_update, bulk_create).
+    Devuelve el número de tokens creados.
+    """
+    from ..models import Producto, ProductoToken
+
+    ids = list(ids)
+    creados = 0
+    for inicio in range(0, len(ids), LOTE_INDEXACION):
+        lote = ids[inicio:inicio + LOTE_INDEXACION]
+        productos = Producto.objects.filter(pk__in=lote).values_list(
+            'id', 'nombre', 'descripcion'
+        )
+        tokens = [
+            ProductoToken(producto_id=pk, token=token, peso=peso)
+            for pk, nombre, descripcion in productos
+            for token, peso in tokens_producto(nombre, descripcion).items()
+        ]
+        ProductoToken.objects.filter(producto_id__in=lote).delete()
+        ProductoToken.objects.bulk_create(tokens, batch_size=LOTE_INDEXACION)
+        creados += len(tokens)
+    return creados
+
+def buscar_productos(queryset, texto):
+    """
+    Filtra un queryset de productos usando el índice de tokens y lo anota
+    con `relevancia`. Cada término se busca por prefijo, lo que aprovecha el
+    índice sobre `token` en MySQL y funciona igual en SQLite.
+    """
+    tokens = tokenizar(texto)
+    if not tokens:
+        # Solo palabras vacías o símbolos: búsqueda simple por nombre
+        return queryset.filter(nombre__icontains=texto)
+
+    condicion = Q()
+    for token in set(tokens):
+        condicion |= Q(tokens__token__startswith=token)
+
+    return queryset.filter(condicion).annotate(relevancia=Sum('tokens__peso'))
@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+PREFIJO = 'catalogo'
+
+# Contadores de aciertos/fallos por endpoint (locales al proceso)
+_contadores = {}
+_contadores_lock = threading.Lock()
+
+def clave_version(slug=None):
+    """Clave de versión global del catálogo o de un negocio concreto"""
+    if slug:
+        return f'{PREFIJO}:version:{slug}'
+    return f'{PREFIJO}:version'
+
+def obtener_versiones(claves):
+    """Lee las versiones indicadas, inicializando las que no existan"""
+    versiones = cache.get_many(claves)
+    faltantes = {clave: time.time_ns() for clave in claves if clave not in versiones}
+    if faltantes:
+        cache.set_many(faltantes, None)
+        versiones.update(faltantes)
+    return [versiones[clave] for clave in claves]
+
+def invalidar_catalogo(slug=None):
+    """
+    Invalida el catálogo global y, si se indica, el de un negocio. Las
+    versiones son marcas de tiempo, así que una clave expulsada de la caché
+    nunca vuelve a coincidir con respuestas antiguas.
+    """
+    nuevas = {clave_version(): time.time_ns()}
+    if slug:
+        nuevas[clave_version(slug)] = time.time_ns()
+    cache.set_many(nuevas, None)
+
+def _registrar(endpoint, resultado):
+    with _contadores_lock:
+        contador = _contadores.setdefault(endpoint, {'hits': 0, 'misses': 0})
+        contador[resultado] += 1
+
+def estadisticas_cache():
+    """Devuelve los aciertos y fallos de caché por endpoint"""
+    with _contadores_lock:
+        return {endpoint: dict(contador) for endpoint, contador in _contadores.items()}
+
+def _clave_respuesta(endpoint, request, versiones, kwargs):
+    # Parámetros normalizados: ordenados y sin valores vacíos
+    parametros = sorted(
+        (clave, valor)
+        for clave in request.query_params
+        for valor in request.query_params.getlist(clave)
+        if valor != ''
+    )
+    base = '|'.join([
+        f'{request.scheme}://{request.get_host()}',
+        urlencode(sorted((k, str(v)) for k, v in kwargs.items())),
+        urlencode(parametros),
+    ])
+    resumen = hashlib.md5(base.encode()).hexdigest()
+    version = '.'.join(str(v) for v in versiones)
+    return f'{PREFIJO}:{endpoint}:{version}:{resumen}'
+
+def cachear_respuesta(endpoint, alcance='global', timeout=None):
+    """
+    Cachea el JSON de una vista GET pública.
+
+    `alcance` indica de qué versión depende la respuesta: 'global' (todo el
+    catálogo), 'negocio' (la tienda del `slug` de la URL) o None para datos
+    estáticos que no se invalidan.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            # Sirve tanto para métodos de ViewSet como para vistas de función
+            request = args[0] if hasattr(args[0], 'query_params') else args[1]
+            if request.method != 'GET':
+                return vista(*args, **kwargs)
+
+            if alcance == 'negocio':
+                versiones = obtener_versiones([clave_version(kwargs.get('slug'))])
+            elif alcance == 'global':
+                versiones = obtener_versiones([clave_version()])
+            else:
+                versiones = []
+
+            clave = _clave_respuesta(endpoint, request, versiones, kwargs)
+            contenido = cache.get(clave)
+            if contenido is not None:
+                _registrar(endpoint, 'hits')
+                response = HttpResponse(contenido, content_type='application/json')
+                response['X-Cache'] = 'HIT'
+                return response
+
+            _registrar(endpoint, 'misses')
+            response = vista(*args, **kwargs)
+            if response.status_code == 200 and getattr(response, 'data', None) is not None:
+                cache.set(
+                    clave,
+                    JSONRenderer().render(response.data),
+                    timeout or settings.CATALOGO_CACHE_TIMEOUT
+                )
+            response['X-Cache'] = 'MISS'
+            return response
+        return envoltura
+    return decorador
@@ -0,0 +1,245 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+from ..models import (
+    InfoNegocio, NegocioUser, TiendaTema, Categoria, Subcategoria,
+    Producto, Pedido, PedidoProducto
+)
+from .busqueda import reindexar_productos
+from .cache import invalidar_catalogo
+from .estadisticas import reconstruir_estadisticas
+from .licencias import crear_licencias_faltantes
+from .ubicaciones_cuba import PROVINCIAS, get_municipios
+
+# Todo lo generado lleva estos prefijos para poder borrarlo sin tocar datos reales
+PREFIJO_SLUG = 'sintetico-'
+PREFIJO_USUARIO = 'sintetico_'
+MARCA_PEDIDO = 'sintetico:'
+CONTRASENA = 'sintetico123'
+
+LOTE = 1000
+CENTIMO = Decimal('0.01')
+
+# Vocabulario reducido para que las búsquedas encuentren coincidencias reales
+SUSTANTIVOS = (
+    'camisa', 'pantalon', 'zapato', 'bolso', 'reloj', 'gorra', 'vestido', 'arroz',
+    'cafe', 'aceite', 'jabon', 'perfume', 'telefono', 'cargador', 'audifono', 'lampara',
+    'silla', 'mesa', 'ventilador', 'olla', 'cuchillo', 'toalla', 'sabana', 'juguete',
+)
+ADJETIVOS = (
+    'rojo', 'azul', 'negro', 'blanco', 'grande', 'pequeno', 'clasico', 'moderno',
+    'premium', 'economico', 'importado', 'artesanal', 'deportivo', 'infantil',
+)
+CATEGORIAS = (
+    'Ropa', 'Calzado', 'Alimentos', 'Higiene', 'Electronica', 'Hogar',
+    'Cocina', 'Juguetes', 'Accesorios', 'Belleza', 'Deportes', 'Ferreteria',
+)
+PALABRAS_DESCRIPCION = SUSTANTIVOS + ADJETIVOS + (
+    'calidad', 'garantia', 'oferta', 'nuevo', 'original', 'resistente', 'ligero',
+    'comodo', 'practico', 'duradero', 'envio', 'disponible',
+)
+
+
+def _lotes(objetos):
+    for inicio in range(0, len(objetos), LOTE):
+        yield objetos[inicio:inicio + LOTE]
+
+
+def limpiar_catalogo():
+    """Elimina los negocios, usuarios y pedidos generados por generar_catalogo"""
+    negocios = InfoNegocio.objects.filter(slug__startswith=PREFIJO_SLUG)
+    with transaction.atomic():
+        # Los pedidos protegen a negocios y productos, hay que borrarlos antes
+        Pedido.objects.filter(negocio__in=negocios).delete()
+        # Borrado por queryset: las imágenes son las compartidas por defecto
+        cantidad, _ = negocios.delete()
+        User.objects.filter(username__startswith=PREFIJO_USUARIO).delete()
+    invalidar_catalogo()
+    return cantidad
+
+
+def generar_catalogo(negocios=5, categorias=4, subcategorias=3, productos=10,
+                     pedidos=20, lineas=3, semilla=1):
+    """
+    Genera un catálogo sintético determinista: `negocios` tiendas, cada una con
+    `categorias` categorías de `subcategorias` subcategorías con `productos`
+    productos, y `pedidos` pedidos de hasta `lineas` productos por tienda.
+    Con la misma semilla genera siempre los mismos datos. Usa bulk_create y
+    vuelve a leer los ids para funcionar también en MySQL.
+    """
+    if InfoNegocio.objects.filter(slug__startswith=PREFIJO_SLUG).exists():
+        raise ValueError('Ya existe un catálogo sintético')
+
+    rng = random.Random(semilla)
+    ahora = timezone.now()
+    categorias = min(categorias, len(CATEGORIAS))
+
+    with transaction.atomic():
+        # Negocios, temas, licencias y un dueño por negocio
+        nuevos = []
+        for i in range(negocios):
+            provincia = rng.choice(PROVINCIAS)
+            nuevos.append(InfoNegocio(
+                nombre=f'Tienda sintética {i:05d}',
+                slug=f'{PREFIJO_SLUG}{i:05d}',
+                provincia=provincia,
+                municipio=rng.choice(get_municipios(provincia)),
+                hace_domicilio=rng.random() < 0.5,
+                acepta_transferencia=rng.random() < 0.5,
+            ))
+        InfoNegocio.objects.bulk_create(nuevos, batch_size=LOTE)
+        ids_negocio = dict(
+            InfoNegocio.objects.filter(slug__startswith=PREFIJO_SLUG).values_list('slug', 'id')
+        )
+        ids_negocio = [ids_negocio[negocio.slug] for negocio in nuevos]
+
+        TiendaTema.objects.bulk_create(
+            [TiendaTema(negocio_id=negocio_id) for negocio_id in ids_negocio], batch_size=LOTE
+        )
+        crear_licencias_faltantes()
+
+        # Un único hash para todos: make_password es deliberadamente lento
+        contrasena = make_password(CONTRASENA)
+        User.objects.bulk_create([
+            User(
+                username=f'{PREFIJO_USUARIO}{i:05d}',
+                email=f'{PREFIJO_USUARIO}{i:05d}@ejemplo.com',
+                password=contrasena,
+            )
+            for i in range(negocios)
+        ], batch_size=LOTE)
+        ids_usuario = dict(
+            User.objects.filter(username__startswith=PREFIJO_USUARIO).values_list('username', 'id')
+        )
+        NegocioUser.objects.bulk_create([
+            NegocioUser(user_id=ids_usuario[f'{PREFIJO_USUARIO}{i:05d}'], negocio_id=negocio_id)
+            for i, negocio_id in enumerate(ids_negocio)
+        ], batch_size=LOTE)
+
+        # Categorías y subcategorías
+        Categoria.objects.bulk_create([
+            Categoria(negocio_id=negocio_id, nombre=CATEGORIAS[j])
+            for negocio_id in ids_negocio
+            for j in range(categorias)
+        ], batch_size=LOTE)
+        ids_categoria = {
+            (negocio_id, nombre): pk
+            for pk, negocio_id, nombre in Categoria.objects.filter(
+                negocio__slug__startswith=PREFIJO_SLUG
+            ).values_list('id', 'negocio_id', 'nombre')
+        }
+        Subcategoria.objects.bulk_create([
+            Subcategoria(categoria_id=ids_categoria[negocio_id, CATEGORIAS[j]], nombre=f'{CATEGORIAS[j]} {k + 1}')
+            for negocio_id in ids_negocio
+            for j in range(categorias)
+            for k in range(subcategorias)
+        ], batch_size=LOTE)
+        subcategorias_por_negocio = {negocio_id: [] for negocio_id in ids_negocio}
+        for pk, negocio_id in Subcategoria.objects.filter(
+            categoria__negocio__slug__startswith=PREFIJO_SLUG
+        ).order_by('id').values_list('id', 'categoria__negocio_id'):
+            subcategorias_por_negocio[negocio_id].append(pk)
+
+        # Productos con negocio_id explícito (bulk_create no pasa por save)
+        nuevos = []
+        for negocio_id in ids_negocio:
+            for subcategoria_id in subcategorias_por_negocio[negocio_id]:
+                for _ in range(productos):
+                    numero = len(nuevos) + 1
+                    nuevos.append(Producto(
+                        nombre=f'{rng.choice(SUSTANTIVOS).capitalize()} {rng.choice(ADJETIVOS)} {numero}',
+                        descripcion=' '.join(rng.choices(PALABRAS_DESCRIPCION, k=12)),
+                        precio=Decimal(rng.randint(100, 500000)) / 100,
+                        stock=rng.randint(50, 5000),
+                        descuento=rng.choice((0, 0, 0, 5, 10, 25)),
+                        activo=rng.random() < 0.95,
+                        subcategoria_id=subcategoria_id,
+                        negocio_id=negocio_id,
+                    ))
+        for lote in _lotes(nuevos):
+            Producto.objects.bulk_create(lote)
+        productos_por_negocio = {negocio_id: [] for negocio_id in ids_negocio}
+        creados = Producto.objects.filter(negocio__slug__startswith=PREFIJO_SLUG).order_by('id').only(
+            'id', 'nombre', 'descripcion', 'precio', 'descuento', 'activo', 'imagen', 'negocio_id'
+        )
+        ids_producto = []
+        for producto in creados.iterator(chunk_size=LOTE):
+            ids_producto.append(producto.id)
+            if producto.activo:
+                productos_por_negocio[producto.negocio_id].append(producto)
+        tokens = reindexar_productos(ids_producto)
+
+        # Pedidos repartidos en los últimos 90 días
+        nuevos = []
+        lineas_por_pedido = []
+        estados = [estado for estado, _ in Pedido.ESTADO_CHOICES]
+        metodos = [metodo for metodo, _ in Pedido.METODO_PAGO_CHOICES]
+        for i, negocio_id in enumerate(ids_negocio):
+            catalogo = productos_por_negocio[negocio_id]
+            if not catalogo:
+                continue
+            for j in range(pedidos):
+                cliente = rng.randint(1, max(1, negocios * 10))
+                elegidos = rng.sample(catalogo, min(len(catalogo), rng.randint(1, lineas)))
+                items = [
+                    (producto, rng.randint(1, 5), producto.precio_con_descuento.quantize(CENTIMO))
+                    for producto in elegidos
+                ]
+                nuevos.append(Pedido(
+                    nombre_cliente=f'Cliente {cliente}',
+                    email_cliente=f'cliente{cliente}@ejemplo.com',
+                    telefono_cliente=f'5{cliente:07d}',
+                    direccion_entrega=f'Calle {rng.randint(1, 200)} #{rng.randint(1, 999)}',
+                    negocio_id=negocio_id,
+                    estado=rng.choice(estados),
+                    metodo_pago=rng.choice(metodos),
+                    nota_vendedor=f'{MARCA_PEDIDO}{i}:{j}',
+                    total=sum(cantidad * precio for _, cantidad, precio in items),
+                ))
+                lineas_por_pedido.append(items)
+        for lote in _lotes(nuevos):
+            Pedido.objects.bulk_create(lote)
+        ids_pedido = dict(
+            Pedido.objects.filter(negocio__slug__startswith=PREFIJO_SLUG).values_list('nota_vendedor', 'id')
+        )
+
+        items = []
+        fechas = []
+        for pedido, lineas_pedido in zip(nuevos, lineas_por_pedido):
+            pedido_id = ids_pedido[pedido.nota_vendedor]
+            fechas.append((pedido_id, ahora - timedelta(minutes=rng.randint(0, 90 * 24 * 60))))
+            items.extend(
+                PedidoProducto(
+                    pedido_id=pedido_id, producto_id=producto.id, cantidad=cantidad,
+                    precio_unitario=precio, subtotal=cantidad * precio,
+                    producto_nombre=producto.nombre, producto_imagen=producto.imagen.name or ''
+                )
+                for producto, cantidad, precio in lineas_pedido
+            )
+        for lote in _lotes(items):
+            PedidoProducto.objects.bulk_create(lote)
+
+        # auto_now_add fija la fecha al crear; se reparte después con un UPDATE por lote
+        for lote in _lotes(fechas):
+            Pedido.objects.filter(id__in=[pedido_id for pedido_id, _ in lote]).update(
+                fecha_pedido=Case(*[When(id=pedido_id, then=Value(fecha)) for pedido_id, fecha in lote])
+            )
+
+        # Los pedidos se crearon en bloque: los acumulados de ventas se calculan al final
+        reconstruir_estadisticas(negocios=InfoNegocio.objects.filter(slug__startswith=PREFIJO_SLUG))
+
+    invalidar_catalogo()
+    return {
+        'negocios': len(ids_negocio),
+        'categorias': len(ids_categoria),
+        'subcategorias': sum(len(ids) for ids in subcategorias_por_negocio.values()),
+        'productos': creados.count(),
+        'tokens': tokens,
+        'pedidos': len(nuevos),
+        'lineas': len(items),
+    }
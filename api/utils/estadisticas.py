@@ -0,0 +1,178 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from ..models import Pedido, PedidoProducto, VentaDiariaNegocio, VentaDiariaProducto
+
+# Estados cuyos pedidos no cuentan como venta en las estadísticas por producto
+ESTADOS_SIN_VENTA = {'cancelado'}
+
+LOTE = 1000
+
+def fecha_local(momento):
+    """Día (en la zona horaria del sitio) al que se imputa un pedido"""
+    return timezone.localdate(momento)
+
+def inicio_del_dia(fecha):
+    return timezone.make_aware(datetime.combine(fecha, time.min))
+
+def _acumular(modelo, claves, crear=True, **incrementos):
+    """
+    Suma los incrementos a una fila con un UPDATE atómico y la crea si no
+    existe (salvo con `crear=False`)
+    """
+    expresiones = {campo: F(campo) + valor for campo, valor in incrementos.items()}
+    if modelo.objects.filter(**claves).update(**expresiones) or not crear:
+        return
+    try:
+        with transaction.atomic():
+            modelo.objects.create(**claves, **incrementos)
+    except IntegrityError:
+        # Otra transacción creó la fila entre el UPDATE y el INSERT
+        modelo.objects.filter(**claves).update(**expresiones)
+
+def _agrupar_lineas(lineas):
+    """{producto_id: [unidades, ingresos]} a partir de las líneas de un pedido"""
+    por_producto = {}
+    for linea in lineas:
+        acumulado = por_producto.setdefault(linea.producto_id, [0, Decimal('0')])
+        acumulado[0] += linea.cantidad
+        acumulado[1] += linea.subtotal
+    return por_producto
+
+def _acumular_productos(negocio_id, fecha, por_producto, signo, crear=True):
+    """
+    Suma las líneas de un pedido a los acumulados por producto del día con un
+    número fijo de consultas, tenga el pedido las líneas que tenga: las filas
+    que faltan se insertan a cero (ignorando las que otra transacción acabe de
+    crear) y todas se incrementan con un único bulk_update de expresiones F.
+    Con `crear=False` solo se tocan las filas que ya existen.
+    """
+    acumulados = VentaDiariaProducto.objects.filter(fecha=fecha, producto_id__in=por_producto.keys())
+    existentes = dict(acumulados.values_list('producto_id', 'pk'))
+    faltan = [producto_id for producto_id in por_producto if producto_id not in existentes]
+    if faltan and crear:
+        VentaDiariaProducto.objects.bulk_create([
+            VentaDiariaProducto(producto_id=producto_id, fecha=fecha, negocio_id=negocio_id)
+            for producto_id in faltan
+        ], ignore_conflicts=True)
+        # bulk_create no devuelve las claves en MySQL ni con ignore_conflicts
+        existentes.update(acumulados.filter(producto_id__in=faltan).values_list('producto_id', 'pk'))
+
+    filas = []
+    for producto_id, (unidades, ingresos) in por_producto.items():
+        if producto_id not in existentes:
+            continue
+        fila = VentaDiariaProducto(pk=existentes[producto_id])
+        fila.pedidos = F('pedidos') + signo
+        fila.unidades = F('unidades') + signo * unidades
+        fila.ingresos = F('ingresos') + signo * ingresos
+        filas.append(fila)
+    VentaDiariaProducto.objects.bulk_update(filas, ['pedidos', 'unidades', 'ingresos'], batch_size=LOTE)
+
+def _aplicar(pedido, estado, por_producto, signo, productos=True, crear=True):
+    fecha = fecha_local(pedido.fecha_pedido)
+    _acumular(
+        VentaDiariaNegocio,
+        {'negocio_id': pedido.negocio_id, 'fecha': fecha, 'estado': estado},
+        crear=crear,
+        pedidos=signo,
+        unidades=signo * sum(unidades for unidades, _ in por_producto.values()),
+        ingresos=signo * pedido.total,
+    )
+    if productos and estado not in ESTADOS_SIN_VENTA and por_producto:
+        _acumular_productos(pedido.negocio_id, fecha, por_producto, signo, crear=crear)
+
+def registrar_pedido(pedido, lineas):
+    """Suma un pedido recién creado (y sus líneas) a los acumulados diarios"""
+    with transaction.atomic():
+        _aplicar(pedido, pedido.estado, _agrupar_lineas(lineas), 1)
+
+def registrar_cambio_estado(pedido, estado_anterior):
+    """Mueve un pedido del acumulado de su estado anterior al del nuevo"""
+    lineas = PedidoProducto.objects.filter(pedido_id=pedido.pk).only(
+        'producto_id', 'cantidad', 'subtotal'
+    )
+    por_producto = _agrupar_lineas(lineas)
+    # Las filas por producto solo cambian si el pedido entra o sale de los cancelados
+    cambia_venta = (estado_anterior in ESTADOS_SIN_VENTA) != (pedido.estado in ESTADOS_SIN_VENTA)
+    with transaction.atomic():
+        _aplicar(pedido, estado_anterior, por_producto, -1, productos=cambia_venta)
+        _aplicar(pedido, pedido.estado, por_producto, 1, productos=cambia_venta)
+
+def registrar_borrado(pedido, lineas):
+    """
+    Resta un pedido borrado (con las líneas leídas antes del borrado) de los
+    acumulados. No crea filas: un pedido sin fila en los acumulados nunca se
+    llegó a contar y restarlo la dejaría en negativo.
+    """
+    with transaction.atomic():
+        _aplicar(pedido, pedido.estado, _agrupar_lineas(lineas), -1, crear=False)
+
+def reconstruir_estadisticas(desde=None, hasta=None, negocios=None):
+    """
+    Recalcula los acumulados de un rango de días (inclusive) desde Pedido y
+    PedidoProducto, recorriéndolos en streaming. `negocios` (ids o queryset)
+    limita el recálculo a esos negocios. Devuelve las filas creadas.
+    """
+    pedidos = Pedido.objects.all()
+    acumulados_negocio = VentaDiariaNegocio.objects.all()
+    acumulados_producto = VentaDiariaProducto.objects.all()
+    if negocios is not None:
+        pedidos = pedidos.filter(negocio__in=negocios)
+        acumulados_negocio = acumulados_negocio.filter(negocio__in=negocios)
+        acumulados_producto = acumulados_producto.filter(negocio__in=negocios)
+    if desde:
+        pedidos = pedidos.filter(fecha_pedido__gte=inicio_del_dia(desde))
+        acumulados_negocio = acumulados_negocio.filter(fecha__gte=desde)
+        acumulados_producto = acumulados_producto.filter(fecha__gte=desde)
+    if hasta:
+        pedidos = pedidos.filter(fecha_pedido__lt=inicio_del_dia(hasta + timedelta(days=1)))
+        acumulados_negocio = acumulados_negocio.filter(fecha__lte=hasta)
+        acumulados_producto = acumulados_producto.filter(fecha__lte=hasta)
+
+    por_negocio = {}
+    for negocio, momento, estado, total in pedidos.values_list(
+        'negocio_id', 'fecha_pedido', 'estado', 'total'
+    ).order_by().iterator(chunk_size=LOTE):
+        fila = por_negocio.setdefault((negocio, fecha_local(momento), estado), [0, 0, Decimal('0')])
+        fila[0] += 1
+        fila[2] += total
+
+    por_producto = {}
+    lineas = PedidoProducto.objects.filter(pedido__in=pedidos.values('pk')).values_list(
+        'pedido_id', 'pedido__negocio_id', 'pedido__fecha_pedido', 'pedido__estado',
+        'producto_id', 'cantidad', 'subtotal'
+    ).order_by('pedido_id')
+    for pedido, negocio, momento, estado, producto, cantidad, subtotal in lineas.iterator(chunk_size=LOTE):
+        fecha = fecha_local(momento)
+        por_negocio[negocio, fecha, estado][1] += cantidad
+        if estado in ESTADOS_SIN_VENTA:
+            continue
+        # [negocio, último pedido visto, pedidos, unidades, ingresos]
+        fila = por_producto.setdefault((producto, fecha), [negocio, None, 0, 0, Decimal('0')])
+        if fila[1] != pedido:
+            fila[1] = pedido
+            fila[2] += 1
+        fila[3] += cantidad
+        fila[4] += subtotal
+
+    with transaction.atomic():
+        acumulados_negocio.delete()
+        acumulados_producto.delete()
+        VentaDiariaNegocio.objects.bulk_create([
+            VentaDiariaNegocio(
+                negocio_id=negocio, fecha=fecha, estado=estado,
+                pedidos=pedidos_dia, unidades=unidades, ingresos=ingresos
+            )
+            for (negocio, fecha, estado), (pedidos_dia, unidades, ingresos) in por_negocio.items()
+        ], batch_size=LOTE)
+        VentaDiariaProducto.objects.bulk_create([
+            VentaDiariaProducto(
+                producto_id=producto, fecha=fecha, negocio_id=negocio,
+                pedidos=pedidos_dia, unidades=unidades, ingresos=ingresos
+            )
+            for (producto, fecha), (negocio, _, pedidos_dia, unidades, ingresos) in por_producto.items()
+        ], batch_size=LOTE)
+    return len(por_negocio) + len(por_producto)
@@ -0,0 +1,114 @@
+import hashlib
+import math
+from io import BytesIO
+from django.core.cache import cache
+from PIL import Image, ImageOps
+
+# Tamaño máximo de las imágenes de producto
+MAX_BYTES_PRODUCTO = 20 * 1024
+
+# Ningún JPEG de 20 KB conserva detalle por encima de este lado; reducir antes
+# de codificar evita trabajar con fotos de móvil a resolución completa
+MAX_LADO = 1200
+
+# Iteraciones de la búsqueda binaria sobre la escala
+ITERACIONES = 6
+
+CALIDAD = 85
+
+# Formatos que Pillow lee pero no escribe con el mismo nombre
+FORMATOS_EQUIVALENTES = {'MPO': 'JPEG'}
+
+def _codificar(img, formato, escala):
+    if escala < 1:
+        tamano = (max(1, int(img.width * escala)), max(1, int(img.height * escala)))
+        img = img.resize(tamano, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    salida = BytesIO()
+    img.save(salida, format=formato, quality=CALIDAD, optimize=True)
+    return salida.getvalue()
+
+def comprimir_imagen(contenido, max_bytes=MAX_BYTES_PRODUCTO):
+    """
+    Reduce una imagen hasta que ocupe como máximo `max_bytes`.
+
+    En lugar de reducir un 10% y volver a codificar hasta que quepa, estima
+    la escala a partir del primer tamaño (el peso crece con el número de
+    píxeles) y la ajusta con una búsqueda binaria: como mucho
+    1 + ITERACIONES codificaciones por imagen.
+    """
+    img = Image.open(BytesIO(contenido))
+    formato = FORMATOS_EQUIVALENTES.get(img.format, img.format)
+
+    # thumbnail usa el modo draft de JPEG: decodifica directamente a menor tamaño
+    img.thumbnail((MAX_LADO, MAX_LADO))
+    img = ImageOps.exif_transpose(img)
+    if formato == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+
+    datos = _codificar(img, formato, 1)
+    if len(datos) <= max_bytes:
+        return datos
+
+    minimo, maximo = 0.0, 1.0
+    escala = min(0.95, math.sqrt(max_bytes / len(datos)))
+    mejor, menor = None, datos
+    for _ in range(ITERACIONES):
+        candidato = _codificar(img, formato, escala)
+        if len(candidato) <= max_bytes:
+            mejor, minimo = candidato, escala
+        else:
+            maximo = escala
+            if len(candidato) < len(menor):
+                menor = candidato
+        escala = (minimo + maximo) / 2
+
+    return mejor or menor
+
+def comprimir_imagen_cacheada(contenido, max_bytes=MAX_BYTES_PRODUCTO):
+    """Comprime una imagen reutilizando el resultado si ya se procesó el mismo contenido"""
+    clave = f'imagen:{max_bytes}:{hashlib.sha1(contenido).hexdigest()}'
+    datos = cache.get(clave)
+    if datos is None:
+        datos = comprimir_imagen(contenido, max_bytes)
+        cache.set(clave, datos, 60 * 60 * 24)
+    return datos
+
+# Anchos (px) de las variantes responsive según el campo de imagen
+ANCHOS_VARIANTES = {
+    'imagen': (160, 320, 640),
+    'logo': (64, 128, 256),
+    'img_portada': (640, 1280, 1920),
+}
+
+CALIDAD_VARIANTES = 80
+
+def generar_variantes(contenido, anchos):
+    """
+    Genera cada ancho en WebP y en un formato de respaldo (JPEG, o PNG si la
+    imagen tiene transparencia). Devuelve {formato: {ancho: bytes}}. Nunca se
+    amplía: los anchos mayores que el original se reducen al ancho original.
+    """
+    img = Image.open(BytesIO(contenido))
+    img.draft('RGB', (max(anchos), max(anchos)))
+    img = ImageOps.exif_transpose(img)
+
+    transparente = img.mode in ('RGBA', 'LA') or 'transparency' in img.info
+    respaldo = 'png' if transparente else 'jpeg'
+    img = img.convert('RGBA' if transparente else 'RGB')
+
+    variantes = {'webp': {}, respaldo: {}}
+    # De mayor a menor: cada variante se reduce desde la anterior, no desde el original
+    for ancho in sorted({min(ancho, img.width) for ancho in anchos}, reverse=True):
+        if ancho < img.width:
+            alto = max(1, round(img.height * ancho / img.width))
+            img = img.resize((ancho, alto), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        for formato in variantes:
+            salida = BytesIO()
+            if formato == 'webp':
+                img.save(salida, format='WEBP', quality=CALIDAD_VARIANTES, method=4)
+            elif formato == 'png':
+                img.save(salida, format='PNG', optimize=True)
+            else:
+                img.save(salida, format='JPEG', quality=CALIDAD_VARIANTES, optimize=True, progressive=True)
+            variantes[formato][ancho] = salida.getvalue()
+    return variantes
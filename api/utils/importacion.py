@@ -0,0 +1,238 @@
+import csv
+import io
+import json
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from ..models import Categoria, Subcategoria, Producto
+from ..serializers.producto_serializers import ProductoImportacionSerializer
+from .busqueda import reindexar_productos
+from .cache import invalidar_catalogo
+
+# Filas que se validan y escriben juntas
+LOTE_IMPORTACION = 500
+# Errores detallados que se devuelven como máximo (el total se cuenta igualmente)
+MAX_ERRORES = 1000
+
+FORMATOS = ('csv', 'json')
+
+CAMPOS_ACTUALIZABLES = ['nombre', 'descripcion', 'precio', 'stock', 'descuento', 'activo', 'subcategoria', 'updated_at']
+
+class ErrorImportacion(Exception):
+    """El archivo no se puede leer (formato desconocido, JSON mal formado...)"""
+
+def _clave(nombre):
+    # lower() y no casefold(): tiene que coincidir con Lower() de la base de datos
+    return nombre.strip().lower()
+
+def detectar_formato(nombre_archivo):
+    extension = (nombre_archivo or '').rsplit('.', 1)[-1].lower()
+    if extension in ('csv', 'txt'):
+        return 'csv'
+    if extension in ('json', 'jsonl', 'ndjson'):
+        return 'json'
+    raise ErrorImportacion('Formato no soportado: use un archivo .csv, .json o .jsonl')
+
+def leer_filas(archivo, formato):
+    """
+    Recorre las filas de un archivo binario sin cargarlo entero: CSV con
+    cabecera o JSON Lines (un objeto por línea). Un array JSON se acepta
+    también, aunque ese caso sí se carga completo.
+    """
+    if formato not in FORMATOS:
+        raise ErrorImportacion(f"Formato no soportado: use {' o '.join(FORMATOS)}")
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    try:
+        if formato == 'csv':
+            yield from csv.DictReader(texto)
+            return
+
+        primera = ''
+        for primera in texto:
+            if primera.strip():
+                break
+        if primera.lstrip().startswith('['):
+            try:
+                filas = json.loads(primera + texto.read())
+            except json.JSONDecodeError as e:
+                raise ErrorImportacion(f'JSON no válido: {e}')
+            yield from filas
+            return
+
+        lineas = [primera] if primera.strip() else []
+        for linea in _encadenar(lineas, texto):
+            if not linea.strip():
+                continue
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError:
+                # Se entrega tal cual para que cuente como error de esa fila
+                yield linea
+    except UnicodeDecodeError:
+        raise ErrorImportacion('El archivo debe estar codificado en UTF-8')
+    except csv.Error as e:
+        raise ErrorImportacion(f'CSV no válido: {e}')
+    finally:
+        # El archivo lo cierra quien lo abrió
+        texto.detach()
+
+def _encadenar(primeras, resto):
+    yield from primeras
+    yield from resto
+
+class ImportadorProductos:
+    """
+    Importa productos a un negocio por lotes: valida cada fila, resuelve
+    categoría y subcategoría por nombre (creándolas si no existen) con una
+    caché en memoria, y crea o actualiza los productos (mismo nombre, sin
+    distinguir mayúsculas) con bulk_create/bulk_update. Con `simulacion`
+    valida y cuenta sin escribir nada.
+    """
+
+    def __init__(self, negocio, simulacion=False, lote=LOTE_IMPORTACION):
+        self.negocio = negocio
+        self.simulacion = simulacion
+        self.lote = lote
+        self.resultado = {
+            'simulacion': simulacion,
+            'filas': 0,
+            'creados': 0,
+            'actualizados': 0,
+            'categorias_creadas': 0,
+            'subcategorias_creadas': 0,
+            'total_errores': 0,
+            'errores': [],
+        }
+        self.nombres_vistos = {}
+        # Caché de nombres normalizados -> id (None: se crearía, en simulación)
+        self.categorias = {}
+        for pk, nombre in Categoria.objects.filter(negocio=negocio).order_by('id').values_list('id', 'nombre'):
+            self.categorias.setdefault(_clave(nombre), pk)
+        self.subcategorias = {}
+        for pk, categoria_id, nombre in Subcategoria.objects.filter(
+            categoria__negocio=negocio
+        ).order_by('id').values_list('id', 'categoria_id', 'nombre'):
+            self.subcategorias.setdefault((categoria_id, _clave(nombre)), pk)
+
+    def importar(self, filas):
+        """
+        Cada lote se guarda en su propia transacción. Si el archivo deja de
+        poderse leer a mitad, lo importado hasta ahí se conserva y el
+        resultado lleva la clave `error`; la caché del catálogo se invalida
+        en cualquier caso.
+        """
+        pendientes = []
+        try:
+            try:
+                for numero, fila in enumerate(filas, start=1):
+                    self.resultado['filas'] += 1
+                    pendientes.append((numero, fila))
+                    if len(pendientes) >= self.lote:
+                        self._procesar_lote(pendientes)
+                        pendientes = []
+            except ErrorImportacion as e:
+                # Las filas leídas antes del error se importan igualmente
+                self.resultado['error'] = str(e)
+            if pendientes:
+                self._procesar_lote(pendientes)
+        finally:
+            if not self.simulacion and (self.resultado['creados'] or self.resultado['actualizados']):
+                invalidar_catalogo(self.negocio.slug)
+        return self.resultado
+
+    def _error(self, numero, errores):
+        self.resultado['total_errores'] += 1
+        if len(self.resultado['errores']) < MAX_ERRORES:
+            self.resultado['errores'].append({'fila': numero, 'errores': errores})
+
+    def _validar(self, numero, fila):
+        if not isinstance(fila, dict):
+            self._error(numero, {'fila': ['Cada fila debe ser un objeto con los campos del producto']})
+            return None
+        serializer = ProductoImportacionSerializer(data=fila)
+        if not serializer.is_valid():
+            self._error(numero, serializer.errors)
+            return None
+        datos = serializer.validated_data
+        clave = _clave(datos['nombre'])
+        if clave in self.nombres_vistos:
+            self._error(numero, {'nombre': [f'Nombre repetido en el archivo (fila {self.nombres_vistos[clave]})']})
+            return None
+        self.nombres_vistos[clave] = numero
+        return datos
+
+    def _resolver_subcategoria(self, categoria, subcategoria):
+        """Id de la subcategoría (o None en simulación si habría que crearla)"""
+        clave_categoria = _clave(categoria)
+        if clave_categoria not in self.categorias:
+            self.resultado['categorias_creadas'] += 1
+            self.categorias[clave_categoria] = None if self.simulacion else Categoria.objects.create(
+                negocio=self.negocio, nombre=categoria.strip()
+            ).pk
+        categoria_id = self.categorias[clave_categoria]
+
+        clave = (categoria_id, _clave(subcategoria))
+        if categoria_id is None:
+            # Categoría nueva en simulación: sus subcategorías se identifican por nombre
+            clave = (clave_categoria, _clave(subcategoria))
+        if clave not in self.subcategorias:
+            self.resultado['subcategorias_creadas'] += 1
+            self.subcategorias[clave] = None if self.simulacion else Subcategoria.objects.create(
+                categoria_id=categoria_id, nombre=subcategoria.strip()
+            ).pk
+        return self.subcategorias[clave]
+
+    def _procesar_lote(self, filas):
+        validas = []
+        for numero, fila in filas:
+            datos = self._validar(numero, fila)
+            if datos is not None:
+                validas.append(datos)
+        if not validas:
+            return
+
+        # Productos existentes del lote con una sola consulta
+        existentes = {
+            _clave(producto.nombre): producto
+            for producto in Producto.objects.annotate(nombre_normalizado=Lower('nombre')).filter(
+                negocio=self.negocio,
+                nombre_normalizado__in=[_clave(datos['nombre']) for datos in validas]
+            ).only('id', 'nombre', 'imagen', 'imagen_srcset', 'created_at')
+        }
+
+        with transaction.atomic():
+            nuevos, actualizados = [], []
+            ahora = timezone.now()
+            for datos in validas:
+                subcategoria_id = self._resolver_subcategoria(datos['categoria'], datos['subcategoria'])
+                campos = {
+                    'nombre': datos['nombre'].strip(),
+                    'descripcion': datos['descripcion'],
+                    'precio': datos['precio'],
+                    'stock': datos['stock'],
+                    'descuento': datos['descuento'],
+                    'activo': datos['activo'],
+                    'subcategoria_id': subcategoria_id,
+                }
+                producto = existentes.get(_clave(datos['nombre']))
+                if producto is None:
+                    nuevos.append(Producto(negocio_id=self.negocio.pk, **campos))
+                else:
+                    for campo, valor in campos.items():
+                        setattr(producto, campo, valor)
+                    producto.updated_at = ahora
+                    actualizados.append(producto)
+
+            self.resultado['creados'] += len(nuevos)
+            self.resultado['actualizados'] += len(actualizados)
+            if self.simulacion:
+                return
+
+            # bulk_create no pasa por save(): negocio_id ya viene fijado arriba
+            # bulk_update reindexa los actualizados; los nuevos se releen (MySQL no devuelve ids)
+            Producto.objects.bulk_create(nuevos)
+            Producto.objects.bulk_update(actualizados, CAMPOS_ACTUALIZABLES)
+            if nuevos:
+                reindexar_productos(Producto.objects.filter(
+                    negocio=self.negocio, nombre__in=[producto.nombre for producto in nuevos]
+                ).values_list('id', flat=True))
@@ -0,0 +1,41 @@
+from datetime import timedelta
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from ..models import InfoNegocio, Licencia
+
+# Días de prueba de las licencias creadas automáticamente
+DIAS_LICENCIA_INICIAL = 30
+
+def contar_licencias():
+    """Cuenta licencias activas y vencidas con una sola consulta agregada"""
+    return Licencia.objects.aggregate(
+        activas=Count('id', filter=Q(esta_activa=True)),
+        vencidas=Count('id', filter=Q(esta_activa=False))
+    )
+
+def crear_licencias_faltantes():
+    """Crea en bloque las licencias de los negocios que no tienen. Devuelve sus nombres."""
+    negocios = list(
+        InfoNegocio.objects.filter(licencia__isnull=True).values_list('id', 'nombre')
+    )
+    if negocios:
+        fecha_vencimiento = timezone.now() + timedelta(days=DIAS_LICENCIA_INICIAL)
+        # ignore_conflicts: la señal de creación de negocios puede adelantarse
+        Licencia.objects.bulk_create([
+            Licencia(negocio_id=negocio_id, fecha_vencimiento=fecha_vencimiento)
+            for negocio_id, _ in negocios
+        ], ignore_conflicts=True)
+    return [nombre for _, nombre in negocios]
+
+def expirar_licencias():
+    """Desactiva las licencias vencidas con un único UPDATE sobre el índice (esta_activa, fecha_vencimiento)"""
+    return Licencia.objects.filter(
+        esta_activa=True,
+        fecha_vencimiento__lt=timezone.now()
+    ).update(esta_activa=False)
+
+def proximo_vencimiento():
+    """Fecha del próximo vencimiento entre las licencias activas, o None"""
+    return Licencia.objects.filter(esta_activa=True).aggregate(
+        proximo=Min('fecha_vencimiento')
+    )['proximo']
@@ -0,0 +1,59 @@
+from datetime import timedelta
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+from ..models import LiderScheduler
+import os
+import socket
+import uuid
+
+# Identifica a este proceso; el uuid evita colisiones si se reutiliza un pid
+PROPIETARIO = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+# Duración de la concesión; el líder la renueva cada DURACION / 3
+DURACION = timedelta(seconds=60)
+
+_lider = False
+# Hasta cuándo vale la concesión que tenemos, según nuestro reloj
+_expira = None
+
+def es_lider():
+    # Si las renovaciones se atascan, el liderazgo caduca con la concesión
+    return _lider and _expira is not None and timezone.now() < _expira
+
+def renovar_liderazgo(nombre='scheduler'):
+    """
+    Renueva la concesión si es nuestra o la toma si ha expirado, con un UPDATE
+    condicional: solo un proceso puede ganar. Devuelve True si este proceso
+    acaba de convertirse en líder. Si la renovación falla, este proceso deja
+    de considerarse líder antes de propagar el error.
+    """
+    global _lider, _expira
+    ahora = timezone.now()
+    era_lider = es_lider()
+    try:
+        actualizadas = LiderScheduler.objects.filter(nombre=nombre).filter(
+            Q(propietario=PROPIETARIO) | Q(expira__lt=ahora)
+        ).update(propietario=PROPIETARIO, expira=ahora + DURACION)
+
+        if actualizadas:
+            _lider = True
+        else:
+            try:
+                LiderScheduler.objects.create(nombre=nombre, propietario=PROPIETARIO, expira=ahora + DURACION)
+                _lider = True
+            except IntegrityError:
+                _lider = False
+    except Exception:
+        _lider = False
+        raise
+    _expira = ahora + DURACION if _lider else None
+    return _lider and not era_lider
+
+def liberar_liderazgo(nombre='scheduler'):
+    """Cede la concesión para que otro proceso la tome sin esperar a que expire"""
+    global _lider, _expira
+    if _lider:
+        _lider = False
+        _expira = None
+        LiderScheduler.objects.filter(nombre=nombre, propietario=PROPIETARIO).update(expira=timezone.now())
@@ -0,0 +1,224 @@
+import copy
+import os
+import threading
+import time
+from django.core.cache import cache
+
+# Límites superiores de los cubos de cada histograma (el último cubo es "más")
+LIMITES_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+LIMITES_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# vista_ms: tiempo dentro de la vista fuera de la BD (lógica y serialización);
+# render_ms: tiempo de renderizar la respuesta (JSON) tras salir de la vista
+METRICAS = {
+    'consultas': LIMITES_CONSULTAS,
+    'db_ms': LIMITES_MS,
+    'vista_ms': LIMITES_MS,
+    'render_ms': LIMITES_MS,
+    'total_ms': LIMITES_MS,
+}
+
+# Sentencias SQL que se conservan por petición para el log de peticiones lentas
+MAX_SQL = 200
+
+# Cada proceso publica su instantánea en la caché como mucho cada tantos segundos
+INTERVALO_PUBLICACION = 10
+
+# Cada proceso publica en una de estas ranuras, que reclama con cache.add. La
+# ranura caduca si el proceso deja de publicar (ha muerto o no recibe peticiones)
+MAX_PROCESOS = 64
+TTL_INSTANTANEA = 5 * 60
+
+# Histogramas por vista, locales al proceso
+_vistas = {}
+_lock = threading.Lock()
+_ultima_publicacion = 0
+_ranura = None
+
+# Medición en curso del hilo (petición actual)
+_estado = threading.local()
+
+def _nuevo_histograma(limites):
+    return {'limites': list(limites), 'cuentas': [0] * (len(limites) + 1), 'n': 0, 'suma': 0, 'max': 0}
+
+def _registrar_valor(histograma, valor):
+    indice = len(histograma['limites'])
+    for i, limite in enumerate(histograma['limites']):
+        if valor <= limite:
+            indice = i
+            break
+    histograma['cuentas'][indice] += 1
+    histograma['n'] += 1
+    histograma['suma'] += valor
+    histograma['max'] = max(histograma['max'], valor)
+
+def _percentil(histograma, p):
+    """Percentil aproximado: límite superior del cubo que lo contiene"""
+    if not histograma['n']:
+        return 0
+    objetivo = histograma['n'] * p / 100
+    acumulado = 0
+    for i, cuenta in enumerate(histograma['cuentas']):
+        acumulado += cuenta
+        if acumulado >= objetivo:
+            if i < len(histograma['limites']):
+                return min(histograma['limites'][i], round(histograma['max'], 2))
+            return round(histograma['max'], 2)
+    return histograma['max']
+
+def registrar_peticion(vista, valores):
+    with _lock:
+        histogramas = _vistas.setdefault(
+            vista, {metrica: _nuevo_histograma(limites) for metrica, limites in METRICAS.items()}
+        )
+        for metrica, valor in valores.items():
+            _registrar_valor(histogramas[metrica], valor)
+    _publicar_si_toca()
+
+def instantanea():
+    with _lock:
+        return copy.deepcopy(_vistas)
+
+def reiniciar():
+    global _ranura
+    with _lock:
+        _vistas.clear()
+    if _ranura is not None:
+        cache.delete(_clave_ranura(_ranura))
+        _ranura = None
+
+def combinar(instantaneas):
+    """Suma los histogramas de varias instantáneas (una por proceso)"""
+    total = {}
+    for datos in instantaneas:
+        for vista, histogramas in datos.items():
+            destino = total.setdefault(vista, {})
+            for metrica, histograma in histogramas.items():
+                if metrica not in destino:
+                    destino[metrica] = copy.deepcopy(histograma)
+                    continue
+                acumulado = destino[metrica]
+                acumulado['cuentas'] = [a + b for a, b in zip(acumulado['cuentas'], histograma['cuentas'])]
+                acumulado['n'] += histograma['n']
+                acumulado['suma'] += histograma['suma']
+                acumulado['max'] = max(acumulado['max'], histograma['max'])
+    return total
+
+def resumen(datos):
+    """{vista: {metrica: {n, media, p50, p95, p99, max}}}, las vistas más costosas primero"""
+    filas = {}
+    for vista, histogramas in datos.items():
+        filas[vista] = {
+            metrica: {
+                'n': h['n'],
+                'media': round(h['suma'] / h['n'], 2) if h['n'] else 0,
+                'p50': _percentil(h, 50),
+                'p95': _percentil(h, 95),
+                'p99': _percentil(h, 99),
+                'max': round(h['max'], 2),
+            }
+            for metrica, h in histogramas.items()
+        }
+    return dict(sorted(
+        filas.items(),
+        key=lambda item: datos[item[0]]['total_ms']['suma'],
+        reverse=True
+    ))
+
+def _publicar_si_toca():
+    """Publica la instantánea del proceso en la caché para perf_report y otros workers"""
+    global _ultima_publicacion
+    ahora = time.monotonic()
+    if ahora - _ultima_publicacion < INTERVALO_PUBLICACION:
+        return
+    _ultima_publicacion = ahora
+    publicar_instantanea()
+
+def _clave_ranura(ranura):
+    return f'metricas:ranura:{ranura}'
+
+def publicar_instantanea():
+    """
+    Guarda la instantánea del proceso en su ranura y renueva su caducidad. La
+    ranura se reclama con cache.add, que es atómico: dos procesos nunca
+    comparten ranura ni se pisan una lista común. Devuelve False si no queda
+    ninguna libre.
+    """
+    global _ranura
+    pid = os.getpid()
+    entrada = {'pid': pid, 'vistas': instantanea()}
+    if _ranura is not None:
+        actual = cache.get(_clave_ranura(_ranura))
+        if actual is not None and actual['pid'] == pid:
+            cache.set(_clave_ranura(_ranura), entrada, TTL_INSTANTANEA)
+            return True
+        # La ranura caducó y puede que ya sea de otro proceso: se busca otra
+        _ranura = None
+    for ranura in range(MAX_PROCESOS):
+        if cache.add(_clave_ranura(ranura), entrada, TTL_INSTANTANEA):
+            _ranura = ranura
+            return True
+    return False
+
+def instantaneas_compartidas(excluir_pid=None):
+    """Instantáneas vigentes de todos los procesos (requiere una caché compartida)"""
+    entradas = cache.get_many([_clave_ranura(ranura) for ranura in range(MAX_PROCESOS)]).values()
+    return [entrada['vistas'] for entrada in entradas if entrada['pid'] != excluir_pid]
+
+def metricas_combinadas():
+    """Histogramas de este proceso más los publicados por el resto de procesos"""
+    return combinar([instantanea()] + instantaneas_compartidas(excluir_pid=os.getpid()))
+
+# Medición por petición
+
+class Medicion:
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.db = 0.0
+        self.sql = []
+        # Marcas de la vista: process_view y process_template_response del middleware
+        self.inicio_vista = None
+        self.fin_vista = None
+        self.db_antes_de_vista = 0.0
+        self.db_en_vista = 0.0
+
+    def registrar_consulta(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.consultas += 1
+            self.db += duracion
+            if len(self.sql) < MAX_SQL:
+                self.sql.append((round(duracion * 1000, 2), sql))
+
+    def empezar_vista(self):
+        self.inicio_vista = time.perf_counter()
+        self.db_antes_de_vista = self.db
+
+    def terminar_vista(self):
+        if self.inicio_vista is not None and self.fin_vista is None:
+            self.fin_vista = time.perf_counter()
+            self.db_en_vista = self.db - self.db_antes_de_vista
+
+    def tiempos(self):
+        """(vista, render, total) en segundos, al terminar la petición"""
+        fin = time.perf_counter()
+        if self.inicio_vista is None:
+            return 0.0, 0.0, fin - self.inicio
+        # Las respuestas que no se renderizan (HttpResponse) terminan la vista al salir
+        self.terminar_vista()
+        vista = max(0.0, self.fin_vista - self.inicio_vista - self.db_en_vista)
+        return vista, fin - self.fin_vista, fin - self.inicio
+
+def iniciar_medicion():
+    _estado.medicion = Medicion()
+    return _estado.medicion
+
+def medicion_actual():
+    return getattr(_estado, 'medicion', None)
+
+def finalizar_medicion():
+    _estado.medicion = None
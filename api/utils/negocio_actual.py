@@ -0,0 +1,25 @@
+from ..models import InfoNegocio
+
+def obtener_negocio_actual(request):
+    """
+    Resuelve el negocio del usuario autenticado con una sola consulta (con su
+    licencia) y lo memoriza en la petición: las vistas y permisos que lo piden
+    varias veces no repiten la búsqueda. No se comparte entre peticiones, así
+    que nunca se escribe sobre una copia vieja del negocio.
+    """
+    if hasattr(request, '_negocio_actual'):
+        return request._negocio_actual
+
+    negocio = None
+    user = request.user
+    if user and user.is_authenticated:
+        negocio = InfoNegocio.objects.select_related('licencia').filter(usuarios__user_id=user.pk).first()
+
+    request._negocio_actual = negocio
+    return negocio
+
+class NegocioActualMixin:
+    """Da a los viewsets de administración acceso al negocio del usuario autenticado"""
+
+    def get_negocio(self, user=None):
+        return obtener_negocio_actual(self.request)
@@ -1,11 +1,75 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+
+class ProductoCursorPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset) para los feeds de productos: no ejecuta
+    COUNT(*) ni OFFSET y es estable aunque se inserten productos nuevos.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-id'
 
 class ProductPagination(PageNumberPagination):
+    """
+    Paginación por número de página. Si la petición incluye `paginacion=cursor`
+    (o un `cursor` de una página anterior) se usa la paginación por cursor.
+    """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
+    cursor_pagination_class = ProductoCursorPagination
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def usa_cursor(self, request):
+        return (
+            request.query_params.get('paginacion') == 'cursor' or
+            'cursor' in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.usa_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parametros = super().get_schema_operation_parameters(view)
+        parametros.append({
+            'name': 'paginacion',
+            'required': False,
+            'in': 'query',
+            'description': 'Usar "cursor" para paginación por cursor (sin conteo total)',
+            'schema': {'type': 'string', 'enum': ['cursor']},
+        })
+        parametros.append({
+            'name': 'cursor',
+            'required': False,
+            'in': 'query',
+            'description': 'Cursor de la página a obtener',
+            'schema': {'type': 'string'},
+        })
+        return parametros
+
+class PedidoCursorPagination(CursorPagination):
+    """
+    Paginación por cursor para la bandeja de pedidos del comerciante y el
+    historial del cliente: recorre los índices (negocio, estado, -fecha_pedido)
+    y (user, -fecha_pedido) sin COUNT(*) ni OFFSET.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-fecha_pedido', '-id')
 
 class NegocioPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
@@ -0,0 +1,98 @@
+from decimal import Decimal
+from django.db import transaction
+from rest_framework import serializers
+from ..models import Pedido, PedidoProducto, Producto
+from .estadisticas import registrar_pedido
+from .reservas import reservar_stock, vencimiento_reserva, invalidar_stock_negocio
+
+def agrupar_productos(productos_data):
+    """Normaliza los items del pedido a {producto_id: cantidad}"""
+    cantidades = {}
+    for item in productos_data:
+        try:
+            producto_id = int(item.get('producto_id'))
+            cantidad = int(item.get('cantidad', 1))
+        except (TypeError, ValueError):
+            raise serializers.ValidationError("producto_id y cantidad deben ser números enteros")
+        if cantidad < 1:
+            raise serializers.ValidationError("La cantidad debe ser mayor a 0")
+        cantidades[producto_id] = cantidades.get(producto_id, 0) + cantidad
+    return cantidades
+
+def crear_pedido(datos_pedido, productos_data, negocio=None):
+    """
+    Crea un pedido completo en una sola transacción: bloquea los productos con
+    una única consulta, inserta todas las líneas con bulk_create, reserva el
+    stock con un UPDATE condicional y calcula el total una sola vez. Los
+    pedidos pendientes guardan hasta cuándo es válida su reserva.
+    """
+    cantidades = agrupar_productos(productos_data)
+    if not cantidades:
+        raise serializers.ValidationError("Debe incluir al menos un producto")
+
+    # Un pedido cancelado no reserva stock: crearlo así lo descontaría sin devolverlo nunca
+    estado = datos_pedido.get('estado', 'pendiente')
+    if estado == 'cancelado':
+        raise serializers.ValidationError("No se puede crear un pedido cancelado")
+
+    with transaction.atomic():
+        productos = Producto.objects.select_for_update().filter(
+            id__in=cantidades.keys(),
+            activo=True
+        ).in_bulk()
+
+        for producto_id in cantidades:
+            if producto_id not in productos:
+                raise serializers.ValidationError(
+                    f"Producto {producto_id} no encontrado o no disponible"
+                )
+
+        negocios = {producto.negocio_id for producto in productos.values()}
+        if negocio is not None:
+            if negocios != {negocio.id}:
+                raise serializers.ValidationError(
+                    "Todos los productos deben pertenecer a tu negocio"
+                )
+        elif len(negocios) > 1:
+            raise serializers.ValidationError(
+                "Todos los productos del pedido deben ser del mismo negocio"
+            )
+        negocio_id = negocios.pop()
+
+        lineas = []
+        total_pedido = Decimal('0')
+        for producto_id, cantidad in cantidades.items():
+            producto = productos[producto_id]
+            if producto.stock < cantidad:
+                raise serializers.ValidationError(
+                    f"Stock insuficiente para {producto.nombre}"
+                )
+            precio_unitario = producto.precio_con_descuento
+            subtotal = precio_unitario * Decimal(str(cantidad))
+            total_pedido += subtotal
+            linea = PedidoProducto(
+                producto=producto,
+                cantidad=cantidad,
+                precio_unitario=precio_unitario,
+                subtotal=subtotal
+            )
+            linea.copiar_producto(producto)
+            lineas.append(linea)
+
+        if not reservar_stock(cantidades):
+            raise serializers.ValidationError("Stock insuficiente para completar el pedido")
+
+        pedido = Pedido.objects.create(
+            **datos_pedido,
+            negocio_id=negocio_id,
+            total=total_pedido,
+            reserva_expira=vencimiento_reserva() if estado == 'pendiente' else None
+        )
+        for linea in lineas:
+            linea.pedido = pedido
+        PedidoProducto.objects.bulk_create(lineas)
+        registrar_pedido(pedido, lineas)
+
+        invalidar_stock_negocio(negocio_id)
+
+    return pedido
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Q, When
+from django.utils import timezone
+from ..models import InfoNegocio, Pedido, Producto
+from .cache import invalidar_catalogo
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _actualizar_stock(cantidades, signo, condicion=None):
+    """Suma o resta cantidades al stock de varios productos en un solo UPDATE"""
+    queryset = Producto.objects.filter(condicion if condicion is not None else Q(pk__in=cantidades.keys()))
+    return queryset.update(
+        stock=Case(
+            *[When(pk=producto_id, then=F('stock') + signo * cantidad)
+              for producto_id, cantidad in cantidades.items()],
+            default=F('stock'),
+            output_field=PositiveIntegerField()
+        )
+    )
+
+def invalidar_stock_negocio(negocio_id):
+    # El stock cambia sin pasar por save(): invalidar el catálogo cacheado al confirmar
+    def invalidar():
+        # El pedido ya está confirmado: un fallo aquí no debe llegar a la vista
+        try:
+            invalidar_catalogo(
+                InfoNegocio.objects.filter(pk=negocio_id).values_list('slug', flat=True).first()
+            )
+        except Exception as e:
+            logger.error(f"Error al invalidar el catálogo del negocio {negocio_id}: {str(e)}")
+    transaction.on_commit(invalidar)
+
+def reservar_stock(cantidades):
+    """
+    Descuenta el stock con un UPDATE ... WHERE stock >= cantidad por producto.
+    Devuelve False si algún producto no tenía stock suficiente; en ese caso el
+    llamador debe revertir la transacción.
+    """
+    condicion = Q()
+    for producto_id, cantidad in cantidades.items():
+        condicion |= Q(pk=producto_id, stock__gte=cantidad)
+    return _actualizar_stock(cantidades, -1, condicion) == len(cantidades)
+
+def vencimiento_reserva():
+    """Fecha en la que vence la reserva de un pedido pendiente creado ahora"""
+    return timezone.now() + timedelta(minutes=settings.RESERVA_STOCK_MINUTOS)
+
+def liberar_stock(pedido):
+    """Devuelve al stock las cantidades de todas las líneas del pedido"""
+    cantidades = {}
+    for producto_id, cantidad in pedido.items.values_list('producto_id', 'cantidad'):
+        cantidades[producto_id] = cantidades.get(producto_id, 0) + cantidad
+    if cantidades:
+        _actualizar_stock(cantidades, 1)
+        invalidar_stock_negocio(pedido.negocio_id)
+
+class EstadoNoPermitido(Exception):
+    """El pedido no admite el cambio de estado pedido"""
+
+def cancelar_pedido(pedido, solo_vencidos=False, solo_pendientes=False):
+    """
+    Cancela un pedido y libera su stock una única vez. El pedido se bloquea
+    para que una cancelación concurrente no libere el stock dos veces.
+    Con `solo_vencidos` solo se cancela si sigue pendiente y su reserva venció;
+    con `solo_pendientes` se lanza EstadoNoPermitido si ya no está pendiente.
+    """
+    with transaction.atomic():
+        pedido = Pedido.objects.select_for_update().get(pk=pedido.pk)
+        if solo_pendientes and pedido.estado != 'pendiente':
+            raise EstadoNoPermitido('Solo se pueden cancelar pedidos pendientes')
+        if pedido.estado == 'cancelado':
+            return pedido
+        if solo_vencidos and not (
+            pedido.estado == 'pendiente' and
+            pedido.reserva_expira and
+            pedido.reserva_expira < timezone.now()
+        ):
+            return pedido
+
+        liberar_stock(pedido)
+        pedido.estado = 'cancelado'
+        pedido.reserva_expira = None
+        pedido.save(update_fields=['estado', 'reserva_expira', 'updated_at'])
+    return pedido
+
+def cambiar_estado_pedido(pedido, nuevo_estado):
+    """
+    Cambia el estado de un pedido con la fila bloqueada. Un pedido cancelado
+    (a mano o por reserva vencida) ya devolvió su stock y no se puede reabrir.
+    """
+    if nuevo_estado == 'cancelado':
+        return cancelar_pedido(pedido)
+
+    with transaction.atomic():
+        pedido = Pedido.objects.select_for_update().get(pk=pedido.pk)
+        if pedido.estado == 'cancelado':
+            raise EstadoNoPermitido('Un pedido cancelado no se puede reabrir: su stock ya fue devuelto')
+        pedido.estado = nuevo_estado
+        if nuevo_estado != 'pendiente':
+            # El pedido ya fue aceptado: la reserva deja de vencer
+            pedido.reserva_expira = None
+        pedido.save()
+    return pedido
+
+def liberar_reservas_vencidas():
+    """Cancela los pedidos pendientes cuya reserva de stock ya venció"""
+    vencidos = Pedido.objects.filter(
+        estado='pendiente',
+        reserva_expira__lt=timezone.now()
+    ).values_list('pk', flat=True)
+
+    cancelados = 0
+    for pk in list(vencidos):
+        try:
+            if cancelar_pedido(Pedido(pk=pk), solo_vencidos=True).estado == 'cancelado':
+                cancelados += 1
+        except Exception as e:
+            logger.error(f"Error al liberar reserva del pedido {pk}: {str(e)}")
+    if cancelados:
+        logger.info(f"Reservas vencidas liberadas: {cancelados}")
+    return cancelados
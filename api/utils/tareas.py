@@ -0,0 +1,219 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from ..models.tarea_models import Tarea
+from .imagenes import comprimir_imagen_cacheada, generar_variantes, ANCHOS_VARIANTES
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Registro tipo de tarea -> función que la ejecuta
+MANEJADORES = {}
+
+# Los archivos por defecto los comparten todos los registros: nunca se borran
+PREFIJO_POR_DEFECTO = 'default/'
+
+def manejador(tipo):
+    def decorador(funcion):
+        MANEJADORES[tipo] = funcion
+        return funcion
+    return decorador
+
+def encolar(tipo, **datos):
+    """Crea una tarea pendiente. Se guarda en la misma transacción que el cambio que la origina."""
+    return Tarea.objects.create(tipo=tipo, datos=datos)
+
+def nombres_srcset(srcset):
+    """Lista los archivos de un mapa de variantes {formato: {ancho: nombre}}"""
+    return [nombre for anchos in (srcset or {}).values() for nombre in anchos.values()]
+
+def eliminar_archivo_en_segundo_plano(archivo, srcset=None):
+    """Programa el borrado de un archivo de un ImageField/FileField y de sus variantes"""
+    nombres = nombres_srcset(srcset)
+    if archivo and archivo.name and not archivo.name.startswith(PREFIJO_POR_DEFECTO):
+        nombres.append(archivo.name)
+    Tarea.objects.bulk_create([
+        Tarea(tipo='eliminar_archivo', datos={'nombre': nombre}) for nombre in nombres
+    ])
+
+def encolar_variantes(instancia, campo):
+    """Programa la generación de variantes de un campo de imagen ya guardado"""
+    archivo = getattr(instancia, campo)
+    if archivo and not archivo.name.startswith(PREFIJO_POR_DEFECTO):
+        encolar(
+            'generar_variantes_imagen',
+            modelo=instancia._meta.label,
+            pk=instancia.pk,
+            campo=campo,
+            nombre=archivo.name
+        )
+
+def guardar_variantes(nombre, contenido, campo):
+    """Genera y guarda las variantes de una imagen. Devuelve el mapa de nombres."""
+    base, _ = os.path.splitext(nombre)
+    srcset = {}
+    for formato, anchos in generar_variantes(contenido, ANCHOS_VARIANTES[campo]).items():
+        srcset[formato] = {
+            str(ancho): default_storage.save(
+                f'variantes/{base}_{ancho}.{formato}',
+                ContentFile(datos)
+            )
+            for ancho, datos in anchos.items()
+        }
+    return srcset
+
+def _slug_negocio(instancia):
+    """Slug de la tienda a la que pertenece una instancia con imagen"""
+    from ..models import InfoNegocio, Categoria
+    if isinstance(instancia, InfoNegocio):
+        return instancia.slug
+    negocio_id = getattr(instancia, 'negocio_id', None)
+    if negocio_id is None:
+        negocio_id = Categoria.objects.filter(
+            pk=instancia.categoria_id
+        ).values_list('negocio_id', flat=True).first()
+    return InfoNegocio.objects.filter(pk=negocio_id).values_list('slug', flat=True).first()
+
+def _usada_en_pedidos(nombre):
+    """Las líneas de pedido conservan la imagen del producto en el momento de la compra"""
+    from ..models import PedidoProducto
+    return PedidoProducto.objects.filter(producto_imagen=nombre).exists()
+
+@manejador('eliminar_archivo')
+def eliminar_archivo(nombre):
+    if nombre.startswith(PREFIJO_POR_DEFECTO) or _usada_en_pedidos(nombre):
+        return
+    if default_storage.exists(nombre):
+        default_storage.delete(nombre)
+
+@manejador('procesar_imagen_producto')
+def procesar_imagen_producto(producto_id, nombre):
+    """
+    Comprime la imagen original de un producto, genera sus variantes a partir
+    del original y las sustituye si el producto no ha cambiado de imagen
+    """
+    from ..models import Producto, PedidoProducto
+    from .cache import invalidar_catalogo
+
+    if not default_storage.exists(nombre):
+        return
+
+    with default_storage.open(nombre) as original:
+        contenido = original.read()
+    nuevo_nombre = default_storage.save(
+        os.path.join(os.path.dirname(nombre), 'c_' + os.path.basename(nombre)),
+        ContentFile(comprimir_imagen_cacheada(contenido))
+    )
+    srcset = guardar_variantes(nombre, contenido, 'imagen')
+
+    # Solo se sustituye si el producto sigue apuntando a la imagen original
+    actualizados = Producto.objects.filter(pk=producto_id, imagen=nombre).update(
+        imagen=nuevo_nombre,
+        imagen_srcset=srcset
+    )
+    if actualizados:
+        # Los pedidos hechos antes de comprimir pasan a la versión comprimida
+        PedidoProducto.objects.filter(producto_imagen=nombre).update(producto_imagen=nuevo_nombre)
+        default_storage.delete(nombre)
+        invalidar_catalogo(_slug_negocio(Producto.objects.get(pk=producto_id)))
+    else:
+        for sobrante in [nuevo_nombre] + nombres_srcset(srcset):
+            default_storage.delete(sobrante)
+
+@manejador('generar_variantes_imagen')
+def generar_variantes_imagen(modelo, pk, campo, nombre):
+    """Genera las variantes de un campo de imagen si sigue apuntando al mismo archivo"""
+    from django.apps import apps
+    from .cache import invalidar_catalogo
+
+    if not default_storage.exists(nombre):
+        return
+    Modelo = apps.get_model(modelo)
+
+    with default_storage.open(nombre) as original:
+        srcset = guardar_variantes(nombre, original.read(), campo)
+
+    consulta = Modelo.objects.filter(pk=pk, **{campo: nombre})
+    anterior = consulta.values_list(f'{campo}_srcset', flat=True).first()
+    if consulta.update(**{f'{campo}_srcset': srcset}):
+        # Al regenerar (backfill forzado) las variantes previas quedan huérfanas
+        for sobrante in nombres_srcset(anterior):
+            default_storage.delete(sobrante)
+        invalidar_catalogo(_slug_negocio(Modelo.objects.get(pk=pk)))
+    else:
+        for sobrante in nombres_srcset(srcset):
+            default_storage.delete(sobrante)
+
+def recuperar_tareas_atascadas():
+    """
+    Devuelve a pendientes las tareas que llevan en proceso más de
+    TAREA_TIMEOUT_MINUTOS: su worker murió o lo detuvieron a mitad de lote.
+    Cuenta como un intento fallido, para que una tarea que tumba al worker no
+    se repita sin fin. Devuelve cuántas se recuperaron.
+    """
+    ahora = timezone.now()
+    recuperadas = Tarea.objects.filter(
+        estado='en_proceso',
+        updated_at__lt=ahora - timedelta(minutes=settings.TAREA_TIMEOUT_MINUTOS)
+    ).update(
+        estado=Case(
+            When(intentos__gte=F('max_intentos') - 1, then=Value('fallida')),
+            default=Value('pendiente')
+        ),
+        intentos=F('intentos') + 1,
+        error='El worker no terminó la tarea en el tiempo límite',
+        ejecutar_despues=ahora,
+        updated_at=ahora
+    )
+    if recuperadas:
+        logger.warning(f"Tareas atascadas recuperadas: {recuperadas}")
+    return recuperadas
+
+def _reservar_tareas(limite):
+    """Marca como en proceso las próximas tareas pendientes sin bloquear a otros workers"""
+    with transaction.atomic():
+        tareas = list(
+            Tarea.objects.select_for_update(skip_locked=True).filter(
+                estado='pendiente',
+                ejecutar_despues__lte=timezone.now()
+            ).order_by('id')[:limite]
+        )
+        Tarea.objects.filter(pk__in=[t.pk for t in tareas]).update(
+            estado='en_proceso',
+            updated_at=timezone.now()
+        )
+    return tareas
+
+def ejecutar_tarea(tarea):
+    """Ejecuta una tarea y la reprograma con espera exponencial si falla"""
+    tarea.intentos += 1
+    try:
+        funcion = MANEJADORES.get(tarea.tipo)
+        if funcion is None:
+            raise ValueError(f"Tipo de tarea desconocido: {tarea.tipo}")
+        funcion(**tarea.datos)
+        tarea.estado = 'completada'
+        tarea.error = ''
+    except Exception as e:
+        logger.error(f"Error en {tarea}: {str(e)}")
+        tarea.error = str(e)
+        if tarea.intentos >= tarea.max_intentos:
+            tarea.estado = 'fallida'
+        else:
+            tarea.estado = 'pendiente'
+            tarea.ejecutar_despues = timezone.now() + timedelta(seconds=30 * 2 ** tarea.intentos)
+    tarea.save(update_fields=['estado', 'intentos', 'error', 'ejecutar_despues', 'updated_at'])
+    return tarea.estado == 'completada'
+
+def procesar_tareas(limite=20):
+    """Ejecuta un lote de tareas pendientes. Devuelve cuántas se ejecutaron."""
+    recuperar_tareas_atascadas()
+    tareas = _reservar_tareas(limite)
+    for tarea in tareas:
+        ejecutar_tarea(tarea)
+    return len(tareas)
@@ -3,23 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from ..models import InfoNegocio, Categoria, Producto, NegocioUser
-from ..serializers import (
+from ...models import Categoria, Producto
+from ...utils.negocio_actual import NegocioActualMixin
+from ...serializers import (
     InfoNegocioSerializer,
     CategoriaSerializer,
     ProductoSerializer
 )
 
-class AdminViewSet(viewsets.ViewSet):
+class AdminViewSet(NegocioActualMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     
-    def get_negocio(self, user):
-        try:
-            negocio_user = NegocioUser.objects.get(user=user)
-            return negocio_user.negocio
-        except NegocioUser.DoesNotExist:
-            return None
-
     @action(detail=False, methods=['get'])
     def my_business(self, request):
         """Obtener información del negocio del usuario autenticado"""
@@ -57,8 +51,6 @@ class AdminViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        productos = Producto.objects.filter(
-            subcategoria__categoria__negocio=negocio
-        )
+        productos = Producto.objects.filter(negocio=negocio)
         serializer = ProductoSerializer(productos, many=True)
         return Response(serializer.data) 
\ No newline at end of file
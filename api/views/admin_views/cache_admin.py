@@ -0,0 +1,14 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema
+from ...utils.cache import estadisticas_cache as obtener_estadisticas
+
+@extend_schema(
+    tags=['cache'],
+    description='Aciertos y fallos de la caché del catálogo por endpoint (solo staff)'
+)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def estadisticas_cache(request):
+    return Response(obtener_estadisticas())
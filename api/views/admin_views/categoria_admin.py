@@ -4,7 +4,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
-from ...models import Categoria, NegocioUser, Subcategoria
+from ...models import Categoria, Subcategoria
+from ...utils.negocio_actual import NegocioActualMixin
 from ...serializers import CategoriaSerializer, SubcategoriaSerializer, CategoriaDetalleSerializer
 
 @extend_schema_view(
@@ -71,17 +72,9 @@ from ...serializers import CategoriaSerializer, SubcategoriaSerializer, Categori
         }
     )
 )
-class AdminCategoriaViewSet(viewsets.ViewSet):
+class AdminCategoriaViewSet(NegocioActualMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
 
-    def get_negocio(self, user):
-        try:
-            # No filtramos por activo para admin
-            negocio_user = NegocioUser.objects.get(user=user)
-            return negocio_user.negocio
-        except NegocioUser.DoesNotExist:
-            return None
-
     @extend_schema(
         tags=['mi-negocio'],
         description='Gestionar categorías del negocio',
@@ -144,10 +137,10 @@ class AdminCategoriaViewSet(viewsets.ViewSet):
     @action(detail=True, methods=['put', 'patch', 'delete'])
     def manage_category(self, request, pk=None):
         """Gestionar una categoría específica"""
-        negocio_user = NegocioUser.objects.get(user=request.user)
+        negocio = self.get_negocio(request.user)
 
         try:
-            categoria = Categoria.objects.get(pk=pk, negocio=negocio_user.negocio)
+            categoria = Categoria.objects.get(pk=pk, negocio=negocio)
         except Categoria.DoesNotExist:
             return Response(
                 {'error': 'Categoría no encontrada'}, 
@@ -215,10 +208,10 @@ class AdminCategoriaViewSet(viewsets.ViewSet):
     @action(detail=True, methods=['put', 'patch', 'delete'], url_path='subcategories/(?P<subcategoria_pk>[^/.]+)')
     def manage_subcategory(self, request, pk=None, subcategoria_pk=None):
         """Gestionar una subcategoría específica"""
-        negocio_user = NegocioUser.objects.get(user=request.user)
+        negocio = self.get_negocio(request.user)
 
         try:
-            categoria = Categoria.objects.get(pk=pk, negocio=negocio_user.negocio)
+            categoria = Categoria.objects.get(pk=pk, negocio=negocio)
             subcategoria = Subcategoria.objects.get(pk=subcategoria_pk, categoria=categoria)
         except (Categoria.DoesNotExist, Subcategoria.DoesNotExist):
             return Response(
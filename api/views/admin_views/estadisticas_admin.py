@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from ...models import Pedido, VentaDiariaNegocio, VentaDiariaProducto
+from ...utils.estadisticas import ESTADOS_SIN_VENTA
+from ...utils.negocio_actual import NegocioActualMixin
+
+# Días que cubre la consulta si no se indica `desde`
+DIAS_POR_DEFECTO = 30
+MAX_DIAS = 366
+MAX_TOP = 50
+
+def _decimal(valor):
+    return str((valor or Decimal('0')).quantize(Decimal('0.01')))
+
+class EstadisticasNegocioView(NegocioActualMixin, APIView):
+    """Ventas del negocio por día, por estado y productos más vendidos, leídas de los acumulados diarios"""
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        tags=['mi-negocio'],
+        description=(
+            'Estadísticas de ventas del negocio en un rango de días: totales, desglose por '
+            'estado, serie diaria y productos más vendidos. Los pedidos cancelados no cuentan como venta'
+        ),
+        parameters=[
+            OpenApiParameter('desde', str, description=f'Primer día (AAAA-MM-DD). Por defecto, los últimos {DIAS_POR_DEFECTO} días'),
+            OpenApiParameter('hasta', str, description='Último día, inclusive (AAAA-MM-DD). Por defecto, hoy'),
+            OpenApiParameter('top', int, description=f'Número de productos más vendidos (máximo {MAX_TOP})'),
+        ],
+        responses={200: {'type': 'object'}, 400: {'type': 'object', 'properties': {'error': {'type': 'string'}}}}
+    )
+    def get(self, request):
+        negocio = self.get_negocio(request.user)
+        if not negocio:
+            return Response(
+                {'error': 'No tienes un negocio asociado'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            hasta = date.fromisoformat(request.query_params['hasta']) if request.query_params.get('hasta') else timezone.localdate()
+            desde = date.fromisoformat(request.query_params['desde']) if request.query_params.get('desde') else hasta - timedelta(days=DIAS_POR_DEFECTO - 1)
+            top = min(int(request.query_params.get('top', 10)), MAX_TOP)
+        except ValueError:
+            return Response(
+                {'error': 'Parámetros no válidos: use fechas AAAA-MM-DD y un top entero'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if desde > hasta:
+            return Response({'error': 'desde no puede ser posterior a hasta'}, status=status.HTTP_400_BAD_REQUEST)
+        if (hasta - desde).days >= MAX_DIAS:
+            return Response({'error': f'El rango no puede superar {MAX_DIAS} días'}, status=status.HTTP_400_BAD_REQUEST)
+
+        filas = list(VentaDiariaNegocio.objects.filter(
+            negocio=negocio,
+            fecha__gte=desde,
+            fecha__lte=hasta
+        ).values_list('fecha', 'estado', 'pedidos', 'unidades', 'ingresos'))
+
+        por_estado = {estado: {'pedidos': 0, 'unidades': 0, 'ingresos': Decimal('0')} for estado, _ in Pedido.ESTADO_CHOICES}
+        por_dia = {}
+        for fecha, estado, pedidos, unidades, ingresos in filas:
+            acumulado = por_estado.setdefault(estado, {'pedidos': 0, 'unidades': 0, 'ingresos': Decimal('0')})
+            acumulado['pedidos'] += pedidos
+            acumulado['unidades'] += unidades
+            acumulado['ingresos'] += ingresos
+            if estado in ESTADOS_SIN_VENTA:
+                continue
+            dia = por_dia.setdefault(fecha, {'pedidos': 0, 'unidades': 0, 'ingresos': Decimal('0')})
+            dia['pedidos'] += pedidos
+            dia['unidades'] += unidades
+            dia['ingresos'] += ingresos
+
+        ventas = [valores for estado, valores in por_estado.items() if estado not in ESTADOS_SIN_VENTA]
+        pedidos = sum(valores['pedidos'] for valores in ventas)
+        ingresos = sum((valores['ingresos'] for valores in ventas), Decimal('0'))
+
+        productos_top = VentaDiariaProducto.objects.filter(
+            negocio=negocio,
+            fecha__gte=desde,
+            fecha__lte=hasta
+        ).values('producto_id', 'producto__nombre').annotate(
+            total_unidades=Sum('unidades'),
+            total_ingresos=Sum('ingresos'),
+            total_pedidos=Sum('pedidos')
+        ).order_by('-total_ingresos', 'producto_id')[:max(top, 0)]
+
+        return Response({
+            'desde': desde,
+            'hasta': hasta,
+            'resumen': {
+                'pedidos': pedidos,
+                'unidades': sum(valores['unidades'] for valores in ventas),
+                'ingresos': _decimal(ingresos),
+                'ticket_medio': _decimal(ingresos / pedidos if pedidos else None),
+            },
+            'por_estado': {
+                estado: {**valores, 'ingresos': _decimal(valores['ingresos'])}
+                for estado, valores in por_estado.items()
+            },
+            'por_dia': [
+                {'fecha': fecha, **valores, 'ingresos': _decimal(valores['ingresos'])}
+                for fecha, valores in sorted(por_dia.items())
+            ],
+            'productos_top': [
+                {
+                    'producto_id': fila['producto_id'],
+                    'nombre': fila['producto__nombre'],
+                    'pedidos': fila['total_pedidos'],
+                    'unidades': fila['total_unidades'],
+                    'ingresos': _decimal(fila['total_ingresos']),
+                }
+                for fila in productos_top
+            ],
+        })
@@ -0,0 +1,27 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema
+from ...utils.cache import estadisticas_cache
+from ...utils.metricas import metricas_combinadas, reiniciar, resumen
+
+@extend_schema(
+    tags=['metricas'],
+    description=(
+        'Consultas, tiempo en BD, tiempo en la vista fuera de la BD (serialización), tiempo '
+        'de renderizado y tiempo total por vista '
+        '(media, p50, p95, p99 y máximo), más los aciertos de caché del catálogo. '
+        'DELETE reinicia las métricas de este proceso (solo staff)'
+    )
+)
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def metricas(request):
+    if request.method == 'DELETE':
+        reiniciar()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response({
+        'vistas': resumen(metricas_combinadas()),
+        'cache': estadisticas_cache()
+    })
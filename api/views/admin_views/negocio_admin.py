@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
 from ...models import InfoNegocio, NegocioUser, TiendaTema, Categoria, Subcategoria, Producto
+from ...utils.negocio_actual import NegocioActualMixin
 from ...serializers import InfoNegocioSerializer, TiendaTemaSerializer
 
 @extend_schema_view(
@@ -52,16 +53,9 @@ from ...serializers import InfoNegocioSerializer, TiendaTemaSerializer
         }
     )
 )
-class AdminNegocioViewSet(viewsets.ViewSet):
+class AdminNegocioViewSet(NegocioActualMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     
-    def get_negocio(self, user):
-        try:
-            negocio_user = NegocioUser.objects.get(user=user)
-            return negocio_user.negocio
-        except NegocioUser.DoesNotExist:
-            return None
-
     @extend_schema(
         tags=['mi-negocio'],
         description='Crear un nuevo negocio para el usuario autenticado',
@@ -195,9 +189,9 @@ class AdminNegocioViewSet(viewsets.ViewSet):
         """Obtener resumen de los recursos del usuario"""
         try:
             # Obtener el negocio del usuario
-            negocio_user = NegocioUser.objects.filter(user=request.user).first()
+            negocio = self.get_negocio(request.user)
             
-            if not negocio_user:
+            if not negocio:
                 return Response({
                     'negocio': False,
                     'categoria': False,
@@ -205,8 +199,6 @@ class AdminNegocioViewSet(viewsets.ViewSet):
                     'producto': False
                 })
 
-            negocio = negocio_user.negocio
-
             # Verificar si tiene categorías
             tiene_categorias = Categoria.objects.filter(negocio=negocio).exists()
             
@@ -216,9 +208,7 @@ class AdminNegocioViewSet(viewsets.ViewSet):
             ).exists()
             
             # Verificar si tiene productos
-            tiene_productos = Producto.objects.filter(
-                subcategoria__categoria__negocio=negocio
-            ).exists()
+            tiene_productos = Producto.objects.filter(negocio=negocio).exists()
 
             return Response({
                 'negocio': True,
@@ -1,10 +1,17 @@
-from rest_framework import viewsets, status, permissions
+from rest_framework import mixins, viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
+from datetime import datetime, time, timedelta
 from django.db.models import Q
-from ...models import Pedido, NegocioUser, PedidoProducto
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from ...models import Pedido, PedidoProducto
+from ...utils.negocio_actual import NegocioActualMixin
+from ...utils.pagination import PedidoCursorPagination
+from ...utils.reservas import EstadoNoPermitido, cambiar_estado_pedido
 from ...serializers.admin_serializers.pedido_admin_serilizers import (
     PedidoAdminSerializer, 
     
@@ -13,7 +20,13 @@ from ...serializers.admin_serializers.pedido_admin_serilizers import (
 @extend_schema_view(
     list=extend_schema(
         tags=['pedidos-admin'],
-        description='Listar pedidos del negocio',
+        description='Bandeja de pedidos del negocio, del más reciente al más antiguo, con paginación por cursor',
+        parameters=[
+            OpenApiParameter('estado', str, description='Estado o estados separados por comas'),
+            OpenApiParameter('desde', str, description='Fecha (AAAA-MM-DD) o fecha y hora ISO inicial'),
+            OpenApiParameter('hasta', str, description='Fecha (AAAA-MM-DD, inclusive) o fecha y hora ISO final'),
+            OpenApiParameter('cliente', str, description='Nombre, email o teléfono del cliente'),
+        ],
         responses={
             200: PedidoAdminSerializer(many=True),
             404: {
@@ -82,38 +95,82 @@ from ...serializers.admin_serializers.pedido_admin_serilizers import (
         ]
     )
 )
-class AdminPedidoViewSet(viewsets.ModelViewSet):
+class AdminPedidoViewSet(NegocioActualMixin,
+                         mixins.CreateModelMixin,
+                         mixins.ListModelMixin,
+                         mixins.RetrieveModelMixin,
+                         viewsets.GenericViewSet):
     """
-    ViewSet para que los administradores gestionen los pedidos de su negocio
+    ViewSet para que los administradores gestionen los pedidos de su negocio.
+    Sin update ni destroy: el estado solo cambia por `actualizar_estado`, que
+    mantiene la reserva de stock, y los pedidos no se borran.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = PedidoAdminSerializer
+    pagination_class = PedidoCursorPagination
 
     # def get_permissions(self):
     #     if self.action == 'create':
     #         return [permissions.AllowAny()]  # Permitir acceso a todos para crear
     #     return super().get_permissions()  # Usar permisos por defecto para otras acciones
 
-    
-    def get_negocio(self, user):
-        try:
-            negocio_user = NegocioUser.objects.get(user=user) 
-            return negocio_user.negocio
-        except NegocioUser.DoesNotExist:
-            return None
-    
     def get_queryset(self):
         negocio = self.get_negocio(self.request.user)
         if not negocio:
             return Pedido.objects.none()
-        
-        # Obtener pedidos que contengan productos de categorías del negocio
-        return Pedido.objects.filter(
-            items__producto__subcategoria__categoria__negocio=negocio
-        ).prefetch_related(
-            'items',
-            'items__producto'
-        ).distinct().order_by('-fecha_pedido')
+
+        # Índice (negocio, estado, -fecha_pedido); las líneas llevan copia del producto
+        queryset = Pedido.objects.filter(negocio=negocio).prefetch_related('items').order_by('-fecha_pedido', '-id')
+        if self.action == 'list':
+            queryset = self.filtrar_bandeja(queryset)
+        return queryset
+
+    def filtrar_bandeja(self, queryset):
+        params = self.request.query_params
+
+        estados = [estado for estado in params.get('estado', '').split(',') if estado]
+        if estados:
+            invalidos = set(estados) - set(dict(Pedido.ESTADO_CHOICES))
+            if invalidos:
+                raise ValidationError({'estado': f"Estado no válido: {', '.join(sorted(invalidos))}"})
+            queryset = queryset.filter(estado__in=estados)
+
+        desde = params.get('desde')
+        if desde:
+            queryset = queryset.filter(fecha_pedido__gte=self._parsear_fecha('desde', desde))
+
+        hasta = params.get('hasta')
+        if hasta:
+            fecha = self._parsear_fecha('hasta', hasta)
+            if parse_datetime(hasta) is None:
+                # Una fecha sin hora incluye el día completo
+                queryset = queryset.filter(fecha_pedido__lt=fecha + timedelta(days=1))
+            else:
+                queryset = queryset.filter(fecha_pedido__lte=fecha)
+
+        cliente = params.get('cliente', '').strip()
+        if cliente:
+            queryset = queryset.filter(
+                Q(nombre_cliente__icontains=cliente) |
+                Q(email_cliente__icontains=cliente) |
+                Q(telefono_cliente__icontains=cliente)
+            )
+        return queryset
+
+    def _parsear_fecha(self, nombre, valor):
+        """Acepta AAAA-MM-DD o fecha y hora ISO; devuelve un datetime con zona horaria"""
+        try:
+            fecha = parse_datetime(valor)
+            if fecha is None:
+                dia = parse_date(valor)
+                if dia is None:
+                    raise ValueError
+                fecha = datetime.combine(dia, time.min)
+        except ValueError:
+            raise ValidationError({nombre: 'Fecha no válida, use AAAA-MM-DD o formato ISO'})
+        if timezone.is_naive(fecha):
+            fecha = timezone.make_aware(fecha)
+        return fecha
     
     @action(detail=True, methods=['patch'])
     def actualizar_estado(self, request, pk=None):
@@ -132,8 +189,11 @@ class AdminPedidoViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        pedido.estado = nuevo_estado
-        pedido.save()
+        try:
+            # Cancelar devuelve el stock reservado; un pedido cancelado no se reabre
+            pedido = cambiar_estado_pedido(pedido, nuevo_estado)
+        except EstadoNoPermitido as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = self.get_serializer(pedido)
         return Response(serializer.data)
@@ -142,7 +202,7 @@ class AdminPedidoViewSet(viewsets.ModelViewSet):
         negocio = self.get_negocio(self.request.user)
         permission_classes = [permissions.AllowAny]
         if not negocio:
-            raise serializer.ValidationError(
+            raise ValidationError(
                 "No tienes un negocio asociado"
             )
         serializer.save(negocio=negocio)
\ No newline at end of file
@@ -3,8 +3,11 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from ...models import Producto, NegocioUser
+from rest_framework.parsers import MultiPartParser, FormParser
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from ...models import Producto
+from ...utils.importacion import ErrorImportacion, FORMATOS, ImportadorProductos, detectar_formato, leer_filas
+from ...utils.negocio_actual import NegocioActualMixin
 from ...serializers import ProductoSerializer
 
 @extend_schema_view(
@@ -24,6 +27,37 @@ from ...serializers import ProductoSerializer
             }
         }
     ),
+    importar=extend_schema(
+        tags=['mi-negocio'],
+        description=(
+            'Importación masiva de productos desde un archivo CSV (con cabecera) o JSON Lines '
+            'en el campo "archivo". Columnas: nombre, precio, categoria, subcategoria y '
+            'opcionalmente descripcion, stock, descuento y activo. Las categorías y subcategorías '
+            'se buscan por nombre y se crean si no existen; los productos con el mismo nombre se '
+            'actualizan. Devuelve los errores por fila'
+        ),
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'archivo': {'type': 'string', 'format': 'binary'},
+                    'formato': {'type': 'string', 'enum': ['csv', 'json']},
+                },
+                'required': ['archivo']
+            }
+        },
+        parameters=[
+            OpenApiParameter('simulacion', bool, description='Valida y cuenta los cambios sin guardar nada'),
+        ],
+        responses={
+            200: {'type': 'object'},
+            400: {
+                'type': 'object',
+                'description': 'Archivo no válido; si se cortó a mitad incluye además lo importado hasta ese punto',
+                'properties': {'error': {'type': 'string'}}
+            }
+        }
+    ),
     manage_product=extend_schema(
         tags=['mi-negocio'],
         description='Gestionar un producto específico',
@@ -40,16 +74,9 @@ from ...serializers import ProductoSerializer
         }
     )
 )
-class AdminProductoViewSet(viewsets.ViewSet):
+class AdminProductoViewSet(NegocioActualMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     
-    def get_negocio(self, user):
-        try:
-            negocio_user = NegocioUser.objects.get(user=user)
-            return negocio_user.negocio
-        except NegocioUser.DoesNotExist:
-            return None
-
     @action(detail=False, methods=['get', 'post'])
     def my_products(self, request):
         """Obtener y crear productos del negocio del usuario autenticado"""
@@ -64,9 +91,7 @@ class AdminProductoViewSet(viewsets.ViewSet):
             )
         
         if request.method == 'GET':
-            productos = Producto.objects.filter(
-                subcategoria__categoria__negocio=negocio
-            ).select_related(
+            productos = Producto.objects.filter(negocio=negocio).select_related(
                 'subcategoria',
                 'subcategoria__categoria'
             ).values(
@@ -117,6 +142,45 @@ class AdminProductoViewSet(viewsets.ViewSet):
             print("DEBUG - Errores del serializer:", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
+    def importar(self, request):
+        """Importación masiva de productos desde CSV o JSON Lines"""
+        negocio = self.get_negocio(request.user)
+        if not negocio:
+            return Response(
+                {'error': 'No tienes un negocio asociado'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response(
+                {'error': 'Debe enviar el archivo en el campo "archivo"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        simulacion = str(request.query_params.get(
+            'simulacion', request.data.get('simulacion', '')
+        )).lower() in ('1', 'true', 'si', 'sí')
+        formato = request.data.get('formato')
+        if formato and formato not in FORMATOS:
+            return Response(
+                {'error': f"Formato no válido, use {' o '.join(FORMATOS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            formato = formato or detectar_formato(archivo.name)
+        except ErrorImportacion as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        resultado = ImportadorProductos(negocio, simulacion=simulacion).importar(
+            leer_filas(archivo, formato)
+        )
+        if 'error' in resultado:
+            # El archivo se cortó a mitad: se devuelve lo importado hasta ese punto
+            return Response(resultado, status=status.HTTP_400_BAD_REQUEST)
+        return Response(resultado)
+
     def put(self, request, pk=None):
         """Actualizar un producto completo"""
         negocio = self.get_negocio(request.user)
@@ -129,7 +193,7 @@ class AdminProductoViewSet(viewsets.ViewSet):
         try:
             producto = Producto.objects.get(
                 pk=pk,
-                subcategoria__categoria__negocio=negocio
+                negocio=negocio
             )
         except Producto.DoesNotExist:
             return Response(
@@ -163,7 +227,7 @@ class AdminProductoViewSet(viewsets.ViewSet):
         try:
             producto = Producto.objects.get(
                 pk=pk,
-                subcategoria__categoria__negocio=negocio
+                negocio=negocio
             )
         except Producto.DoesNotExist:
             return Response(
@@ -202,7 +266,7 @@ class AdminProductoViewSet(viewsets.ViewSet):
         try:
             producto = Producto.objects.get(
                 pk=pk,
-                subcategoria__categoria__negocio=negocio
+                negocio=negocio
             )
         except Producto.DoesNotExist:
             return Response(
@@ -6,10 +6,12 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework import viewsets, permissions, status
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
 from ...serializers.user_auth_serializers import UserAuthSerializer, ChangePasswordSerializer
 import logging
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from ...models.negocio_models import NegocioUser
+from ...utils.autenticacion import resumen_negocio_login
 
 logger = logging.getLogger(__name__)
 
@@ -26,41 +28,48 @@ class CustomAuthToken(ObtainAuthToken):
             username = request.data.get('username')
             password = request.data.get('password')
 
+            if not username or not password:
+                return Response({
+                    'error': 'Debe proporcionar usuario y contraseña'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
             logger.info(f"Intento de login con: {username}")
 
-            # Si parece ser un email, buscar el usuario correspondiente
-            if '@' in username:
-                try:
-                    user = User.objects.get(email=username)
-                    username = user.username
-                    logger.info(f"Email encontrado, username correspondiente: {username}")
-                except User.DoesNotExist:
-                    logger.warning(f"No se encontró usuario con email: {username}")
-                    return Response({
-                        'error': 'No existe usuario con ese email'
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-            # Intentar autenticar al usuario
-            user = authenticate(username=username, password=password)
+            # EmailOrUsernameBackend resuelve email o username, token y negocio en una consulta
+            user = authenticate(request, username=username, password=password)
             
             if user is None:
+                # Solo en el caso de error se distingue un email inexistente o repetido
+                if '@' in username:
+                    cuentas = User.objects.filter(email=username)[:2].count()
+                    if cuentas == 0:
+                        logger.warning(f"No se encontró usuario con email: {username}")
+                        return Response({
+                            'error': 'No existe usuario con ese email'
+                        }, status=status.HTTP_404_NOT_FOUND)
+                    if cuentas > 1:
+                        return Response({
+                            'error': 'Hay varias cuentas con ese email, inicie sesión con su nombre de usuario'
+                        }, status=status.HTTP_409_CONFLICT)
+
                 logger.error(f"Autenticación fallida para usuario: {username}")
                 return Response({
                     'error': 'Credenciales inválidas'
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
-            # Si la autenticación es exitosa, generar o recuperar el token
-            token, created = Token.objects.get_or_create(user=user)
+            # Si la autenticación es exitosa, recuperar el token (ya cargado) o generarlo
+            try:
+                token = user.auth_token
+            except Token.DoesNotExist:
+                try:
+                    with transaction.atomic():
+                        token = Token.objects.create(user=user)
+                except IntegrityError:
+                    # Otro login simultáneo ya lo creó
+                    token = Token.objects.get(user=user)
             
             # Obtener el negocio asociado al usuario si existe
-            negocio_user = NegocioUser.objects.filter(user=user).first()
-            negocio_data = None
-            if negocio_user:
-                negocio_data = {
-                    'id': negocio_user.negocio.id,
-                    'nombre': negocio_user.negocio.nombre,
-                    'slug': negocio_user.negocio.slug
-                }
+            negocio_data = resumen_negocio_login(user)
             
             logger.info(f"Login exitoso para usuario: {user.username}")
             
@@ -12,5 +12,5 @@ class BaseNegocioViewSet(viewsets.ModelViewSet):
         elif self.queryset.model == Subcategoria:
             return qs.filter(categoria__negocio__slug=negocio_slug)
         elif self.queryset.model == Producto:
-            return qs.filter(subcategoria__categoria__negocio__slug=negocio_slug)
+            return qs.filter(negocio__slug=negocio_slug)
         return qs
\ No newline at end of file
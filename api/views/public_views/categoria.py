@@ -8,13 +8,16 @@ from ...serializers.categoria_serializers import (
      SubcategoriaDetalleSerializer,
     
 )
-from ...serializers.producto_serializers import ProductoSerializer
-from ...serializers.subcategoria_serializers import SubcategoriaSerializer
+from ...serializers.producto_serializers import ProductoSerializer, ProductoTarjetaSerializer
+from ...serializers.subcategoria_serializers import SubcategoriaSerializer, SubcategoriaConteoSerializer
 from .base import BaseNegocioViewSet
 from ...utils.permissions import IsNegocioOwnerOrReadOnly
+from ...utils.cache import cachear_respuesta
+from ...utils.pagination import ProductPagination
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 import logging
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from rest_framework import viewsets
 
 logger = logging.getLogger(__name__)
@@ -34,32 +37,64 @@ class CategoriaViewSet(viewsets.ReadOnlyModelViewSet):
             subcategorias__productos__activo=True
         ).distinct()
 
+    @cachear_respuesta('tienda-categorias', alcance='negocio')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cachear_respuesta('tienda-categoria', alcance='negocio')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        tags=['categorias'],
+        description='Categoría con sus subcategorías (con número de productos) y sus productos paginados',
+        parameters=[
+            OpenApiParameter('subcategoria', int, description='Filtrar por subcategoría'),
+            OpenApiParameter('search', str, description='Buscar por nombre'),
+            OpenApiParameter('formato', str, enum=['tarjeta'], description='"tarjeta" para una representación ligera de los productos'),
+            OpenApiParameter('page', int, description='Número de página'),
+            OpenApiParameter('page_size', int, description='Productos por página (máximo 100)'),
+        ]
+    )
     @action(detail=True, methods=['get'])
+    @cachear_respuesta('tienda-categoria-detalles', alcance='negocio')
     def detalles(self, request, slug, pk=None):
         categoria = self.get_object()
         subcategoria_id = request.query_params.get('subcategoria', None)
         search_query = request.query_params.get('search', '').strip()
-        
-        # Filtrar subcategorías que tienen productos
-        subcategorias = categoria.subcategorias.filter(
-            productos__activo=True
-        ).distinct()
-        
+        tarjeta = request.query_params.get('formato') == 'tarjeta'
+
+        # Subcategorías con productos activos y su conteo, en una sola consulta
+        subcategorias = categoria.subcategorias.annotate(
+            total_productos=Count('productos', filter=Q(productos__activo=True))
+        ).filter(total_productos__gt=0)
+
         productos = Producto.objects.filter(
             subcategoria__categoria=categoria,
             activo=True
-        )
-        
+        ).order_by('-id')
+        if tarjeta:
+            productos = productos.only(*ProductoTarjetaSerializer.CAMPOS_CONSULTA)
+        else:
+            productos = productos.select_related('negocio', 'negocio__tema')
+
         if subcategoria_id:
             productos = productos.filter(subcategoria_id=subcategoria_id)
-        
+
         if search_query:
             productos = productos.filter(nombre__icontains=search_query)
-        
+
+        # Número de consultas fijo: categoría, subcategorías, conteo y página
+        paginador = ProductPagination()
+        pagina = paginador.paginate_queryset(productos, request, view=self)
+        serializer_class = ProductoTarjetaSerializer if tarjeta else ProductoSerializer
+
         return Response({
             'categoria': CategoriaSerializer(categoria).data,
-            'subcategorias': SubcategoriaSerializer(subcategorias, many=True).data,
-            'productos': ProductoSerializer(productos, many=True).data
+            'subcategorias': SubcategoriaConteoSerializer(subcategorias, many=True).data,
+            'productos': paginador.get_paginated_response(
+                serializer_class(pagina, many=True).data
+            ).data
         })
 
     @action(detail=True, methods=['get'], url_path='productos/subcategoria')
@@ -81,8 +116,8 @@ class CategoriaViewSet(viewsets.ReadOnlyModelViewSet):
                 subcategoria=subcategoria,
                 activo=True
             ).select_related(
-                'subcategoria',
-                'subcategoria__categoria'
+                'negocio',
+                'negocio__tema'
             )
             
             # Serializar y retornar
@@ -2,7 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from ...models import Licencia, InfoNegocio, NegocioUser
+from ...models import Licencia, NegocioUser
 from ...serializers import LicenciaSerializer
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
@@ -55,43 +55,33 @@ class LicenciaEstadoView(APIView):
     )
     def get(self, request):
         try:
-            # Obtener el usuario del negocio
-            negocio_user = NegocioUser.objects.get(user=request.user)
-            
-            # Obtener el negocio asociado al usuario
-            negocio = InfoNegocio.objects.get(usuarios=negocio_user)
-            
-            # Obtener la licencia del negocio
-            licencia = Licencia.objects.get(negocio=negocio)
-            
-            # Verificar el estado actual de la licencia
-            licencia.verificar_estado()
-            
+            # Licencia, negocio y estado en una sola consulta con JOIN
+            licencia = Licencia.objects.con_estado().select_related('negocio').filter(
+                negocio__usuarios__user=request.user
+            ).first()
+
+            if licencia is None:
+                # Solo en el caso de error se averigua qué falta para el mensaje
+                if not NegocioUser.objects.filter(user=request.user).exists():
+                    return Response(
+                        {'error': 'No se encontró el usuario en el sistema'},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+                return Response(
+                    {'error': 'El negocio no tiene una licencia asignada'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
             # Preparar la respuesta
             data = {
-                'esta_activa': licencia.esta_activa,
+                'esta_activa': licencia.esta_vigente,
                 'dias_restantes': licencia.dias_restantes,
                 'fecha_vencimiento': licencia.fecha_vencimiento,
-                'negocio_activo': negocio.activo
+                'negocio_activo': licencia.negocio.activo
             }
-            
+
             return Response(data, status=status.HTTP_200_OK)
-            
-        except NegocioUser.DoesNotExist:
-            return Response(
-                {'error': 'No se encontró el usuario en el sistema'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        except InfoNegocio.DoesNotExist:
-            return Response(
-                {'error': 'No se encontró un negocio asociado a este usuario'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        except Licencia.DoesNotExist:
-            return Response(
-                {'error': 'El negocio no tiene una licencia asignada'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+
         except Exception as e:
             return Response(
                 {'error': str(e)},
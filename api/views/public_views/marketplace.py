@@ -1,13 +1,10 @@
 from rest_framework import viewsets, permissions
-from rest_framework.pagination import PageNumberPagination
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from ...models.producto_models import Producto
 from ...serializers.producto_serializers import ProductoSerializer
-
-class ProductoPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+from ...utils.busqueda import buscar_productos
+from ...utils.pagination import ProductPagination
+from ...utils.cache import cachear_respuesta
 
 @extend_schema_view(
     list=extend_schema(
@@ -18,7 +15,7 @@ class ProductoPagination(PageNumberPagination):
             {'name': 'municipio', 'type': str, 'description': 'Filtrar por municipio'},
             {'name': 'categoria', 'type': int, 'description': 'Filtrar por categoría'},
             {'name': 'subcategoria', 'type': int, 'description': 'Filtrar por subcategoría'},
-            {'name': 'search', 'type': str, 'description': 'Buscar por nombre de producto'},
+            {'name': 'search', 'type': str, 'description': 'Buscar por nombre o descripción, ordenado por relevancia'},
         ]
     ),
     retrieve=extend_schema(
@@ -28,26 +25,34 @@ class ProductoPagination(PageNumberPagination):
 )
 class MarketplaceProductoViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ProductoSerializer
-    pagination_class = ProductoPagination
+    pagination_class = ProductPagination
     permission_classes = [permissions.AllowAny]
 
+    @cachear_respuesta('marketplace-productos')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cachear_respuesta('marketplace-producto')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_queryset(self):
         # Solo filtramos por activo en las vistas públicas del marketplace
         queryset = Producto.objects.filter(
             activo=True,
-            subcategoria__categoria__negocio__activo=True  # Filtramos negocios activos
+            negocio__activo=True  # Filtramos negocios activos
         )
         
-        # Búsqueda por nombre
+        # Búsqueda por nombre y descripción usando el índice de tokens
         search_query = self.request.query_params.get('search', '').strip()
         if search_query:
-            queryset = queryset.filter(nombre__icontains=search_query)
+            queryset = buscar_productos(queryset, search_query)
         
         # Mantener los filtros existentes
         negocio_slug = self.request.query_params.get('negocio', None)
         if negocio_slug:
             queryset = queryset.filter(
-                subcategoria__categoria__negocio__slug=negocio_slug
+                negocio__slug=negocio_slug
             )
 
         categoria_id = self.request.query_params.get('categoria', None)
@@ -62,17 +67,21 @@ class MarketplaceProductoViewSet(viewsets.ReadOnlyModelViewSet):
         provincia = self.request.query_params.get('provincia', None)
         if provincia:
             queryset = queryset.filter(
-                subcategoria__categoria__negocio__provincia__iexact=provincia
+                negocio__provincia__iexact=provincia
             )
 
         municipio = self.request.query_params.get('municipio', None)
         if municipio:
             queryset = queryset.filter(
-                subcategoria__categoria__negocio__municipio__iexact=municipio
+                negocio__municipio__iexact=municipio
             )
 
-        return queryset.select_related(
-            'subcategoria',
-            'subcategoria__categoria',
-            'subcategoria__categoria__negocio'
-        ).order_by('-id')
\ No newline at end of file
+        queryset = queryset.select_related(
+            'negocio',
+            'negocio__tema'
+        )
+
+        # Con búsqueda, los más relevantes primero
+        if 'relevancia' in queryset.query.annotations:
+            return queryset.order_by('-relevancia', '-id')
+        return queryset.order_by('-id')
\ No newline at end of file
@@ -2,7 +2,7 @@ from rest_framework import viewsets, permissions
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Q, Count
 from ...models.negocio_models import InfoNegocio, NegocioUser
 from ...serializers.info_negocio_serializers import InfoNegocioSerializer, NegocioDetalleSerializer
 from ...utils.permissions import IsNegocioOwnerOrReadOnly
@@ -56,6 +56,11 @@ class InfoNegocioViewSet(viewsets.ModelViewSet):
             # Para vistas públicas, solo mostramos negocios activos
             queryset = InfoNegocio.objects.filter(activo=True)
 
+        # Tema y cantidad de productos en la misma consulta para evitar N+1
+        queryset = queryset.select_related('tema').annotate(
+            cantidad_productos=Count('productos')
+        ).order_by('id')
+
         provincia = self.request.query_params.get('provincia')
         municipio = self.request.query_params.get('municipio')
         
@@ -91,27 +96,22 @@ class InfoNegocioViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
         page = self.paginate_queryset(queryset)
-        
+
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            negocios = serializer.data
-            for negocio in negocios:
-                obj = queryset.get(id=negocio['id'])
-                negocio['ubicacion'] = {
-                    'provincia': obj.provincia,
-                    'municipio': obj.municipio
-                }
-            return self.get_paginated_response(negocios)
+            return self.get_paginated_response(self._agregar_ubicacion(serializer.data))
 
         serializer = self.get_serializer(queryset, many=True)
-        negocios = serializer.data
+        return Response(self._agregar_ubicacion(serializer.data))
+
+    def _agregar_ubicacion(self, negocios):
+        """Construye la ubicación a partir de los datos ya serializados"""
         for negocio in negocios:
-            obj = queryset.get(id=negocio['id'])
             negocio['ubicacion'] = {
-                'provincia': obj.provincia,
-                'municipio': obj.municipio
+                'provincia': negocio.get('provincia'),
+                'municipio': negocio.get('municipio')
             }
-        return Response(negocios)
+        return negocios
 
     def perform_create(self, serializer):
         negocio = serializer.save()
@@ -5,12 +5,14 @@ from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 from ...models import Pedido
 from ...serializers import PedidoSerializer, PedidoDetalleSerializer
+from ...utils.pagination import PedidoCursorPagination
+from ...utils.reservas import EstadoNoPermitido, cancelar_pedido
 from decimal import Decimal
 
 @extend_schema_view(
     list=extend_schema(
         tags=['pedidos'],
-        description='Listar pedidos del usuario autenticado',
+        description='Historial de pedidos del usuario autenticado, del más reciente al más antiguo, con paginación por cursor',
         responses={
             200: PedidoDetalleSerializer(many=True)
         }
@@ -78,12 +80,14 @@ class PedidoViewSet(viewsets.ModelViewSet):
     """
     serializer_class = PedidoSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PedidoCursorPagination
     http_method_names = ['get', 'post']  # Solo permitir GET y POST
     
     def get_queryset(self):
+        # Índice (user, -fecha_pedido); las líneas llevan copia del producto, sin join a Producto
         return Pedido.objects.filter(
-            email_cliente=self.request.user.email
-        ).order_by('-fecha_pedido')
+            user=self.request.user
+        ).prefetch_related('items').order_by('-fecha_pedido', '-id')
     
     def get_serializer_class(self):
         if self.action in ['retrieve', 'list']:
@@ -100,12 +104,12 @@ class PedidoViewSet(viewsets.ModelViewSet):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            # Guardar el pedido
-            pedido = serializer.save()
+            # Guardar el pedido enlazado al usuario para su historial
+            pedido = serializer.save(user=request.user)
             
             # Retornar el pedido creado con el serializer detallado
             return Response(
-                PedidoDetalleSerializer(pedido).data,
+                PedidoDetalleSerializer(pedido, context=self.get_serializer_context()).data,
                 status=status.HTTP_201_CREATED
             )
         except Exception as e:
@@ -119,17 +123,15 @@ class PedidoViewSet(viewsets.ModelViewSet):
         try:
             pedido = self.get_object()
             
-            # Verificar si el pedido está pendiente
-            if pedido.estado != 'pendiente':
+            # El estado se comprueba con el pedido bloqueado, no antes
+            try:
+                cancelar_pedido(pedido, solo_pendientes=True)
+            except EstadoNoPermitido as e:
                 return Response(
-                    {'error': 'Solo se pueden cancelar pedidos pendientes'},
+                    {'error': str(e)},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Cancelar el pedido
-            pedido.estado = 'cancelado'
-            pedido.save()
-            
             return Response(
                 {'message': 'Pedido cancelado exitosamente'},
                 status=status.HTTP_200_OK
@@ -16,7 +16,10 @@ import logging
 logger = logging.getLogger(__name__)
 
 class ProductoViewSet(BaseNegocioViewSet):
-    queryset = Producto.objects.filter(activo=True)
+    queryset = Producto.objects.filter(activo=True).select_related(
+        'negocio',
+        'negocio__tema'
+    )
     serializer_class = ProductoSerializer
     pagination_class = ProductPagination
     permission_classes = [IsNegocioOwnerOrReadOnly]
@@ -55,8 +58,8 @@ class ProductoViewSet(BaseNegocioViewSet):
                 subcategoria__categoria=categoria,
                 activo=True
             ).select_related(
-                'subcategoria',
-                'subcategoria__categoria'
+                'negocio',
+                'negocio__tema'
             )
             
             # Serializar y retornar
@@ -94,8 +97,8 @@ class ProductoViewSet(BaseNegocioViewSet):
                 subcategoria=subcategoria,
                 activo=True
             ).select_related(
-                'subcategoria',
-                'subcategoria__categoria'
+                'negocio',
+                'negocio__tema'
             )
             
             # Serializar y retornar
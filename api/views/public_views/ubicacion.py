@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from ...utils.ubicaciones_cuba import PROVINCIAS, get_municipios as get_municipios_cuba
 from drf_spectacular.utils import extend_schema
+from ...utils.cache import cachear_respuesta
 
 @extend_schema(
     tags=['ubicaciones'],
@@ -10,6 +11,7 @@ from drf_spectacular.utils import extend_schema
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Explícitamente permitir acceso público
+@cachear_respuesta('provincias', alcance=None)
 def get_provincias(request):
     return Response(PROVINCIAS)
 
@@ -19,6 +21,7 @@ def get_provincias(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Explícitamente permitir acceso público
+@cachear_respuesta('municipios', alcance=None)
 def get_municipios(request, provincia):
     municipios = get_municipios_cuba(provincia)
     if not municipios:
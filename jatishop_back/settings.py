@@ -54,6 +54,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.MetricasMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -174,9 +175,50 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Caché
+# Con varios procesos usar CACHE_BACKEND=file para que la invalidación sea compartida
+if os.getenv('CACHE_BACKEND') == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION') or os.path.join(BASE_DIR, 'cache'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'jatishop',
+        }
+    }
+
+# Segundos que se guarda una respuesta del catálogo público
+CATALOGO_CACHE_TIMEOUT = int(os.getenv('CATALOGO_CACHE_TIMEOUT') or 300)
+
+# Minutos que un pedido pendiente mantiene reservado su stock antes de cancelarse
+RESERVA_STOCK_MINUTOS = int(os.getenv('RESERVA_STOCK_MINUTOS') or 1440)
+
+# Segundos que se recuerda a qué usuario pertenece un token (el usuario se relee siempre)
+TOKEN_CACHE_TIMEOUT = int(os.getenv('TOKEN_CACHE_TIMEOUT') or 60)
+
+# Minutos tras los que una tarea en proceso se da por abandonada (worker caído) y vuelve a pendiente
+TAREA_TIMEOUT_MINUTOS = int(os.getenv('TAREA_TIMEOUT_MINUTOS') or 30)
+
+# Si es False los procesos web no arrancan el scheduler y se usa `manage.py run_scheduler`
+SCHEDULER_AUTOSTART = os.getenv('SCHEDULER_AUTOSTART', 'True') == 'True'
+
+# Métricas por vista (consultas y tiempos) y umbral del log de peticiones lentas
+METRICAS_ACTIVAS = os.getenv('METRICAS_ACTIVAS', 'True') == 'True'
+METRICAS_UMBRAL_LENTO_MS = int(os.getenv('METRICAS_UMBRAL_LENTO_MS') or 1000)
+
+# Login por email o username en una sola consulta
+AUTHENTICATION_BACKENDS = [
+    'api.utils.autenticacion.EmailOrUsernameBackend',
+]
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.utils.autenticacion.CachedTokenAuthentication',
         # Removemos SessionAuthentication para forzar el uso de tokens
         # 'rest_framework.authentication.SessionAuthentication',
     ],